@@ -0,0 +1,7 @@
+"""
+Space Engine benchmark suite.
+
+``benchmarks.galaxy`` generates seeded synthetic galaxies and
+``benchmarks.run`` times the engine against them; see ``python -m
+benchmarks.run --help``.
+"""
@@ -0,0 +1,242 @@
+"""
+Seeded synthetic galaxy generator for benchmarks.
+
+Objects are placed in star systems scattered across the galaxy plane. Each
+system has a planet, sometimes a station, and ships in the sectors around
+it. Ships are built from ``FederationRegistry.SHIP_CLASSES`` templates and
+carry real sensor, power and weapon managers. The objects are lightweight
+stand-ins for Evennia typeclasses, so the engine can be benchmarked without
+a running server.
+
+The same count and seed always give the same galaxy.
+"""
+from typing import Dict, Iterator, List, Tuple
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from psycopg2.extras import execute_values
+from managers.sensor_manager import SensorManager
+from managers.power_manager import PowerManager
+from managers.weapon_manager import WeaponManager
+from typeclass.organizations.federation import FederationRegistry
+from typeclass.spaceobject import SpaceCoords
+from world.clock import now
+from world.constants import PARSEC_TO_SU
+from world.database.pool import get_db_connection
+from world.space.spatial_index import get_spatial_index
+import json
+import math
+import numpy as np
+
+BASE_ID = 50_000_000  # Synthetic IDs start here, clear of real objects
+OBJECTS_PER_SYSTEM = 50  # Average objects per star system
+SYSTEM_SPACING_PC = 200.0  # Average distance between systems, about two short range sensor radii
+SYSTEM_RADIUS_PC = 15.0  # Spread of ships around a system
+STATION_CHANCE = 0.4  # Share of systems with a station
+LRS_CHANCE = 0.05  # Share of ships running long range sensors
+
+STATION_TEMPLATE = {"main_gw": 200.0, "aux_gw": 100.0, "batt_gw": 80.0}
+
+class SyntheticObject:
+    """Stand-in for a space object typeclass, with plain db/ndb attribute storage."""
+
+    def __init__(self, obj_id: int, key: str, object_type: str, position_pc: Tuple[float, float, float]):
+        self.id = obj_id
+        self.key = key
+        self.object_type = object_type
+        self.db = SimpleNamespace(coords=SpaceCoords())
+        self.ndb = SimpleNamespace()
+        self.db.coords.set_su_coords(*(c * PARSEC_TO_SU for c in position_pc))
+        self.position_pc = position_pc
+
+    @property
+    def position_su(self) -> Tuple[float, float, float]:
+        su = self.db.coords.su
+        return (su["x"], su["y"], su["z"])
+
+    def get_current_time(self) -> float:
+        return now()
+
+    def msg(self, text: str) -> None:
+        pass
+
+@dataclass
+class Galaxy:
+    """A generated galaxy."""
+    seed: int
+    objects: List[SyntheticObject] = field(default_factory=list)
+    systems: List[Tuple[float, float, float]] = field(default_factory=list)  # System centres in parsecs
+
+    def __len__(self) -> int:
+        return len(self.objects)
+
+    def of_type(self, object_type: str) -> List[SyntheticObject]:
+        return [obj for obj in self.objects if obj.object_type == object_type]
+
+    @property
+    def ships(self) -> List[SyntheticObject]:
+        return self.of_type("ship")
+
+def _power_systems(template: Dict[str, float]) -> Dict[str, Dict]:
+    """Build main/aux/batt dicts at full output from a power template."""
+    return {
+        name: {"exist": True, "damage": 0.0, "gw": template[f"{name}_gw"], "in": 0.0,
+               "out": template[f"{name}_gw"]}
+        for name in ("main", "aux", "batt")
+    }
+
+def _make_ship(obj_id: int, ship_class: str, position: Tuple[float, float, float],
+               rng: np.random.Generator) -> SyntheticObject:
+    ship = SyntheticObject(obj_id, f"{ship_class.title()}-{obj_id - BASE_ID}", "ship", position)
+    config = FederationRegistry.create_ship(ship_class)
+    for name in ("main", "aux", "batt"):
+        config[name]["out"] = config[name]["gw"]
+    for name in ("structure", "tech", "main", "aux", "batt", "beam", "missile"):
+        setattr(ship.db, name, config[name])
+    ship.db.structure["superstructure"] = ship.db.structure["max_structure"]
+    ship.db.sensor = {"srs_active": True, "srs_damage": 0.0,
+                      "lrs_active": bool(rng.random() < LRS_CHANCE), "lrs_damage": 0.0}
+    ship.db.course = SimpleNamespace(yaw_out=float(rng.uniform(0, 360)), pitch_out=0.0)
+    ship.ship_class = ship_class
+    ship.sensor_mgr = SensorManager(ship)
+    ship.power_mgr = PowerManager(ship)
+    ship.weapon_mgr = WeaponManager(ship)
+    ship.ndb.beam_capacitor = ship.ndb.beam_cap_max
+    ship.ndb.missile_capacitor = ship.ndb.missile_cap_max
+    return ship
+
+def generate_galaxy(count: int, seed: int = 0) -> Galaxy:
+    """
+    Generate a galaxy of count objects.
+
+    Args:
+        count: Number of ships, stations and planets
+        seed: Random seed
+
+    Returns:
+        The generated galaxy, not yet indexed or stored
+    """
+    rng = np.random.default_rng(seed)
+    galaxy = Galaxy(seed)
+    n_systems = max(1, round(count / OBJECTS_PER_SYSTEM))
+    # Keep system density constant as the galaxy grows
+    half_width = SYSTEM_SPACING_PC * math.sqrt(n_systems) / 2
+    centres = rng.uniform(-half_width, half_width, size=(n_systems, 2))
+    galaxy.systems = [(float(x), float(y), 0.0) for x, y in centres]
+
+    classes = sorted(FederationRegistry.SHIP_CLASSES)
+    next_id = BASE_ID
+    for i, centre in enumerate(galaxy.systems):
+        if len(galaxy.objects) >= count:
+            break
+        planet = SyntheticObject(next_id, f"Planet-{i}", "planet", centre)
+        planet.db.structure = {"superstructure": 1e6, "max_structure": 1e6}
+        galaxy.objects.append(planet)
+        next_id += 1
+
+        if len(galaxy.objects) < count and rng.random() < STATION_CHANCE:
+            offset = rng.normal(0.0, 0.5, 3)
+            station = SyntheticObject(next_id, f"Station-{i}", "station",
+                                      tuple(float(c + o) for c, o in zip(centre, offset)))
+            for name, system in _power_systems(STATION_TEMPLATE).items():
+                setattr(station.db, name, system)
+            station.db.structure = {"superstructure": 5000.0, "max_structure": 5000.0}
+            station.power_mgr = PowerManager(station)
+            galaxy.objects.append(station)
+            next_id += 1
+
+    # Ships fill the rest, spread around randomly chosen systems
+    homes = rng.integers(0, n_systems, size=max(0, count - len(galaxy.objects)))
+    for home in homes:
+        cx, cy, cz = galaxy.systems[home]
+        dx, dy, dz = rng.normal(0.0, SYSTEM_RADIUS_PC, 3)
+        ship_class = classes[int(rng.integers(len(classes)))]
+        galaxy.objects.append(_make_ship(next_id, ship_class,
+                                         (float(cx + dx), float(cy + dy), float(cz + dz / 10)), rng))
+        next_id += 1
+    return galaxy
+
+def index_galaxy(galaxy: Galaxy) -> None:
+    """Put every object in the spatial index and mark it as mirroring the database."""
+    index = get_spatial_index()
+    index.clear()
+    for obj in galaxy.objects:
+        index.update(obj.id, obj.position_su, obj.object_type, obj.key, obj)
+    index.loaded = True
+
+def _power_json(obj: SyntheticObject) -> str:
+    return json.dumps({name: getattr(obj.db, name) for name in ("main", "aux", "batt")
+                       if hasattr(obj.db, name)})
+
+def _batches(items: List, size: int) -> Iterator[List]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def store_galaxy(galaxy: Galaxy, batch_size: int = 5000) -> int:
+    """
+    Insert the galaxy into ``space_objects``, replacing any earlier synthetic rows.
+
+    Returns:
+        Rows inserted
+    """
+    remove_galaxy()
+    rows = [(obj.id, obj.key, obj.object_type, *obj.position_su, _power_json(obj))
+            for obj in galaxy.objects]
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            for batch in _batches(rows, batch_size):
+                execute_values(cur, """
+                    INSERT INTO space_objects (id, key, object_type, position, orientation, power_systems)
+                    VALUES %s
+                """, batch,
+                    template="(%s, %s, %s, ST_SetSRID(ST_MakePoint(%s, %s, %s), 3857), "
+                             "ST_SetSRID(ST_MakePoint(1, 0, 0), 3857), %s::jsonb)",
+                    page_size=batch_size)
+        conn.commit()
+    return len(rows)
+
+def remove_galaxy() -> int:
+    """
+    Delete synthetic rows from ``space_objects``.
+
+    Returns:
+        Rows deleted
+    """
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM space_objects WHERE id >= %s", (BASE_ID,))
+            deleted = cur.rowcount
+        conn.commit()
+    return deleted
+
+def new_sector_names(galaxy: Galaxy) -> List[str]:
+    """
+    Get the names of the galaxy's sectors that are not yet in ``sectors``.
+
+    Call before a benchmark creates sectors, and pass the result to
+    ``remove_sectors`` afterwards.
+    """
+    from world.space.sectors.sector_manager import SectorManager
+    sectors = SectorManager()
+    names = sorted({sectors.get_sector_name(*sectors.get_sector_coordinates(obj.position_pc))
+                    for obj in galaxy.objects})
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT name FROM sectors WHERE name = ANY(%s)", (names,))
+            existing = {row[0] for row in cur.fetchall()}
+    return [name for name in names if name not in existing]
+
+def remove_sectors(names: List[str]) -> int:
+    """
+    Delete sectors by name, such as those a benchmark created.
+
+    Returns:
+        Rows deleted
+    """
+    if not names:
+        return 0
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM sectors WHERE name = ANY(%s)", (names,))
+            deleted = cur.rowcount
+        conn.commit()
+    return deleted
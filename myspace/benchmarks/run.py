@@ -0,0 +1,339 @@
+"""
+End-to-end engine benchmarks.
+
+Run from the game directory::
+
+    python -m benchmarks.run --sizes 100,1000,10000,100000 --output results.json
+    python -m benchmarks.run --no-db --baseline last-release.json
+
+Each benchmark runs once to warm up, then ``--repeat`` timed runs on a
+seeded synthetic galaxy (see ``benchmarks.galaxy``). Results are written as
+JSON with run metadata, operations per second, and the database query
+metrics recorded during the run. Given ``--baseline``, results are compared
+with an earlier file, and the run exits non-zero if any benchmark slowed by
+more than ``--tolerance``.
+
+Benchmarks marked ``db`` need a local PostGIS database with the schema in
+``world/space/database/schema.sql``, configured as for the server
+(``DATABASE_URL`` or ``PG*``). Synthetic ``space_objects`` rows use IDs
+from ``galaxy.BASE_ID``. Sectors the galaxy does not already have are
+recorded before the runs. Both are deleted afterwards.
+"""
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from dataclasses import dataclass, asdict
+from benchmarks.galaxy import (
+    Galaxy, generate_galaxy, index_galaxy, store_galaxy, remove_galaxy,
+    new_sector_names, remove_sectors
+)
+from managers.combat_engine import CombatEngine
+from managers.events.headless import HeadlessSimulation
+from managers.power_solver import FleetPowerSolver
+from managers.sensor_manager import SensorManager
+from world.metrics import get_metrics
+from world.space.sectors.sector_manager import SectorManager
+from world.space.database.position_buffer import PositionWriteBuffer
+from world.space.spatial_index import get_spatial_index
+from world import utils
+import argparse
+import datetime
+import platform
+import statistics
+import subprocess
+import json
+import sys
+import time
+import numpy as np
+
+DEFAULT_SIZES = (100, 1000, 10000, 100000)
+SCAN_SAMPLE = 1000  # Ships sweeping per scan run; the rest of the galaxy is scanned, not scanning
+SCHEMA_VERSION = 1
+
+@dataclass
+class Benchmark:
+    """
+    A timed operation over a galaxy.
+
+    ``setup`` runs once per galaxy, ``prepare`` before every run (untimed),
+    and ``run`` is timed and returns the number of operations it performed.
+    """
+    name: str
+    run: Callable[[Galaxy, Dict[str, Any]], int]
+    setup: Optional[Callable[[Galaxy, Dict[str, Any]], None]] = None
+    prepare: Optional[Callable[[Galaxy, Dict[str, Any]], None]] = None
+    db: bool = False
+
+@dataclass
+class BenchmarkResult:
+    """Timing for one benchmark at one galaxy size."""
+    benchmark: str
+    objects: int
+    ops: int
+    seconds: float  # Median run time
+    best: float
+    ops_per_sec: float
+    repeat: int
+    db: bool
+    queries: Optional[Dict[str, Dict]] = None  # Database query metrics from the timed runs
+    error: Optional[str] = None
+
+def _error(e: Exception) -> str:
+    """Get a one-line description of a failure."""
+    lines = str(e).strip().splitlines()
+    return f"{type(e).__name__}: {lines[0] if lines else ''}"
+
+def _setup_scan(galaxy: Galaxy, ctx: Dict[str, Any]) -> None:
+    index_galaxy(galaxy)
+    ships = galaxy.ships
+    step = max(1, len(ships) // SCAN_SAMPLE)
+    ctx["sensors"] = [ship.sensor_mgr for ship in ships[::step][:SCAN_SAMPLE]]
+
+def _scan(galaxy: Galaxy, ctx: Dict[str, Any]) -> int:
+    SensorManager.sweep(ctx["sensors"], force=True)
+    return len(ctx["sensors"])
+
+def _setup_scan_db(galaxy: Galaxy, ctx: Dict[str, Any]) -> None:
+    _setup_scan(galaxy, ctx)
+    get_spatial_index().loaded = False  # Sweep through PostGIS
+
+def _setup_power(galaxy: Galaxy, ctx: Dict[str, Any]) -> None:
+    rng = np.random.default_rng(galaxy.seed)
+    ctx["power"] = [obj.power_mgr for obj in galaxy.objects if hasattr(obj, "power_mgr")]
+    for mgr in ctx["power"]:
+        for system in ("movement", "shields", "beam", "missile", "operations"):
+            mgr.request_power(system, float(rng.uniform(1.0, 20.0)))
+    ctx["solver"] = FleetPowerSolver()
+
+def _power_tick(galaxy: Galaxy, ctx: Dict[str, Any]) -> int:
+    ctx["solver"].solve(ctx["power"])
+    return len(ctx["power"])
+
+def _setup_combat(galaxy: Galaxy, ctx: Dict[str, Any]) -> None:
+    """Pair each ship with its nearest neighbour and turn it to face it."""
+    index_galaxy(galaxy)
+    index = get_spatial_index()
+    ctx["engine"] = CombatEngine(rng=np.random.default_rng(galaxy.seed))
+    ctx["pairs"] = []
+    for ship in galaxy.ships:
+        nearest = index.nearest(ship.position_su, k=1, exclude=ship.id)
+        if not nearest:
+            continue
+        target = nearest[0][1]
+        yaw, pitch = utils.calculate_bearing(*ship.position_su, *target.position)
+        ship.db.course.yaw_out, ship.db.course.pitch_out = yaw, pitch
+        ctx["pairs"].append((ship, target.object_id, ship.weapon_mgr.get_bank_weapon("beam", 0)))
+
+def _prepare_combat(galaxy: Galaxy, ctx: Dict[str, Any]) -> None:
+    """Recharge capacitors and let cooldowns expire on the virtual clock."""
+    ctx["sim"].clock.advance(60.0)
+    ctx["sim"].wheel.advance()
+    for ship, _, _ in ctx["pairs"]:
+        ship.ndb.beam_capacitor = ship.ndb.beam_cap_max
+        ship.ndb.missile_capacitor = ship.ndb.missile_cap_max
+
+def _combat_tick(galaxy: Galaxy, ctx: Dict[str, Any]) -> int:
+    engine = ctx["engine"]
+    for ship, target_id, weapon in ctx["pairs"]:
+        engine.queue(ship, target_id, weapon)
+    return len(engine.resolve())
+
+def _setup_sectors(galaxy: Galaxy, ctx: Dict[str, Any]) -> None:
+    ctx["sectors"] = SectorManager()
+
+def _sector_assignment(galaxy: Galaxy, ctx: Dict[str, Any]) -> int:
+    sectors = ctx["sectors"]
+    for obj in galaxy.objects:
+        sectors.get_sector_for_position(obj.position_pc)
+    return len(galaxy.objects)
+
+def _prepare_resolve(galaxy: Galaxy, ctx: Dict[str, Any]) -> None:
+    """Start each run with a cold sector cache."""
+    ctx["sectors"].clear_cache()
+
+def _sector_resolve(galaxy: Galaxy, ctx: Dict[str, Any]) -> int:
+    sectors = ctx["sectors"]
+    cells = {sectors.get_sector_coordinates(obj.position_pc) for obj in galaxy.objects}
+    return sectors.prewarm_cells(cells)
+
+def _prepare_flush(galaxy: Galaxy, ctx: Dict[str, Any]) -> None:
+    """Stage a small move for every object."""
+    buffer = ctx["buffer"] = PositionWriteBuffer(max_pending=len(galaxy.objects) + 1)
+    for obj in galaxy.objects:
+        x, y, z = obj.position_su
+        buffer.stage(obj.id, (x + 1.0, y, z))
+
+def _persistence_flush(galaxy: Galaxy, ctx: Dict[str, Any]) -> int:
+    return ctx["buffer"].flush()
+
+BENCHMARKS: List[Benchmark] = [
+    Benchmark("scan", _scan, setup=_setup_scan),
+    Benchmark("scan_db", _scan, setup=_setup_scan_db, db=True),
+    Benchmark("power_tick", _power_tick, setup=_setup_power),
+    Benchmark("combat_tick", _combat_tick, setup=_setup_combat, prepare=_prepare_combat),
+    Benchmark("sector_assignment", _sector_assignment, setup=_setup_sectors, db=True),
+    Benchmark("sector_resolve", _sector_resolve, setup=_setup_sectors, prepare=_prepare_resolve,
+              db=True),
+    Benchmark("persistence_flush", _persistence_flush, prepare=_prepare_flush, db=True),
+]
+
+def run_benchmark(benchmark: Benchmark, galaxy: Galaxy, repeat: int = 3) -> BenchmarkResult:
+    """Warm up, then time repeat runs of a benchmark."""
+    metrics = get_metrics()
+    with HeadlessSimulation() as sim:
+        ctx: Dict[str, Any] = {"sim": sim}
+        try:
+            if benchmark.setup:
+                benchmark.setup(galaxy, ctx)
+            times = []
+            ops = 0
+            for i in range(repeat + 1):
+                if benchmark.prepare:
+                    benchmark.prepare(galaxy, ctx)
+                if i == 1:
+                    metrics.reset()  # Only count queries from timed runs
+                started = time.perf_counter()
+                ops = benchmark.run(galaxy, ctx)
+                if i:  # The first run is a warm-up
+                    times.append(time.perf_counter() - started)
+        except Exception as e:
+            return BenchmarkResult(benchmark.name, len(galaxy), 0, 0.0, 0.0, 0.0, repeat,
+                                   benchmark.db, error=_error(e))
+        finally:
+            get_spatial_index().clear()
+
+    median = statistics.median(times)
+    return BenchmarkResult(
+        benchmark=benchmark.name,
+        objects=len(galaxy),
+        ops=ops,
+        seconds=median,
+        best=min(times),
+        ops_per_sec=ops / median if median else 0.0,
+        repeat=repeat,
+        db=benchmark.db,
+        queries={name: values for name, values in metrics.snapshot("db.").items()},
+    )
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except Exception:
+        return None
+
+def run_suite(sizes: Sequence[int] = DEFAULT_SIZES, seed: int = 0, repeat: int = 3,
+              use_db: bool = True, only: Optional[Sequence[str]] = None,
+              report: Callable[[str], None] = print) -> Dict[str, Any]:
+    """
+    Run the benchmarks at each galaxy size.
+
+    Returns:
+        Machine-readable results with run metadata
+    """
+    benchmarks = [b for b in BENCHMARKS if (use_db or not b.db) and (not only or b.name in only)]
+    results = []
+    for size in sizes:
+        galaxy = generate_galaxy(size, seed)
+        stored = False
+        created_sectors: List[str] = []  # Sector benchmarks create these; delete them after
+        db_error = None
+        try:
+            if use_db and any(b.db for b in benchmarks):
+                try:
+                    created_sectors = new_sector_names(galaxy)
+                    store_galaxy(galaxy)
+                    stored = True
+                except Exception as e:
+                    db_error = _error(e)
+            for benchmark in benchmarks:
+                if benchmark.db and db_error:
+                    result = BenchmarkResult(benchmark.name, size, 0, 0.0, 0.0, 0.0, repeat,
+                                             True, error=db_error)
+                else:
+                    result = run_benchmark(benchmark, galaxy, repeat)
+                results.append(result)
+                if result.error:
+                    report(f"{benchmark.name:>18} {size:>7}: failed ({result.error})")
+                else:
+                    report(f"{benchmark.name:>18} {size:>7}: {result.ops_per_sec:12.1f} ops/s "
+                           f"({result.seconds * 1000:.2f} ms)")
+        finally:
+            if stored:
+                remove_galaxy()
+            remove_sectors(created_sectors)
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+            "sizes": list(sizes),
+        },
+        "results": [asdict(result) for result in results],
+    }
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            tolerance: float = 0.1) -> List[Dict[str, Any]]:
+    """
+    Find benchmarks whose throughput fell more than tolerance below the baseline.
+
+    Returns:
+        One entry per regression
+    """
+    previous = {(r["benchmark"], r["objects"]): r for r in baseline.get("results", [])
+                if not r.get("error") and r.get("ops_per_sec")}
+    regressions = []
+    for result in current["results"]:
+        before = previous.get((result["benchmark"], result["objects"]))
+        if before is None or result.get("error"):
+            continue
+        ratio = result["ops_per_sec"] / before["ops_per_sec"]
+        if ratio < 1.0 - tolerance:
+            regressions.append({"benchmark": result["benchmark"], "objects": result["objects"],
+                                "baseline": before["ops_per_sec"], "current": result["ops_per_sec"],
+                                "ratio": ratio})
+    return regressions
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Space Engine benchmarks")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="Comma separated galaxy sizes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark")
+    parser.add_argument("--only", help="Comma separated benchmark names")
+    parser.add_argument("--no-db", action="store_true", help="Skip benchmarks that need PostGIS")
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline", help="Earlier results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="Allowed fractional drop in ops/s before a regression is reported")
+    args = parser.parse_args(argv)
+
+    results = run_suite(
+        sizes=[int(size) for size in args.sizes.split(",") if size],
+        seed=args.seed,
+        repeat=args.repeat,
+        use_db=not args.no_db,
+        only=args.only.split(",") if args.only else None,
+    )
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        results["regressions"] = regressions
+        for r in regressions:
+            print(f"REGRESSION {r['benchmark']} at {r['objects']}: "
+                  f"{r['current']:.1f} ops/s vs {r['baseline']:.1f} ({r['ratio']:.0%})")
+        status = 1 if regressions else 0
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,7 @@ Engineering commands for ship system management.
 from typing import Optional
 from evennia import Command
 from world.constants import MAX_POWER_OUTPUT
+from managers.power_manager import PowerManager
 
 class PowerAllocation(Command):
     """
@@ -60,8 +61,9 @@ class PowerAllocation(Command):
     def _allocate_power(self, system: str, amount: float):
         """Allocate power to specified system."""
         ship = self.caller.location
+        power = PowerManager.for_object(ship)
         
-        if system not in ship.db.alloc:
+        if system not in power.topology.index:
             self.caller.msg(f"Unknown system: {system}")
             return
             
@@ -69,8 +71,13 @@ class PowerAllocation(Command):
             self.caller.msg("Power allocation must be between 0 and 100")
             return
             
-        ship.db.alloc[system] = amount
-        self.caller.msg(f"Power allocated to {system}: {amount:.1f}")
+        # A standing request, so the power tick keeps it
+        if amount > 0:
+            allocated = power.request_power(system, amount)
+        else:
+            power.release_power(system)
+            allocated = 0.0
+        self.caller.msg(f"Power allocated to {system}: {allocated:.1f}")
 
 class Repair(Command):
     """
@@ -4,6 +4,26 @@ Tactical commands for combat and weapons control.
 from typing import Optional, Tuple
 from evennia import Command
 from world.constants import ShieldFacing
+from managers.power_manager import PowerManager, SHIELD_FACINGS
+from managers.targeting import has_contact
+
+# Shield facing -> power system facing, which also orders db.alloc["shield"]
+FACING_SYSTEMS = {
+    ShieldFacing.FORE: "forward",
+    ShieldFacing.PORT: "port",
+    ShieldFacing.AFT: "aft",
+    ShieldFacing.STARBOARD: "starboard",
+    ShieldFacing.DORSAL: "dorsal",
+    ShieldFacing.VENTRAL: "ventral",
+}
+
+def _set_facing_power(power: PowerManager, facing: ShieldFacing, amount: float) -> float:
+    """Make a standing shield power request for one facing."""
+    system = f"shield_{FACING_SYSTEMS[facing]}"
+    if amount > 0:
+        return power.request_power(system, amount)
+    power.release_power(system)
+    return 0.0
 
 class Shields(Command):
     """
@@ -49,7 +69,7 @@ class Shields(Command):
         status = ["Shield Status:"]
         for facing in ShieldFacing:
             idx = facing.value - 1
-            power = ship.db.alloc["shield"][idx]
+            power = ship.db.alloc["shield"][SHIELD_FACINGS.index(FACING_SYSTEMS[facing])]
             damage = ship.db.shield[idx]["damage"]
             status.append(
                 f"{facing.name}: Power {power:.1f}%, Damage {damage:.1f}%"
@@ -60,11 +80,12 @@ class Shields(Command):
     def _balance_shields(self):
         """Distribute shield power evenly."""
         ship = self.caller.location
+        power = PowerManager.for_object(ship)
         total_power = sum(ship.db.alloc["shield"])
         balanced_power = total_power / len(ShieldFacing)
         
-        for i in range(len(ShieldFacing)):
-            ship.db.alloc["shield"][i] = balanced_power
+        for facing in ShieldFacing:
+            _set_facing_power(power, facing, balanced_power)
             
         self.caller.msg("Shields balanced")
         
@@ -82,9 +103,8 @@ class Shields(Command):
             self.caller.msg("Shield power must be between 0 and 100")
             return
             
-        idx = facing_enum.value - 1
-        ship.db.alloc["shield"][idx] = power
-        self.caller.msg(f"Shield power set: {facing} {power:.1f}%")
+        allocated = _set_facing_power(PowerManager.for_object(ship), facing_enum, power)
+        self.caller.msg(f"Shield power set: {facing} {allocated:.1f}%")
 
 class Weapons(Command):
     """
@@ -194,7 +214,7 @@ class Weapons(Command):
         ship = self.caller.location
         
         # Verify target exists in sensor contacts
-        if contact_id not in ship.db.sensor["contacts"]:
+        if not has_contact(ship, contact_id):
             self.caller.msg(f"No contact with ID {contact_id}")
             return
             
@@ -258,7 +278,7 @@ Tactical commands for combat and weapons control.
 from typing import Optional, Tuple
 from evennia import Command
 from world.constants import ShieldFacing
-from managers.weapon_manager import Weapon
+from managers.combat_engine import get_combat_engine
 
 class Weapons(Command):
     """
@@ -370,7 +390,7 @@ class Weapons(Command):
         ship = self.caller.location
         
         # Verify target exists in sensor contacts
-        if contact_id not in ship.db.sensor["contacts"]:
+        if not has_contact(ship, contact_id):
             self.caller.msg(f"No contact with ID {contact_id}")
             return
             
@@ -404,18 +424,14 @@ class Weapons(Command):
                 self.caller.msg(f"Beam bank {bank} has no target")
                 return
                 
-            # Create weapon instance and attempt to fire
-            beam = Weapon(
-                f"Beam Bank {bank}",
-                damage=50.0,
-                bonus=1.0,
-                cost=25.0,
-                arc=60.0,
-                cooldown=3.0
-            )
-            if beam.fire(ship):
+            # Queue the shot for the next combat tick
+            def disarm():
                 bank_data["active"] = False
                 bank_data["lock"] = None
+
+            beam = ship.db.weapon_manager.get_bank_weapon("beam", bank)
+            get_combat_engine().queue(ship, bank_data["lock"], beam, on_fire=disarm)
+            self.caller.msg(f"Beam bank {bank} firing at contact {bank_data['lock']}")
             
         elif weapon_type == "missile":
             if bank >= len(ship.db.mlist):
@@ -431,16 +447,12 @@ class Weapons(Command):
                 self.caller.msg(f"Missile tube {bank} has no target")
                 return
                 
-            # Create missile weapon instance and attempt to fire
-            missile = Weapon(
-                f"Missile Tube {bank}",
-                damage=75.0,
-                bonus=1.0,
-                cost=15.0,
-                arc=180.0,
-                cooldown=5.0
-            )
-            if missile.fire(ship):
+            # Queue the launch for the next combat tick
+            def unload():
                 tube_data["active"] = False
                 tube_data["load"] = False
                 tube_data["lock"] = None
+
+            missile = ship.db.weapon_manager.get_bank_weapon("missile", bank)
+            get_combat_engine().queue(ship, tube_data["lock"], missile, on_fire=unload)
+            self.caller.msg(f"Missile tube {bank} launching at contact {tube_data['lock']}")
@@ -0,0 +1,179 @@
+"""
+Central weapon capacitor charging.
+
+Instead of every ship rescheduling its own charging callback each second,
+all beam and missile capacitors live in struct-of-arrays form here and are
+charged together in one NumPy pass per tick. Ship ``ndb`` capacitor values
+are kept as a mirror: the tick only writes back ships whose charge changed,
+so full capacitors cost nothing.
+
+Code that changes a capacitor outside the tick (firing, admin commands)
+should go through ``set_charge``, or call ``refresh`` after editing ``ndb``.
+"""
+from typing import Dict, List, Optional
+import numpy as np
+import weakref
+
+BEAM = 0
+MISSILE = 1
+CAPACITOR_ATTRS = (("beam_capacitor", "beam_cap_max"), ("missile_capacitor", "missile_cap_max"))
+
+def capacitor_kind(weapon_name: str) -> int:
+    """Get the capacitor column a weapon draws from."""
+    return BEAM if "beam" in weapon_name.lower() else MISSILE
+
+class CapacitorEngine:
+    """
+    Struct-of-arrays capacitor state for every registered weapon manager.
+
+    Each manager owns one row; columns are (beam, missile).
+
+    Args:
+        capacity: Initial number of rows to allocate
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.charge = np.zeros((capacity, 2))
+        self.cap_max = np.zeros((capacity, 2))
+        self.power = np.zeros((capacity, 2))  # GW allocated to each capacitor
+        self.rate = np.zeros((capacity, 2))  # Charge per GW per second
+        self.active = np.zeros(capacity, dtype=bool)
+        self._managers: List[Optional[weakref.ref]] = [None] * capacity
+        self._slots: Dict[int, int] = {}  # id(space object) -> row
+        self._free: List[int] = list(range(capacity - 1, -1, -1))
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def _grow(self) -> None:
+        """Double the row capacity."""
+        old = self.charge.shape[0]
+        new = old * 2
+        for name in ("charge", "cap_max", "power", "rate"):
+            grown = np.zeros((new, 2))
+            grown[:old] = getattr(self, name)
+            setattr(self, name, grown)
+        active = np.zeros(new, dtype=bool)
+        active[:old] = self.active
+        self.active = active
+        self._managers.extend([None] * old)
+        self._free.extend(range(new - 1, old - 1, -1))
+
+    def register(self, manager) -> int:
+        """Add a weapon manager's capacitors to the engine. Returns its row."""
+        key = id(manager.obj)
+        slot = self._slots.get(key)
+        if slot is None:
+            if not self._free:
+                self._grow()
+            slot = self._free.pop()
+            self._slots[key] = slot
+        self._managers[slot] = weakref.ref(manager, self._reap)
+        self.active[slot] = True
+        self.refresh(manager.obj)
+        return slot
+
+    def unregister(self, obj) -> None:
+        """Stop charging an object's capacitors."""
+        slot = self._slots.pop(id(obj), None)
+        if slot is not None:
+            self._release(slot)
+
+    def _reap(self, ref: weakref.ref) -> None:
+        """Free the row of a weapon manager that has been garbage collected."""
+        for key, slot in list(self._slots.items()):
+            if self._managers[slot] is ref:
+                del self._slots[key]
+                self._release(slot)
+                return
+
+    def _release(self, slot: int) -> None:
+        self.active[slot] = False
+        self.charge[slot] = self.cap_max[slot] = self.power[slot] = self.rate[slot] = 0.0
+        self._managers[slot] = None
+        self._free.append(slot)
+
+    def _slot_for(self, obj) -> Optional[int]:
+        """Get the row for a registered object."""
+        slot = self._slots.get(id(obj))
+        if slot is None:
+            return None
+        ref = self._managers[slot]
+        manager = ref() if ref else None
+        if manager is None or manager.obj is not obj:
+            return None
+        return slot
+
+    def refresh(self, obj) -> None:
+        """Reload an object's charges, limits, charge rate and power from its attributes."""
+        slot = self._slot_for(obj)
+        if slot is None:
+            return
+        for col, (charge_attr, max_attr) in enumerate(CAPACITOR_ATTRS):
+            self.charge[slot, col] = float(getattr(obj.ndb, charge_attr, 0.0) or 0.0)
+            self.cap_max[slot, col] = float(getattr(obj.ndb, max_attr, 0.0) or 0.0)
+
+        beam = getattr(obj.db, "beam", None) or {}
+        self.rate[slot, BEAM] = float(beam.get("charge_rate", 0.1))
+        self.rate[slot, MISSILE] = 1.0
+
+        power_mgr = getattr(obj.db, "power_manager", None)
+        if power_mgr:
+            self.set_power(obj, power_mgr.get_system_power("beam"),
+                           power_mgr.get_system_power("missile"))
+
+    def set_power(self, obj, beam: float, missile: float) -> None:
+        """Record the power allocated to an object's capacitors."""
+        slot = self._slot_for(obj)
+        if slot is not None:
+            self.power[slot, BEAM] = beam
+            self.power[slot, MISSILE] = missile
+
+    def set_charge(self, obj, kind: int, value: float) -> None:
+        """Set one capacitor's charge, keeping ndb and the engine in step."""
+        setattr(obj.ndb, CAPACITOR_ATTRS[kind][0], value)
+        slot = self._slot_for(obj)
+        if slot is not None:
+            self.charge[slot, kind] = value
+
+    def tick(self, dt: float = 1.0) -> int:
+        """
+        Charge every registered capacitor by one step.
+
+        Args:
+            dt: Seconds elapsed since the last tick
+
+        Returns:
+            Number of ships whose capacitors changed
+        """
+        charging = self.active[:, None] & (self.charge < self.cap_max)
+        charged = np.minimum(self.charge + self.power * self.rate * dt, self.cap_max)
+        updated = np.where(charging, charged, self.charge)
+        changed_rows = np.flatnonzero((updated != self.charge).any(axis=1))
+        self.charge = updated
+
+        written = 0
+        for slot in changed_rows.tolist():
+            ref = self._managers[slot]
+            manager = ref() if ref else None
+            if manager is None:
+                continue
+            ndb = manager.obj.ndb
+            ndb.beam_capacitor = float(updated[slot, BEAM])
+            ndb.missile_capacitor = float(updated[slot, MISSILE])
+            written += 1
+        return written
+
+# Global capacitor engine instance
+_CAPACITOR_ENGINE: Optional[CapacitorEngine] = None
+
+def get_capacitor_engine() -> CapacitorEngine:
+    """Get or create the global capacitor engine."""
+    global _CAPACITOR_ENGINE
+    if _CAPACITOR_ENGINE is None:
+        _CAPACITOR_ENGINE = CapacitorEngine()
+    return _CAPACITOR_ENGINE
+
+def charge_capacitors(dt: float = 1.0) -> int:
+    """Tick the global capacitor engine."""
+    return get_capacitor_engine().tick(dt)
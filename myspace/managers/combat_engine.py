@@ -0,0 +1,345 @@
+"""
+Batched combat resolution.
+
+Fire commands do not resolve shots on the spot. They queue a ``FireOrder``.
+Every combat tick (0.2 seconds), all orders queued since the last tick are
+resolved together. One NumPy pass covers firing arcs, capacitor draws, hit
+chances, damage falloff, shield facing and shield dissipation. The results
+are then applied with one state write per ship. Combat cost grows with the
+number of shots, not with how many commands were typed.
+
+The array maths mirrors ``world.utils.calculate_damage_falloff`` and
+``world.utils.calculate_shield_dissipation``. Shots against the same shield
+facing in one tick drain it in the order they were queued.
+"""
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from managers.capacitor_engine import get_capacitor_engine, capacitor_kind, CAPACITOR_ATTRS
+from managers.power_manager import SHIELD_FACINGS
+from world.space.ballistics import calculate_hit_chances
+from world.space.spatial_index import get_spatial_index
+from world.space.sectors.activity import get_sector_activity
+import numpy as np
+
+COMBAT_TICK: float = 0.2  # Seconds between resolutions
+SHIELD_DISSIPATION: float = 0.8  # Fraction of a hit a shield can absorb
+
+# Horizontal 90 degree sectors counter-clockwise from the bow, as SHIELD_FACINGS slots
+_SIDE_SLOTS = np.array([SHIELD_FACINGS.index(f) for f in ("forward", "port", "aft", "starboard")])
+_DORSAL = SHIELD_FACINGS.index("dorsal")
+_VENTRAL = SHIELD_FACINGS.index("ventral")
+
+@dataclass
+class FireOrder:
+    """A queued request to fire one weapon at one contact."""
+    shooter: object
+    target_id: int
+    weapon: object  # managers.weapon_manager.Weapon
+    on_fire: Optional[Callable[[], None]] = None  # Called once the shot goes off
+
+@dataclass
+class ShotResult:
+    """Outcome of one fire order."""
+    order: FireOrder
+    fired: bool = False
+    hit: bool = False
+    damage: float = 0.0  # Damage after falloff
+    absorbed: float = 0.0  # Taken by shields
+    hull_damage: float = 0.0
+    facing: Optional[str] = None
+    reason: str = ""  # Why the order did not fire
+
+def damage_falloff(base_damage: np.ndarray, distance: np.ndarray,
+                   optimal_range: np.ndarray) -> np.ndarray:
+    """Array form of ``utils.calculate_damage_falloff``."""
+    with np.errstate(divide='ignore'):
+        factor = np.where(distance <= optimal_range,
+                          1.0, (optimal_range / np.maximum(distance, 1e-12)) ** 2)
+    return base_damage * factor
+
+def shield_dissipation(damage: np.ndarray, strength: np.ndarray, groups: np.ndarray,
+                       rate: float = SHIELD_DISSIPATION) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Array form of ``utils.calculate_shield_dissipation`` for many hits at once.
+
+    Hits sharing a group draw on one shield in array order, so each hit sees
+    the strength left over by the hits before it.
+
+    Args:
+        damage: (N,) incoming damage per hit
+        strength: (N,) shield strength of each hit's group
+        groups: (N,) group id per hit
+
+    Returns:
+        (absorbed, remaining) arrays
+    """
+    n = damage.shape[0]
+    if n == 0:
+        return np.zeros(0), np.zeros(0)
+    order = np.argsort(groups, kind="stable")
+    wanted = damage[order] * rate
+    sorted_groups = groups[order]
+    starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+    cumulative = np.cumsum(wanted)
+    # Restart the running total at each group boundary
+    offsets = np.repeat(cumulative[starts] - wanted[starts], np.diff(np.r_[starts, n]))
+    capped = np.minimum(cumulative - offsets, strength[order])
+    previous = np.concatenate(([0.0], capped[:-1]))
+    previous[starts] = 0.0
+
+    absorbed = np.empty(n)
+    absorbed[order] = capped - previous
+    return absorbed, damage - absorbed
+
+def select_facings(target_pos: np.ndarray, shooter_pos: np.ndarray,
+                   target_yaw: np.ndarray, target_pitch: np.ndarray) -> np.ndarray:
+    """
+    Pick the target shield facing each shot strikes.
+
+    Returns:
+        (N,) indices into SHIELD_FACINGS
+    """
+    delta = shooter_pos - target_pos
+    bearing = np.degrees(np.arctan2(delta[:, 1], delta[:, 0]))
+    elevation = np.degrees(np.arctan2(delta[:, 2], np.hypot(delta[:, 0], delta[:, 1])))
+    relative_yaw = (bearing - target_yaw + 45.0) % 360.0
+    relative_pitch = elevation - target_pitch
+    facing = _SIDE_SLOTS[(relative_yaw // 90.0).astype(int) % 4]
+    facing = np.where(relative_pitch > 45.0, _DORSAL, facing)
+    return np.where(relative_pitch < -45.0, _VENTRAL, facing)
+
+def _position(obj) -> Tuple[float, float, float]:
+    coords = obj.db.coords
+    return (coords["x"], coords["y"], coords["z"])
+
+def _heading(obj) -> Tuple[float, float]:
+    """Get an object's (yaw, pitch) in degrees, defaulting to straight along +X."""
+    course = getattr(obj.db, "course", None)
+    return (float(getattr(course, "yaw_out", 0.0) or 0.0),
+            float(getattr(course, "pitch_out", 0.0) or 0.0))
+
+class CombatEngine:
+    """
+    Collects fire orders and resolves them once per combat tick.
+
+    Args:
+        tick: Seconds between resolutions, used to scale target velocities
+        rng: Random generator for hit rolls
+    """
+
+    def __init__(self, tick: float = COMBAT_TICK, rng: Optional[np.random.Generator] = None):
+        self.tick = tick
+        self.rng = rng or np.random.default_rng()
+        self.pending: List[FireOrder] = []
+        self.last_results: List[ShotResult] = []
+
+    def __len__(self) -> int:
+        return len(self.pending)
+
+    def queue(self, shooter, target_id: int, weapon,
+              on_fire: Optional[Callable[[], None]] = None) -> FireOrder:
+        """Queue a weapon to fire at the next combat tick."""
+        order = FireOrder(shooter, target_id, weapon, on_fire)
+        self.pending.append(order)
+        # Combat keeps the sectors around it awake
+        get_sector_activity().note_object(shooter)
+        return order
+
+    def resolve(self) -> List[ShotResult]:
+        """
+        Resolve every queued order.
+
+        Returns:
+            One result per order, in queue order
+        """
+        orders, self.pending = self.pending, []
+        results = [ShotResult(order) for order in orders]
+        if not orders:
+            self.last_results = results
+            return results
+
+        index = get_spatial_index()
+        queued_weapons = set()
+        shots: List[int] = []
+        targets: List[object] = []
+        for i, order in enumerate(orders):
+            target = index.resolve(order.target_id)
+            if target is None or target is order.shooter:
+                results[i].reason = "no target"
+            elif id(order.weapon) in queued_weapons or not order.weapon.can_fire(float("inf")):
+                results[i].reason = "cooldown"
+            else:
+                queued_weapons.add(id(order.weapon))
+                shots.append(i)
+                targets.append(target)
+
+        if shots:
+            self._resolve_shots([orders[i] for i in shots], targets,
+                                [results[i] for i in shots])
+
+        self._report(results)
+        self.last_results = results
+        return results
+
+    def _resolve_shots(self, orders: List[FireOrder], targets: List[object],
+                       results: List[ShotResult]) -> None:
+        n = len(orders)
+        weapons = [order.weapon for order in orders]
+        shooter_pos = np.array([_position(order.shooter) for order in orders])
+        target_pos = np.array([_position(target) for target in targets])
+        damage = np.array([w.damage * (w.bonus or 1.0) for w in weapons])
+        cost = np.array([w.cost for w in weapons])
+        arc = np.array([w.arc for w in weapons])
+        optimal = np.array([w.optimal_range for w in weapons])
+        tracking = np.array([w.tracking for w in weapons])
+        kinds = np.array([capacitor_kind(w.name) for w in weapons])
+
+        # Firing arcs around each shooter's heading
+        shooter_heading = np.radians([_heading(order.shooter) for order in orders])
+        facing_vec = np.column_stack((
+            np.cos(shooter_heading[:, 1]) * np.cos(shooter_heading[:, 0]),
+            np.cos(shooter_heading[:, 1]) * np.sin(shooter_heading[:, 0]),
+            np.sin(shooter_heading[:, 1]),
+        ))
+        delta = target_pos - shooter_pos
+        distance = np.sqrt(np.einsum('ij,ij->i', delta, delta))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cos_angle = np.einsum('ij,ij->i', delta, facing_vec) / distance
+        in_arc = (distance == 0) | (cos_angle >= np.cos(np.radians(arc / 2.0)))
+
+        # Capacitor draws, in queue order, per ship and capacitor
+        shooter_ids: Dict[int, int] = {}
+        shooters = []
+        for order in orders:
+            if id(order.shooter) not in shooter_ids:
+                shooter_ids[id(order.shooter)] = len(shooters)
+                shooters.append(order.shooter)
+        rows = np.array([shooter_ids[id(order.shooter)] for order in orders])
+        charge = np.array([[float(getattr(s.ndb, attr, 0.0) or 0.0) for attr, _ in CAPACITOR_ATTRS]
+                           for s in shooters]).reshape(-1)  # Flat (ship, capacitor) rows
+        group = rows * 2 + kinds
+        draw = np.where(in_arc, cost, 0.0)
+        order_by_group = np.argsort(group, kind="stable")
+        sorted_group = group[order_by_group]
+        starts = np.flatnonzero(np.r_[True, sorted_group[1:] != sorted_group[:-1]])
+        cumulative = np.cumsum(draw[order_by_group])
+        offsets = np.repeat(cumulative[starts] - draw[order_by_group][starts],
+                            np.diff(np.r_[starts, n]))
+        spent = np.empty(n)
+        spent[order_by_group] = cumulative - offsets
+        if (spent[in_arc] <= charge[group[in_arc]] + 1e-9).all():
+            fired = in_arc
+        else:
+            # A shot that cannot be afforded spends nothing, so cheaper later shots may fit
+            fired = self._sequential_draws(group, cost, in_arc, charge)
+
+        # Hit rolls for shots that went off
+        velocities = np.zeros((n, 3))
+        for i, order in enumerate(orders):
+            contact = getattr(getattr(order.shooter, "sensor_mgr", None), "contacts", {}).get(order.target_id)
+            if contact is not None:
+                velocities[i] = contact.velocity_vector
+        chance = calculate_hit_chances(shooter_pos, target_pos, velocities * self.tick, tracking)
+        hit = fired & (self.rng.random(n) < chance)
+
+        # Damage, shield facing and dissipation for hits
+        dealt = np.where(hit, damage_falloff(damage, distance, optimal), 0.0)
+        target_ids: Dict[int, int] = {}
+        victims = []
+        for target in targets:
+            if id(target) not in target_ids:
+                target_ids[id(target)] = len(victims)
+                victims.append(target)
+        victim_rows = np.array([target_ids[id(target)] for target in targets])
+        victim_heading = np.array([_heading(target) for target in victims])
+        facing = select_facings(target_pos, shooter_pos,
+                                victim_heading[victim_rows, 0], victim_heading[victim_rows, 1])
+        strength = np.array([self._shield_strengths(target) for target in victims])
+        shield_group = victim_rows * len(SHIELD_FACINGS) + facing
+        absorbed, remaining = shield_dissipation(dealt, strength.reshape(-1)[shield_group],
+                                                 shield_group)
+
+        # Bulk state update: one write per capacitor and per damaged hull
+        spend = np.bincount(group, weights=np.where(fired, cost, 0.0), minlength=charge.size)
+        engine = get_capacitor_engine()
+        for flat in np.flatnonzero(spend).tolist():
+            ship = shooters[flat // 2]
+            engine.set_charge(ship, flat % 2, float(charge[flat] - spend[flat]))
+
+        hull = np.bincount(victim_rows, weights=remaining, minlength=len(victims))
+        for row in np.flatnonzero(hull).tolist():
+            structure = getattr(victims[row].db, "structure", None)
+            if structure and "superstructure" in structure:
+                structure["superstructure"] = max(0.0, structure["superstructure"] - float(hull[row]))
+
+        for i, (order, result) in enumerate(zip(orders, results)):
+            if not fired[i]:
+                result.reason = "out of arc" if not in_arc[i] else "insufficient power"
+                continue
+            result.fired = True
+            result.hit = bool(hit[i])
+            if result.hit:
+                result.damage = float(dealt[i])
+                result.absorbed = float(absorbed[i])
+                result.hull_damage = float(remaining[i])
+                result.facing = SHIELD_FACINGS[facing[i]]
+            order.weapon.start_cooldown(order.shooter)
+            if order.on_fire:
+                order.on_fire()
+
+    @staticmethod
+    def _sequential_draws(group: np.ndarray, cost: np.ndarray, in_arc: np.ndarray,
+                          charge: np.ndarray) -> np.ndarray:
+        """Draw capacitors shot by shot when some shots cannot be afforded."""
+        remaining = charge.copy()
+        fired = np.zeros(group.shape[0], dtype=bool)
+        for i in np.flatnonzero(in_arc).tolist():
+            if remaining[group[i]] + 1e-9 >= cost[i]:
+                remaining[group[i]] -= cost[i]
+                fired[i] = True
+        return fired
+
+    @staticmethod
+    def _shield_strengths(obj) -> List[float]:
+        """Get the power on each shield facing, in SHIELD_FACINGS order."""
+        alloc = getattr(obj.db, "alloc", None) or {}
+        shields = list(alloc.get("shield") or [])
+        shields += [0.0] * (len(SHIELD_FACINGS) - len(shields))
+        return [float(value) for value in shields[:len(SHIELD_FACINGS)]]
+
+    @staticmethod
+    def _report(results: List[ShotResult]) -> None:
+        """Tell shooters and targets what happened."""
+        index = get_spatial_index()
+        for result in results:
+            order = result.order
+            name = order.weapon.name
+            if not result.fired:
+                order.shooter.msg(f"{name} could not fire at contact {order.target_id}: {result.reason}")
+            elif not result.hit:
+                order.shooter.msg(f"{name} fired at contact {order.target_id} and missed")
+            else:
+                order.shooter.msg(
+                    f"{name} hit contact {order.target_id} for {result.damage:.1f} "
+                    f"({result.absorbed:.1f} absorbed by {result.facing} shields)"
+                )
+                target = index.resolve(order.target_id)
+                if target is not None and hasattr(target, "msg"):
+                    target.msg(
+                        f"Hit on {result.facing} shields: {result.absorbed:.1f} absorbed, "
+                        f"{result.hull_damage:.1f} to hull"
+                    )
+
+# Global combat engine instance
+_COMBAT_ENGINE: Optional[CombatEngine] = None
+
+def get_combat_engine() -> CombatEngine:
+    """Get or create the global combat engine."""
+    global _COMBAT_ENGINE
+    if _COMBAT_ENGINE is None:
+        _COMBAT_ENGINE = CombatEngine()
+    return _COMBAT_ENGINE
+
+def resolve_combat() -> List[ShotResult]:
+    """Resolve the global combat engine's queued orders."""
+    return get_combat_engine().resolve()
@@ -0,0 +1,203 @@
+"""
+Fixed-timestep master loop for the Space Engine.
+
+One loop replaces the per-system tickers. Each frame advances simulation
+time by a fixed step and runs every stage that is due, in ``SystemPriority``
+order: movement, combat, power, shields, sensors, then general work. Stage
+periods are whole numbers of frames, so their phases never drift relative
+to one another and work lands in the same frame every time.
+
+If the loop falls behind it runs frames back to back to catch up, up to
+``max_catchup`` frames. Beyond that, the missed time is dropped instead of
+spiralling. Frame-time statistics are kept in ``stats``, and frame and
+stage times are recorded in the ``loop.frame_time`` and ``loop.stage_time``
+histograms.
+"""
+from typing import Any, Callable, Dict, List, Optional
+from dataclasses import dataclass, asdict
+from managers.events.priority_manager import SystemPriority
+from managers.events.tick_scheduler import TickScheduler
+from world.metrics import get_logger, get_metrics
+import itertools
+import asyncio
+import time
+
+FRAME_TIME: float = 0.1  # Seconds of simulation per frame
+MAX_CATCHUP_FRAMES: int = 5  # Frames run back to back before dropping missed time
+
+logger = get_logger("loop")
+
+@dataclass
+class Stage:
+    """Work run every ``period`` frames."""
+    name: str
+    callback: Callable[..., Any]
+    period: int  # Frames between runs
+    priority: int
+    order: int  # Registration order, breaking priority ties
+
+@dataclass
+class FrameStats:
+    """Frame timing counters."""
+    frames: int = 0
+    catchup_frames: int = 0  # Frames run late, back to back
+    dropped_frames: int = 0  # Frames skipped because the loop fell too far behind
+    overruns: int = 0  # Frames whose work took longer than the timestep
+    last_frame_time: float = 0.0
+    avg_frame_time: float = 0.0
+    max_frame_time: float = 0.0
+
+class MasterLoop:
+    """
+    Fixed-timestep loop dispatching engine stages in priority order.
+
+    Args:
+        dt: Simulation seconds per frame
+        clock: Monotonic time source
+        max_catchup: Frames to run back to back before dropping missed time
+    """
+
+    SMOOTHING = 0.1  # EWMA weight for the average frame time
+
+    def __init__(self, dt: float = FRAME_TIME, clock: Callable[[], float] = time.monotonic,
+                 max_catchup: int = MAX_CATCHUP_FRAMES):
+        if dt <= 0:
+            raise ValueError("Frame time must be positive")
+        self.dt = dt
+        self.clock = clock
+        self.max_catchup = max_catchup
+        self.frame = 0  # Frames simulated
+        self.sim_time = 0.0  # Simulated seconds
+        self.stats = FrameStats()
+        self._stages: List[Stage] = []
+        self._order = itertools.count()
+        self._origin: Optional[float] = None  # Clock time of frame 0
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+
+    def add_stage(self, name: str, callback: Callable[..., Any], interval: float,
+                  priority: int = SystemPriority.MISC) -> Stage:
+        """
+        Run a callback every interval, rounded to whole frames.
+
+        The callback may be sync or async and receives no arguments.
+        """
+        period = max(1, round(interval / self.dt))
+        stage = Stage(name, callback, period, int(priority), next(self._order))
+        self._stages.append(stage)
+        self._stages.sort(key=lambda s: (-s.priority, s.order))
+        return stage
+
+    def remove_stage(self, name: str) -> None:
+        """Stop running a stage."""
+        self._stages = [stage for stage in self._stages if stage.name != name]
+
+    def clear_stages(self) -> None:
+        """Remove every stage."""
+        self._stages = []
+
+    def add_scheduler(self, scheduler: TickScheduler) -> None:
+        """Run each of a tick scheduler's systems as a stage, honouring its budgets and degradation."""
+        for name, state in scheduler.systems.items():
+            async def tick(system=name):
+                run, due = scheduler.admit(system)
+                if run:
+                    await scheduler.run_tick(system, due)
+            self.add_stage(name, tick, state.interval, state.priority)
+
+    def due_stages(self, frame: int) -> List[Stage]:
+        """Get the stages that run in a frame, in dispatch order."""
+        return [s for s in self._stages if frame % s.period == 0]
+
+    async def step(self) -> int:
+        """
+        Run one frame.
+
+        Returns:
+            Number of stages run
+        """
+        metrics = get_metrics()
+        started = self.clock()
+        stages = self.due_stages(self.frame)
+        for stage in stages:
+            stage_started = self.clock()
+            try:
+                result = stage.callback()
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception:
+                logger.exception("Error in %s stage", stage.name)
+            metrics.observe("loop.stage_time", self.clock() - stage_started, stage.name)
+        self.frame += 1
+        self.sim_time = self.frame * self.dt
+
+        elapsed = self.clock() - started
+        stats = self.stats
+        stats.frames += 1
+        stats.last_frame_time = elapsed
+        stats.max_frame_time = max(stats.max_frame_time, elapsed)
+        stats.avg_frame_time += self.SMOOTHING * (elapsed - stats.avg_frame_time)
+        metrics.observe("loop.frame_time", elapsed)
+        if elapsed > self.dt:
+            stats.overruns += 1
+        return len(stages)
+
+    async def advance(self, now: Optional[float] = None) -> int:
+        """
+        Run every frame due by clock time ``now``, catching up if behind.
+
+        Returns:
+            Number of frames run
+        """
+        now = self.clock() if now is None else now
+        if self._origin is None:
+            self._origin = now
+        behind = int((now - self._origin) / self.dt) + 1 - self.frame  # Frames due but not run
+        if behind > self.max_catchup:
+            # Too far behind: drop the missed time instead of spiralling
+            dropped = behind - self.max_catchup
+            self.stats.dropped_frames += dropped
+            self._origin += dropped * self.dt
+            behind = self.max_catchup
+
+        for i in range(max(0, behind)):
+            if i:
+                self.stats.catchup_frames += 1
+            await self.step()
+        return max(0, behind)
+
+    async def run(self) -> None:
+        """Run frames until stopped."""
+        self._running = True
+        while self._running:
+            await self.advance()
+            next_frame = self._origin + self.frame * self.dt
+            await asyncio.sleep(max(0.0, next_frame - self.clock()))
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> asyncio.Task:
+        """Start the loop as a task on an event loop (normally the reactor bridge's)."""
+        if self._task is None or self._task.done():
+            loop = loop or asyncio.get_event_loop()
+            self._task = loop.create_task(self.run())
+        return self._task
+
+    def stop(self) -> None:
+        """Stop the loop after the current frame."""
+        self._running = False
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get frame-time statistics."""
+        return dict(asdict(self.stats), frame=self.frame, sim_time=self.sim_time, dt=self.dt)
+
+# Global master loop instance
+_MASTER_LOOP: Optional[MasterLoop] = None
+
+def get_master_loop() -> MasterLoop:
+    """Get or create the global master loop"""
+    global _MASTER_LOOP
+    if _MASTER_LOOP is None:
+        _MASTER_LOOP = MasterLoop()
+    return _MASTER_LOOP
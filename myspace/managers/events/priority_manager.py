@@ -2,14 +2,68 @@
 Priority Event Manager for Space Engine
 
 Handles scheduling and execution of real-time events with priority ordering.
+
+Events are bucketed by priority, and each bucket is a heap ordered by due
+time. A system tick only looks at its own bucket and stops at the first
+event that is not yet due, so events scheduled for later, or for other
+systems, cost nothing until they are ready.
+
+Periodic work uses ``add_recurring``. It reuses one event, reschedules it on
+a fixed phase so it does not drift, and returns a handle that can cancel it.
+
+Sync callbacks run according to their ``ExecutionClass``:
+
+- ``INLINE`` (default): called directly on the event loop. This suits the
+  microsecond bookkeeping most events do.
+- ``THREAD``: bounded thread pool for blocking work such as raw pool queries.
+  Callbacks here must not touch typeclass attributes (``db``/``ndb``), which
+  go through the Django ORM and must stay on the reactor thread. Size it
+  with ``SPACE_EVENT_THREADS`` (default 4).
+- ``PROCESS``: process pool for CPU-heavy work. The callback and its
+  arguments must be picklable. Size it with ``SPACE_EVENT_PROCESSES``
+  (default: CPU count).
+
+Async callbacks are always awaited on the loop.
+
+Due times are read from ``world.clock``, so a headless run on a virtual
+clock schedules and processes events without waiting on wall time.
+
+Metrics recorded in ``world.metrics``: ``events.queue_depth`` (gauge),
+``events.queue_depth_sampled`` (histogram of the depth at the start of each
+tick, per system), ``events.lateness`` per system, and
+``events.callback_duration`` per callback.
 """
-from typing import Dict, List, Callable, Optional, Any, cast, Union
-from dataclasses import dataclass, field
-from enum import IntEnum
+from typing import Dict, List, Callable, Optional, Any, Tuple, cast, Union
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+import bisect
+import functools
+import itertools
+import os
+import weakref
+from world.metrics import SIZE_BUCKETS, get_logger, get_metrics
+from world.clock import now
+from dataclasses import dataclass, field, asdict
+from enum import Enum, IntEnum
 import heapq
+import math
 import time
 import asyncio
-import traceback
+
+logger = get_logger("events")
+
+def _callback_name(callback: Callable) -> str:
+    """Get the metric label for a callback."""
+    if isinstance(callback, functools.partial):
+        callback = callback.func
+    return getattr(callback, "__qualname__", None) or type(callback).__name__
+
+def _execution_key(callback: Callable) -> Tuple[Any, Any]:
+    """Split a callback into (owner, function), so bound methods are keyed on their instance."""
+    owner = getattr(callback, "__self__", None)
+    func = getattr(callback, "__func__", None)
+    if owner is not None and func is not None:
+        return owner, func
+    return callback, None
 
 class SystemPriority(IntEnum):
     """System priority levels"""
@@ -20,6 +74,32 @@ class SystemPriority(IntEnum):
     SENSORS = 60
     MISC = 0
 
+class ExecutionClass(Enum):
+    """Where a sync event callback runs"""
+    INLINE = "inline"
+    THREAD = "thread"
+    PROCESS = "process"
+
+@dataclass
+class ExecutorStats:
+    """Counters for one execution class"""
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    queued: int = 0  # Submitted but not yet finished
+    max_queued: int = 0
+    total_time: float = 0.0  # Seconds from submission to completion
+    max_time: float = 0.0
+
+    def record(self, elapsed: float, ok: bool) -> None:
+        self.queued -= 1
+        if ok:
+            self.completed += 1
+        else:
+            self.failed += 1
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+
 @dataclass(order=True)
 class Event:
     """Event data structure with priority ordering"""
@@ -28,25 +108,67 @@ class Event:
     callback: Callable = field(compare=False)
     args: tuple = field(default=(), compare=False)
     kwargs: dict = field(default_factory=dict, compare=False)
+    recurring: Optional["RecurringEvent"] = field(default=None, compare=False)
+    cancelled: bool = field(default=False, compare=False)
+    queued: bool = field(default=False, compare=False)
+    execution: Optional[ExecutionClass] = field(default=None, compare=False)
 
     def __post_init__(self):
         """Negate priority for reverse ordering (higher priority = earlier execution)"""
         self.priority = -self.priority
 
+class RecurringEvent:
+    """Handle for a periodic event registered with ``add_recurring``."""
+
+    def __init__(self, manager: "PriorityEventManager", event: Event,
+                 interval: float, start: float):
+        self._manager = manager
+        self.event = event
+        self.interval = interval
+        self.start = start  # Phase: runs are due at start + k * interval
+        self.runs = 0
+
+    @property
+    def active(self) -> bool:
+        """Whether the event is still scheduled."""
+        return not self.event.cancelled
+
+    def cancel(self) -> bool:
+        """Stop the event. Returns False if it was already cancelled."""
+        return self._manager._cancel(self.event)
+
+    def _next_due(self, now: float) -> float:
+        """Get the next due time on this event's phase after now, skipping missed runs."""
+        periods = math.floor((now - self.start) / self.interval) + 1
+        return self.start + periods * self.interval
+
 class PriorityEventManager:
     """Manages real-time game events with priority ordering."""
 
     def __init__(self):
-        """Ensure an event loop exists and use it."""
-        try:
-            self._loop = asyncio.get_running_loop()  # Get existing loop if available
-        except RuntimeError:
-            self._loop = asyncio.new_event_loop()  # Create new loop if none exists
-            asyncio.set_event_loop(self._loop)
-
-        self._event_queue: List[Event] = []
+        """Set up empty queues. Events run on whichever loop calls process_events."""
+        # Priority -> heap of (due time, sequence, event); sequence keeps ties FIFO
+        self._buckets: Dict[int, List[Tuple[float, int, Event]]] = {}
+        self._priority_order: List[int] = []  # Bucket priorities, ascending
+        self._sequence = itertools.count()
+        self._size = 0
         self._callbacks: Dict[str, Callable] = {}
 
+        # Execution classes for sync callbacks, and their lazily created pools.
+        # Held weakly by function or method owner, so registering a bound
+        # method does not keep its object alive.
+        self._execution: "weakref.WeakKeyDictionary[Any, Dict[Any, ExecutionClass]]" = \
+            weakref.WeakKeyDictionary()
+        self._pinned_execution: Dict[Tuple[Any, Any], ExecutionClass] = {}  # Builtins and the like
+        self._executors: Dict[ExecutionClass, Executor] = {}
+        self.EXECUTOR_SIZES: Dict[ExecutionClass, int] = {
+            ExecutionClass.THREAD: int(os.environ.get("SPACE_EVENT_THREADS", 4)),
+            ExecutionClass.PROCESS: int(os.environ.get("SPACE_EVENT_PROCESSES", os.cpu_count() or 2)),
+        }
+        self.executor_stats: Dict[ExecutionClass, ExecutorStats] = {
+            execution: ExecutorStats() for execution in ExecutionClass
+        }
+
         # Event priorities mapped from SystemPriority enum
         self.PRIORITIES: Dict[str, int] = {
             "movement": SystemPriority.MOVEMENT,
@@ -76,7 +198,8 @@ class PriorityEventManager:
         }
 
     def add_event(self, callback: Callable[..., Any], priority: int = 0, 
-                 delay: float = 0, *args: Any, **kwargs: Any) -> None:
+                 delay: float = 0, *args: Any, execution: Optional[ExecutionClass] = None,
+                 **kwargs: Any) -> None:
         """
         Add new event to queue
 
@@ -85,87 +208,254 @@ class PriorityEventManager:
             priority: Event priority (higher = sooner)
             delay: Delay in seconds before execution
             *args: Positional arguments for callback
+            execution: Where a sync callback runs; defaults to the class set
+                for the callback, or INLINE
             **kwargs: Keyword arguments for callback
         """
-        timestamp = time.time() + delay
+        timestamp = now() + delay
         event = Event(
             priority=priority,
             timestamp=timestamp,
             callback=callback,
             args=args,
-            kwargs=kwargs
+            kwargs=kwargs,
+            execution=execution
+        )
+        self._push(event)
+
+    def add_recurring(self, callback: Callable[..., Any], interval: float, priority: int = 0,
+                      *args: Any, delay: Optional[float] = None,
+                      execution: Optional[ExecutionClass] = None, **kwargs: Any) -> RecurringEvent:
+        """
+        Run a callback every interval until cancelled
+
+        Args:
+            callback: Function to call
+            interval: Seconds between runs
+            priority: Event priority (higher = sooner)
+            delay: Seconds before the first run; defaults to one interval
+            *args: Positional arguments for callback
+            execution: Where a sync callback runs (see add_event)
+            **kwargs: Keyword arguments for callback
+
+        Returns:
+            Handle whose cancel() stops the event
+        """
+        if interval <= 0:
+            raise ValueError("Recurring interval must be positive")
+        start = now() + (interval if delay is None else delay)
+        event = Event(
+            priority=priority,
+            timestamp=start,
+            callback=callback,
+            args=args,
+            kwargs=kwargs,
+            execution=execution
         )
-        heapq.heappush(self._event_queue, event)
+        handle = RecurringEvent(self, event, interval, start)
+        event.recurring = handle
+        self._push(event)
+        return handle
 
-    async def _execute_callback(self, callback: Callable, *args: Any, **kwargs: Any) -> None:
+    def _cancel(self, event: Event) -> bool:
+        """Mark an event cancelled; a queued one is discarded when it reaches the head of its bucket."""
+        if event.cancelled:
+            return False
+        event.cancelled = True
+        if event.queued:
+            event.queued = False
+            self._size -= 1
+        return True
+
+    @staticmethod
+    def _discard_cancelled(bucket: list) -> None:
+        """Pop cancelled events off the head of a bucket."""
+        while bucket and bucket[0][2].cancelled:
+            heapq.heappop(bucket)
+
+    def _push(self, event: Event) -> None:
+        """Add an event to its priority bucket."""
+        priority = -event.priority
+        bucket = self._buckets.get(priority)
+        if bucket is None:
+            bucket = self._buckets[priority] = []
+            bisect.insort(self._priority_order, priority)
+        heapq.heappush(bucket, (event.timestamp, next(self._sequence), event))
+        event.queued = True
+        self._size += 1
+        get_metrics().inc("events.scheduled")
+
+    def _priorities_for(self, system: Optional[str]) -> List[int]:
+        """Get the bucket priorities a tick should visit, highest first."""
+        if system is not None:
+            system_priority = self.PRIORITIES.get(system, None)
+            if system_priority is not None:
+                return [int(system_priority)] if system_priority in self._buckets else []
+        return self._priority_order[::-1]
+
+    def _executor(self, execution: ExecutionClass) -> Executor:
+        """Get the pool for an execution class, creating it on first use"""
+        executor = self._executors.get(execution)
+        if executor is None:
+            size = max(1, self.EXECUTOR_SIZES[execution])
+            if execution is ExecutionClass.PROCESS:
+                executor = ProcessPoolExecutor(max_workers=size)
+            else:
+                executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="space-events")
+            self._executors[execution] = executor
+        return executor
+
+    async def _execute_callback(self, callback: Callable, *args: Any,
+                                _execution: Optional[ExecutionClass] = None, **kwargs: Any) -> None:
         """Execute a callback, handling both async and sync functions"""
-        try:
-            if asyncio.iscoroutinefunction(callback):
+        metrics = get_metrics()
+        if asyncio.iscoroutinefunction(callback):
+            started = time.perf_counter()
+            try:
                 await callback(*args, **kwargs)
+            except Exception:
+                logger.exception("Error executing callback %s", _callback_name(callback))
+            finally:
+                metrics.observe("events.callback_duration", time.perf_counter() - started,
+                                _callback_name(callback))
+            return
+
+        execution = _execution or self.get_execution_class(callback)
+        stats = self.executor_stats[execution]
+        stats.submitted += 1
+        stats.queued += 1
+        stats.max_queued = max(stats.max_queued, stats.queued)
+        started = time.perf_counter()
+        ok = False
+        try:
+            if execution is ExecutionClass.INLINE:
+                callback(*args, **kwargs)
             else:
-                # Create a wrapper function that handles keyword arguments
-                def wrapped_callback():
-                    return callback(*args, **kwargs)
-                await self._loop.run_in_executor(None, wrapped_callback)
-        except Exception as e:
-            print(f"Error executing callback: {str(e)}\n{traceback.format_exc()}")
+                call = functools.partial(callback, *args, **kwargs)
+                await asyncio.get_running_loop().run_in_executor(self._executor(execution), call)
+            ok = True
+        except Exception:
+            logger.exception("Error executing callback %s", _callback_name(callback))
+        finally:
+            elapsed = time.perf_counter() - started
+            stats.record(elapsed, ok)
+            metrics.observe("events.callback_duration", elapsed, _callback_name(callback))
 
     async def process_events(self, system: Optional[str] = None, 
-                           max_process: Optional[int] = None) -> int:
+                           max_process: Optional[int] = None,
+                           time_budget: Optional[float] = None) -> int:
         """
-        Process events up to current time, optionally limited by system and count.
-        Returns number of events processed.
+        Process events up to current time, optionally limited by system, count
+        and time budget in seconds. Returns number of events processed.
         """
-        current_time = time.time()
+        current_time = now()
         processed = 0
-        events_to_requeue = []
+        metrics = get_metrics()
+        label = system or "all"
+        metrics.observe("events.queue_depth_sampled", self._size, label, SIZE_BUCKETS)
+        deadline = time.perf_counter() + time_budget if time_budget is not None else None
 
         # Calculate batch size
-        default_batch = max(len(self._event_queue), 1)  # Process all by default
+        default_batch = max(self._size, 1)  # Process all by default
         batch_size = max_process if max_process is not None else \
                     (self.BATCH_SIZES[system] if system and system in self.BATCH_SIZES else default_batch)
 
-        while self._event_queue and processed < batch_size:
-            event = heapq.heappop(self._event_queue)
+        for priority in self._priorities_for(system):
+            bucket = self._buckets[priority]
+            # Only due events are popped; the rest of the bucket is never touched
+            while processed < batch_size:
+                self._discard_cancelled(bucket)
+                if not bucket or bucket[0][0] > current_time:
+                    break
+                if deadline is not None and processed and time.perf_counter() >= deadline:
+                    metrics.set("events.queue_depth", self._size)
+                    return processed  # Out of budget; the rest waits for the next tick
+                _, _, event = heapq.heappop(bucket)
+                event.queued = False
+                self._size -= 1
+                metrics.observe("events.lateness", current_time - event.timestamp, label)
 
-            # Skip if event is in future
-            if event.timestamp > current_time:
-                events_to_requeue.append(event)
-                continue
+                # Process event
+                try:
+                    await self._execute_callback(
+                        event.callback, 
+                        *event.args, 
+                        _execution=event.execution,
+                        **event.kwargs
+                    )
+                    processed += 1
+                except Exception:
+                    logger.exception("Error processing event")
+                    # Don't increment processed count, but continue to next event
 
-            # Check if event matches requested system
-            if system is not None:
-                system_priority = self.PRIORITIES.get(system, None)
-                if system_priority is not None and -event.priority != system_priority:
-                    events_to_requeue.append(event)
-                    continue
+                handle = event.recurring
+                if handle is not None and not event.cancelled:
+                    # Reuse the same event on the next slot of its fixed phase
+                    handle.runs += 1
+                    event.timestamp = handle._next_due(now())
+                    self._push(event)
 
-            # Process event
-            try:
-                await self._execute_callback(
-                    event.callback, 
-                    *event.args, 
-                    **event.kwargs
-                )
-                processed += 1
-            except Exception as e:
-                print(f"Error processing event: {str(e)}\n{traceback.format_exc()}")
-                # Don't increment processed count, but continue to next event
-
-        # Requeue skipped events
-        for event in events_to_requeue:
-            heapq.heappush(self._event_queue, event)
+            if processed >= batch_size:
+                break
 
+        metrics.set("events.queue_depth", self._size)
         return processed
 
-    def register_callback(self, name: str, callback: Callable) -> None:
-        """Register a named callback"""
+    def register_callback(self, name: str, callback: Callable,
+                          execution: Optional[ExecutionClass] = None) -> None:
+        """Register a named callback, optionally with the execution class it runs in"""
         self._callbacks[name] = callback
+        if execution is not None:
+            self.set_execution_class(callback, execution)
+
+    def set_execution_class(self, callback: Callable, execution: ExecutionClass) -> None:
+        """Set where a sync callback runs when its events do not say otherwise"""
+        owner, func = _execution_key(callback)
+        try:
+            self._execution.setdefault(owner, {})[func] = execution
+        except TypeError:  # Cannot be weakly referenced
+            self._pinned_execution[(owner, func)] = execution
+
+    def get_execution_class(self, callback: Callable) -> ExecutionClass:
+        """Get where a sync callback runs when its events do not say otherwise"""
+        owner, func = _execution_key(callback)
+        try:
+            classes = self._execution.get(owner)
+        except TypeError:
+            return self._pinned_execution.get((owner, func), ExecutionClass.INLINE)
+        return classes.get(func, ExecutionClass.INLINE) if classes else ExecutionClass.INLINE
+
+    def clear_execution_class(self, callback: Callable) -> None:
+        """Forget the execution class set for a callback"""
+        owner, func = _execution_key(callback)
+        self._pinned_execution.pop((owner, func), None)
+        try:
+            classes = self._execution.get(owner)
+        except TypeError:
+            return
+        if classes is not None:
+            classes.pop(func, None)
+            if not classes:
+                del self._execution[owner]
+
+    def get_executor_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get queue depth and timing counters per execution class"""
+        return {
+            execution.value: dict(asdict(stats), workers=self.EXECUTOR_SIZES.get(execution, 0))
+            for execution, stats in self.executor_stats.items()
+        }
+
+    def shutdown_executors(self, wait: bool = True) -> None:
+        """Shut down the thread and process pools"""
+        for executor in self._executors.values():
+            executor.shutdown(wait=wait)
+        self._executors = {}
 
     def remove_callback(self, name: str) -> None:
-        """Remove a registered callback"""
-        if name in self._callbacks:
-            del self._callbacks[name]
+        """Remove a registered callback and its execution class"""
+        callback = self._callbacks.pop(name, None)
+        if callback is not None:
+            self.clear_execution_class(callback)
 
     def get_callback(self, name: str) -> Optional[Callable]:
         """Get registered callback by name"""
@@ -173,17 +463,27 @@ class PriorityEventManager:
 
     def clear_events(self) -> None:
         """Clear all pending events"""
-        self._event_queue = []
+        # Cleared events are no longer queued, so cancelling them later leaves the count alone
+        for bucket in self._buckets.values():
+            for _, _, event in bucket:
+                event.queued = False
+        self._buckets = {}
+        self._priority_order = []
+        self._size = 0
 
     def get_queue_size(self) -> int:
         """Get number of pending events"""
-        return len(self._event_queue)
+        return self._size
 
-    def get_next_event_time(self) -> Optional[float]:
-        """Get timestamp of next event"""
-        if self._event_queue:
-            return self._event_queue[0].timestamp
-        return None
+    def get_next_event_time(self, system: Optional[str] = None) -> Optional[float]:
+        """Get timestamp of the earliest-due live event, optionally for one system"""
+        heads = []
+        for priority in self._priorities_for(system):
+            bucket = self._buckets[priority]
+            self._discard_cancelled(bucket)
+            if bucket:
+                heads.append(bucket[0][0])
+        return min(heads, default=None)
 
 # Global event manager instance
 _EVENT_MANAGER: Optional[PriorityEventManager] = None
@@ -192,11 +492,5 @@ def get_event_manager() -> PriorityEventManager:
     """Get or create the global event manager instance"""
     global _EVENT_MANAGER
     if _EVENT_MANAGER is None:
-        try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
         _EVENT_MANAGER = PriorityEventManager()
     return _EVENT_MANAGER
\ No newline at end of file
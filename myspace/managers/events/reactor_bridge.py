@@ -0,0 +1,109 @@
+"""
+Bridge between Evennia's Twisted reactor and the Space Engine's asyncio code.
+
+The engine runs on a single asyncio loop owned by the reactor:
+
+- If Evennia runs on Twisted's asyncio reactor, the bridge uses that
+  reactor's own loop, so engine callbacks and Twisted share one loop.
+- Otherwise the bridge creates a loop and pumps it from a reactor
+  ``LoopingCall``. Every pump runs the callbacks that are ready and returns,
+  so the loop never blocks the reactor and never runs on another thread.
+
+Start the bridge from ``at_server_start`` and stop it from
+``at_server_stop``. Nothing here blocks or starts a loop at import time.
+"""
+from typing import Any, Coroutine, Optional
+import asyncio
+
+PUMP_INTERVAL: float = 0.005  # Seconds between pumps of a bridged loop
+
+class ReactorBridge:
+    """
+    Runs an asyncio loop under the Twisted reactor.
+
+    Args:
+        reactor: Twisted reactor; defaults to the global one
+        pump_interval: Seconds between pumps when the loop is not native
+    """
+
+    def __init__(self, reactor=None, pump_interval: float = PUMP_INTERVAL):
+        self._reactor = reactor
+        self.pump_interval = pump_interval
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.native = False  # True when the reactor itself runs the asyncio loop
+        self._pump_call = None
+
+    @property
+    def running(self) -> bool:
+        return self.loop is not None
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """Attach to, or create and pump, the engine's asyncio loop."""
+        if self.loop is not None:
+            return self.loop
+
+        reactor = self._reactor
+        if reactor is None:
+            from twisted.internet import reactor
+            self._reactor = reactor
+
+        native_loop = getattr(reactor, "_asyncioEventloop", None)
+        if native_loop is not None:
+            self.loop = native_loop
+            self.native = True
+        else:
+            from twisted.internet.task import LoopingCall
+            self.loop = asyncio.new_event_loop()
+            self._pump_call = LoopingCall(self.pump)
+            self._pump_call.clock = reactor
+            self._pump_call.start(self.pump_interval, now=True)
+
+        asyncio.set_event_loop(self.loop)
+        return self.loop
+
+    def pump(self) -> None:
+        """Run every callback that is ready on a bridged loop, then return."""
+        loop = self.loop
+        if loop is None or self.native or loop.is_running() or loop.is_closed():
+            return
+        loop.call_soon(loop.stop)
+        loop.run_forever()
+
+    def run(self, coro: Coroutine) -> asyncio.Task:
+        """Schedule a coroutine on the engine loop."""
+        if self.loop is None:
+            raise RuntimeError("Reactor bridge is not started")
+        return self.loop.create_task(coro)
+
+    def as_deferred(self, coro: Coroutine):
+        """Schedule a coroutine and return a Deferred firing with its result."""
+        from twisted.internet.defer import Deferred
+        return Deferred.fromFuture(self.run(coro))
+
+    def stop(self) -> None:
+        """Stop pumping, cancel outstanding engine tasks and close a bridged loop."""
+        if self.loop is None:
+            return
+        if self._pump_call is not None and self._pump_call.running:
+            self._pump_call.stop()
+        self._pump_call = None
+
+        if not self.native and not self.loop.is_closed():
+            pending = [t for t in asyncio.all_tasks(self.loop) if not t.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self.loop.close()
+        self.loop = None
+        self.native = False
+
+# Global reactor bridge instance
+_REACTOR_BRIDGE: Optional[ReactorBridge] = None
+
+def get_reactor_bridge() -> ReactorBridge:
+    """Get or create the global reactor bridge"""
+    global _REACTOR_BRIDGE
+    if _REACTOR_BRIDGE is None:
+        _REACTOR_BRIDGE = ReactorBridge()
+    return _REACTOR_BRIDGE
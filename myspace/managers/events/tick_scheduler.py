@@ -0,0 +1,254 @@
+"""
+Tick budget scheduler for the Space Engine systems.
+
+Each system tick gets a time budget for processing its events. The
+scheduler measures how late each tick starts and how long it runs, and
+skips a tick when the previous one for that system has not finished, so
+ticks can never pile up on the loop.
+
+When ticks run late or use most of their interval, the scheduler degrades
+one step at a time, lowest ``SystemPriority`` first. A system is slowed to
+every other tick and then shed entirely (general events, then SENSORS, then
+SHIELDS). POWER is only ever slowed, and MOVEMENT and COMBAT are never
+degraded. It recovers in reverse order once load drops.
+
+Each tick's duration and lateness are also recorded per system in the
+``systems.tick_time`` and ``systems.tick_lateness`` histograms.
+"""
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, asdict, field
+from managers.events.priority_manager import PriorityEventManager, SystemPriority, get_event_manager
+from world.metrics import get_logger, get_metrics
+import asyncio
+import time
+
+# Systems at or above this priority are never slowed or shed
+PROTECTED_PRIORITY = SystemPriority.COMBAT
+# Systems at or above this priority may be slowed but not shed
+SHED_BELOW_PRIORITY = SystemPriority.POWER
+SLOW_FACTOR = 2  # A slowed system runs every SLOW_FACTOR-th tick
+
+# Load thresholds (fraction of wall time spent in ticks, or lateness in intervals)
+OVERLOAD_THRESHOLD = 0.8
+RECOVER_THRESHOLD = 0.5
+LOAD_SMOOTHING = 0.2  # EWMA weight of the newest sample
+STEP_COOLDOWN = 1.0  # Seconds between degradation level changes
+
+logger = get_logger("scheduler")
+
+@dataclass
+class TickStats:
+    """Timing counters for one system"""
+    runs: int = 0
+    processed: int = 0
+    skipped_overlap: int = 0  # Tick fired while the previous one was still running
+    skipped_slow: int = 0  # Tick dropped because the system is slowed
+    shed: int = 0  # Tick dropped because the system is shed
+    over_budget: int = 0  # Ticks that ran past their budget
+    last_lateness: float = 0.0
+    max_lateness: float = 0.0
+    avg_lateness: float = 0.0
+    last_duration: float = 0.0
+    max_duration: float = 0.0
+    avg_duration: float = 0.0
+
+@dataclass
+class SystemState:
+    """Schedule and load state for one system"""
+    name: str
+    interval: float
+    priority: int
+    budget: float  # Seconds of event processing per tick
+    batch: Optional[int]
+    running: bool = False
+    next_due: Optional[float] = None
+    ticks: int = 0
+    load: float = 0.0  # EWMA of busy fraction of the interval
+    stats: TickStats = field(default_factory=TickStats)
+
+class TickScheduler:
+    """
+    Runs system ticks against per-system time budgets and degrades low
+    priority systems under load.
+
+    Args:
+        event_manager: Manager whose events the ticks process
+        intervals: Seconds between ticks per system; defaults to the manager's INTERVALS
+        budgets: Processing budget per tick; defaults to BUDGET_FRACTION of the interval
+        clock: Monotonic time source
+    """
+
+    BUDGET_FRACTION = 0.25  # Default share of a system's interval it may spend per tick
+    GENERAL = "general"  # Events for every system, processed on a fast tick
+    GENERAL_INTERVAL = 0.1
+    GENERAL_BATCH = 10
+
+    def __init__(self, event_manager: PriorityEventManager,
+                 intervals: Optional[Dict[str, float]] = None,
+                 budgets: Optional[Dict[str, float]] = None,
+                 clock=time.monotonic):
+        self.event_manager = event_manager
+        self.clock = clock
+        intervals = dict(intervals or event_manager.INTERVALS)
+        intervals.setdefault(self.GENERAL, self.GENERAL_INTERVAL)
+        budgets = budgets or {}
+
+        self.systems: Dict[str, SystemState] = {}
+        for name, interval in intervals.items():
+            priority = (SystemPriority.MISC if name == self.GENERAL
+                        else event_manager.PRIORITIES.get(name, SystemPriority.MISC))
+            batch = (self.GENERAL_BATCH if name == self.GENERAL
+                     else event_manager.BATCH_SIZES.get(name))
+            self.systems[name] = SystemState(
+                name=name,
+                interval=interval,
+                priority=int(priority),
+                budget=budgets.get(name, interval * self.BUDGET_FRACTION),
+                batch=batch,
+            )
+
+        self.steps = self._degradation_steps()
+        self.level = 0  # Number of degradation steps applied
+        self._last_step = float("-inf")
+        self._tasks: Dict[str, asyncio.Task] = {}  # Latest tick per system, kept referenced
+
+    def _degradation_steps(self) -> List[Tuple[str, str]]:
+        """Build the (action, system) steps, lowest priority first."""
+        steps = []
+        for state in sorted(self.systems.values(), key=lambda s: (s.priority, s.name)):
+            if state.priority >= PROTECTED_PRIORITY:
+                continue
+            steps.append(("slow", state.name))
+            if state.priority < SHED_BELOW_PRIORITY:
+                steps.append(("shed", state.name))
+        return steps
+
+    def mode(self, system: str) -> str:
+        """Get a system's current mode: "normal", "slow" or "shed"."""
+        mode = "normal"
+        for action, name in self.steps[:self.level]:
+            if name == system:
+                mode = action
+        return mode
+
+    @property
+    def load(self) -> float:
+        """Overall load: share of wall time spent in ticks, or worst lateness in intervals."""
+        busy = sum(state.load for state in self.systems.values())
+        late = max((s.stats.avg_lateness / s.interval for s in self.systems.values()), default=0.0)
+        return max(busy, late)
+
+    def admit(self, system: str) -> Tuple[bool, float]:
+        """
+        Decide whether a system tick that is due now should run.
+
+        Returns:
+            (run, due): whether to run the tick, and the time it was ideally due
+        """
+        state = self.systems[system]
+        now = self.clock()
+        due = state.next_due if state.next_due is not None else now
+        # Next ideal start; realign after a long stall instead of bursting
+        state.next_due = due + state.interval if now - due < state.interval else now + state.interval
+        state.ticks += 1
+
+        if state.running:
+            state.stats.skipped_overlap += 1
+            return False, due
+        mode = self.mode(system)
+        if mode == "shed":
+            state.stats.shed += 1
+            return False, due
+        if mode == "slow" and state.ticks % SLOW_FACTOR:
+            state.stats.skipped_slow += 1
+            return False, due
+        return True, due
+
+    def dispatch(self, system: str) -> Optional[asyncio.Task]:
+        """
+        Start a system tick unless it overlaps, is slowed this tick, or is shed.
+
+        Called on the event loop at the system's interval. Returns the task
+        running the tick, or None if it was skipped.
+        """
+        run, due = self.admit(system)
+        if not run:
+            return None
+        self.systems[system].running = True
+        task = asyncio.get_running_loop().create_task(self.run_tick(system, due))
+        self._tasks[system] = task
+        return task
+
+    async def run_tick(self, system: str, due: Optional[float] = None) -> int:
+        """Process one tick of a system's events within its budget."""
+        state = self.systems[system]
+        state.running = True
+        started = self.clock()
+        lateness = max(0.0, started - due) if due is not None else 0.0
+        processed = 0
+        try:
+            processed = await self.event_manager.process_events(
+                system=None if system == self.GENERAL else system,
+                max_process=state.batch,
+                time_budget=state.budget
+            )
+        except Exception:
+            logger.exception("Error processing %s tick", system)
+        finally:
+            state.running = False
+            self._record(state, lateness, self.clock() - started, processed)
+        return processed
+
+    def _record(self, state: SystemState, lateness: float, duration: float, processed: int) -> None:
+        stats = state.stats
+        stats.runs += 1
+        stats.processed += processed
+        if duration > state.budget:
+            stats.over_budget += 1
+        stats.last_lateness = lateness
+        stats.max_lateness = max(stats.max_lateness, lateness)
+        stats.avg_lateness += LOAD_SMOOTHING * (lateness - stats.avg_lateness)
+        stats.last_duration = duration
+        stats.max_duration = max(stats.max_duration, duration)
+        stats.avg_duration += LOAD_SMOOTHING * (duration - stats.avg_duration)
+        metrics = get_metrics()
+        metrics.observe("systems.tick_time", duration, state.name)
+        metrics.observe("systems.tick_lateness", lateness, state.name)
+        state.load += LOAD_SMOOTHING * (duration / state.interval - state.load)
+        self._adjust()
+
+    def _adjust(self) -> None:
+        """Step degradation up or down one level when load crosses a threshold."""
+        now = self.clock()
+        if now - self._last_step < STEP_COOLDOWN:
+            return
+        load = self.load
+        if load > OVERLOAD_THRESHOLD and self.level < len(self.steps):
+            self.level += 1
+            action, name = self.steps[self.level - 1]
+            logger.warning("Space Engine overloaded (%.2f): %s %s", load, action, name)
+        elif load < RECOVER_THRESHOLD and self.level > 0:
+            action, name = self.steps[self.level - 1]
+            self.level -= 1
+            logger.info("Space Engine recovering (%.2f): restore %s", load, name)
+        else:
+            return
+        self._last_step = now
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Get per-system tick statistics and modes."""
+        return {
+            name: dict(asdict(state.stats), mode=self.mode(name), budget=state.budget,
+                       load=state.load)
+            for name, state in self.systems.items()
+        }
+
+# Global tick scheduler instance
+_TICK_SCHEDULER: Optional[TickScheduler] = None
+
+def get_tick_scheduler(event_manager: Optional[PriorityEventManager] = None) -> TickScheduler:
+    """Get or create the global tick scheduler, driving the given or global event manager"""
+    global _TICK_SCHEDULER
+    if _TICK_SCHEDULER is None:
+        _TICK_SCHEDULER = TickScheduler(event_manager or get_event_manager())
+    return _TICK_SCHEDULER
@@ -1,13 +1,33 @@
 """
 Space Engine initialization module.
+
+``start_engine`` and ``stop_engine`` are called from the server's
+``at_server_start`` and ``at_server_stop`` hooks. The engine runs on the
+asyncio loop provided by the reactor bridge, so starting it never blocks and
+every engine callback runs on the reactor's thread.
 """
-from typing import Optional
-from power_manager import PowerManager
-from sensor_manager import SensorManager
+from typing import Dict, Optional
+from managers.power_manager import PowerManager
+from managers.sensor_manager import SensorManager
+from managers.capacitor_engine import charge_capacitors
+from managers.combat_engine import COMBAT_TICK, resolve_combat
+from managers.events.priority_manager import (
+    get_event_manager, SystemPriority, PriorityEventManager, RecurringEvent
+)
+from managers.events.tick_scheduler import get_tick_scheduler
+from managers.events.master_loop import get_master_loop
+from managers.events.reactor_bridge import get_reactor_bridge
 from world.database.queries import get_db_connection
-from events.priority_manager import get_event_manager, SystemPriority
-import traceback
-import asyncio
+from world.space.spatial_index import get_spatial_index
+from world.space.sectors.sector_manager import get_sector_manager
+from world.space.sectors.activity import update_sector_activity, update_crew
+from world.space.database.position_buffer import get_position_buffer
+from world.timing_wheel import get_timing_wheel
+from world.constants import PARSEC_TO_SU
+from world.metrics import get_logger
+import os
+
+logger = get_logger("engine")
 
 def initialize_database():
     """Initialize database connection and setup tables"""
@@ -15,70 +35,160 @@ def initialize_database():
         with get_db_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute("CREATE EXTENSION IF NOT EXISTS postgis")
-                print("Database initialization successful")
-    except Exception as e:
-        print(f"Database initialization error: {str(e)}\n{traceback.format_exc()}")
+                logger.info("Database initialization successful")
+    except Exception:
+        logger.exception("Database initialization error")
         raise
 
 async def update_all_systems() -> None:
     """Global power system update callback"""
     try:
         await PowerManager.update_all_systems()
-    except Exception as e:
-        print(f"Power system update error: {str(e)}\n{traceback.format_exc()}")
+    except Exception:
+        logger.exception("Power system update error")
 
 async def update_sensor_contacts() -> None:
     """Global sensor update callback"""
     try:
         await SensorManager.update_sensor_contacts()
-    except Exception as e:
-        print(f"Sensor update error: {str(e)}\n{traceback.format_exc()}")
+    except Exception:
+        logger.exception("Sensor update error")
+
+def prewarm_sectors() -> int:
+    """
+    Cache the sector IDs of every occupied sector before play starts.
+
+    ``SPACE_SECTOR_PREWARM`` may also name a region to prewarm, as
+    ``x_min,y_min,x_max,y_max`` in parsecs.
+
+    Returns:
+        Number of sectors resolved
+    """
+    sectors = get_sector_manager()
+    occupied = {
+        sectors.get_sector_coordinates(tuple(c / PARSEC_TO_SU for c in position))
+        for position in get_spatial_index().positions()
+    }
+    count = sectors.prewarm_cells(occupied)
+    region = os.getenv("SPACE_SECTOR_PREWARM")
+    if region:
+        x_min, y_min, x_max, y_max = (float(v) for v in region.split(","))
+        count += sectors.prewarm((x_min, y_min, 0.0), (x_max, y_max, 0.0))
+    return count
+
+def rebuild_crews() -> int:
+    """
+    Count the players already on bridges, whose crew counts a reload forgot.
+
+    Returns:
+        Number of puppeted characters crewing a ship
+    """
+    try:
+        from evennia import SESSION_HANDLER
+    except ImportError:
+        return 0
+    crewed = 0
+    for session in SESSION_HANDLER.get_sessions():
+        puppet = session.get_puppet()
+        if puppet is not None and update_crew(puppet) is not None:
+            crewed += 1
+    return crewed
+
+# Recurring core system events, by callback name
+_system_events: Dict[str, RecurringEvent] = {}
 
 def initialize_systems():
     """Initialize all core space engine systems"""
     try:
-        print('Initializing database...')
+        logger.info("Initializing database...")
         initialize_database()
 
+        # Mirror live object positions into the in-memory spatial index
+        indexed = get_spatial_index().load_from_database()
+        logger.info("Spatial index loaded with %d objects", indexed)
+        logger.info("Sector cache prewarmed with %d sectors", prewarm_sectors())
+
         # Get the global event manager
         event_manager = get_event_manager()
+        cancel_system_events()
 
         # Initialize core system events with async wrappers
         event_manager.register_callback("power_update", update_all_systems)
         event_manager.register_callback("sensor_update", update_sensor_contacts)
 
-        # Register initial system events - actual scheduling handled by Evennia
+        # Register recurring system events, run by the master loop's system ticks
         systems = {
-            "power_update": SystemPriority.POWER,
-            "sensor_update": SystemPriority.SENSORS,
+            "power_update": ("power", SystemPriority.POWER),
+            "sensor_update": ("sensors", SystemPriority.SENSORS),
         }
 
-        for callback_name, priority in systems.items():
+        for callback_name, (system, priority) in systems.items():
             callback = event_manager.get_callback(callback_name)
             if callback:
-                event_manager.add_event(
+                _system_events[callback_name] = event_manager.add_recurring(
                     callback,
-                    priority=priority,
+                    event_manager.INTERVALS[system],
+                    priority,
                     delay=0  # Initial events start immediately
                 )
             else:
-                print(f"Warning: Callback {callback_name} not found")
+                logger.warning("Callback %s not found", callback_name)
 
-        print('Space Engine components loaded successfully')
+        logger.info("Space Engine components loaded successfully")
         return event_manager
-    except Exception as e:
-        print(f"System initialization error: {str(e)}\n{traceback.format_exc()}")
+    except Exception:
+        logger.exception("System initialization error")
         raise
 
-# Global event manager instance for server services
-try:
+def cancel_system_events() -> None:
+    """Cancel the recurring core system events."""
+    for handle in _system_events.values():
+        handle.cancel()
+    _system_events.clear()
+
+def flush_staged_positions():
+    """Master loop stage writing staged positions to the database."""
+    try:
+        get_position_buffer().flush()
+    except Exception:
+        logger.exception("Error flushing positions")
+
+def start_engine() -> PriorityEventManager:
+    """
+    Start the Space Engine on the reactor's asyncio loop.
+
+    Returns:
+        The global event manager
+    """
+    loop = get_reactor_bridge().start()
+    get_timing_wheel().attach(loop)
     event_manager = initialize_systems()
-    
-    # Get or create event loop
-    loop = asyncio.get_event_loop()
-    if not loop.is_running():
-        # Keep the process alive by running the event loop
-        loop.run_forever()
-except Exception as e:
-    print(f"Failed to initialize event manager: {str(e)}\n{traceback.format_exc()}")
-    event_manager = None
\ No newline at end of file
+    logger.info("Crew restored for %d characters on bridges", rebuild_crews())
+
+    # One fixed-timestep loop dispatches every system in priority order
+    # each frame. System ticks keep their time budgets and degradation.
+    master = get_master_loop()
+    master.clear_stages()
+    # Wake sectors with something happening before the systems tick
+    master.add_stage("sector_activity", update_sector_activity, 1.0, SystemPriority.MOVEMENT)
+    master.add_scheduler(get_tick_scheduler(event_manager))
+    # Resolve every fire order queued during the combat tick together
+    master.add_stage("combat_orders", resolve_combat, COMBAT_TICK, SystemPriority.COMBAT)
+    # Charge every weapon capacitor in one pass
+    master.add_stage("capacitors", charge_capacitors, 1.0, SystemPriority.POWER)
+    # Persist staged position changes in bulk
+    master.add_stage("persistence", flush_staged_positions,
+                     get_position_buffer().flush_interval, SystemPriority.MISC)
+    master.start(loop)
+    return event_manager
+
+def stop_engine() -> None:
+    """Stop the Space Engine and release the reactor's asyncio loop."""
+    get_master_loop().stop()
+    cancel_system_events()
+    from typeclass.station import Station
+    Station.stop_all_updates()
+    # Write out any positions still staged for persistence
+    flush_staged_positions()
+    get_event_manager().shutdown_executors(wait=False)
+    get_reactor_bridge().stop()
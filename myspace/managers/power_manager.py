@@ -1,8 +1,19 @@
 """
 Power management system for space objects with hierarchical power allocation.
+
+The power hierarchy is the same for every ship, so it is compiled once into
+flat arrays (parent index, power ratio, priority, child indices and db.alloc
+slot) shared by all managers. Each manager only owns a float array of
+allocations, and requests walk the parent chain by index.
 """
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple, Sequence
 from dataclasses import dataclass, field
+from array import array
+from managers.capacitor_engine import get_capacitor_engine
+from world.space.sectors.activity import get_sector_activity
+import weakref
+
+SHIELD_FACINGS: Tuple[str, ...] = ("forward", "starboard", "aft", "port", "dorsal", "ventral")
 
 @dataclass
 class PowerSystem:
@@ -14,16 +25,161 @@ class PowerSystem:
     power_ratio: float = 1.0  # Ratio of total reactor power this system can use
     priority: int = 0  # Higher number = higher priority
 
+def build_power_hierarchy() -> Dict[str, PowerSystem]:
+    """Build the power system hierarchy with relative power ratios."""
+    # Initialize systems with empty children lists
+    systems = {
+        "total": PowerSystem("Total EPS", power_ratio=1.0, priority=0),
+        "helm": PowerSystem("Total Helm", parent="total", power_ratio=0.6, priority=3),
+        "movement": PowerSystem("Movement", parent="helm", power_ratio=0.4, priority=3),
+        "shields": PowerSystem("Shields", parent="helm", power_ratio=0.2, priority=2),
+        "tactical": PowerSystem("Total Tactical", parent="total", power_ratio=0.3, priority=2),
+        "beam": PowerSystem("Beam Weapons", parent="tactical", power_ratio=0.15, priority=2),
+        "missile": PowerSystem("Missile Weapons", parent="tactical", power_ratio=0.15, priority=1),
+        "operations": PowerSystem("Total Operations", parent="total", power_ratio=0.1, priority=1),
+        "transporters": PowerSystem("Transporters", parent="operations", power_ratio=0.06, priority=1),
+        "misc": PowerSystem("Miscellaneous", parent="operations", power_ratio=0.04, priority=0),
+    }
+
+    # Initialize shield facings with equal power ratios
+    shield_ratio = 0.2 / len(SHIELD_FACINGS)  # Divide shield power among facings
+    for facing in SHIELD_FACINGS:
+        systems[f"shield_{facing}"] = PowerSystem(
+            f"{facing.capitalize()} shield",
+            parent="shields",
+            power_ratio=shield_ratio,
+            priority=2
+        )
+
+    # Set up children lists
+    for name, system in systems.items():
+        if system.parent and system.parent in systems:
+            if name not in systems[system.parent].children:
+                systems[system.parent].children.append(name)
+
+    return systems
+
+class PowerTopology:
+    """
+    A power hierarchy compiled into flat, index-addressed arrays.
+
+    Attributes:
+        keys: System keys in index order
+        index: System key -> index
+        labels: Display names
+        parents: Parent index, or -1 for the root
+        ratios: Share of reactor power each system may draw
+        priorities: Allocation priority (higher first)
+        children: Child indices of each system
+        shield_slots: Index into db.alloc["shield"], or -1 for non-shield systems
+        leaves: Indices of systems without children
+        rollup_order: Indices of systems with children, deepest first
+    """
+
+    def __init__(self, systems: Dict[str, PowerSystem]):
+        self.keys: Tuple[str, ...] = tuple(systems)
+        self.index: Dict[str, int] = {key: i for i, key in enumerate(self.keys)}
+        self.labels: Tuple[str, ...] = tuple(s.name for s in systems.values())
+        self.parents = array('i', (
+            self.index[s.parent] if s.parent in self.index else -1 for s in systems.values()
+        ))
+        self.ratios = array('d', (s.power_ratio for s in systems.values()))
+        self.priorities = array('i', (s.priority for s in systems.values()))
+        self.children: Tuple[Tuple[int, ...], ...] = tuple(
+            tuple(self.index[c] for c in s.children) for s in systems.values()
+        )
+        self.shield_slots = array('i', (
+            SHIELD_FACINGS.index(key[len("shield_"):])
+            if key.startswith("shield_") and key[len("shield_"):] in SHIELD_FACINGS else -1
+            for key in self.keys
+        ))
+        self.leaves: Tuple[int, ...] = tuple(i for i, c in enumerate(self.children) if not c)
+        self.rollup_order: Tuple[int, ...] = tuple(sorted(
+            (i for i, c in enumerate(self.children) if c),
+            key=self.depth, reverse=True
+        ))
+
+    def depth(self, idx: int) -> int:
+        """Number of ancestors of a system."""
+        depth = 0
+        while self.parents[idx] >= 0:
+            idx = self.parents[idx]
+            depth += 1
+        return depth
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+class PowerSystemView:
+    """PowerSystem-like view of one entry in a manager's allocation array."""
+    __slots__ = ("_mgr", "_idx")
+
+    def __init__(self, mgr: "PowerManager", idx: int):
+        self._mgr = mgr
+        self._idx = idx
+
+    @property
+    def name(self) -> str:
+        return self._mgr.topology.labels[self._idx]
+
+    @property
+    def parent(self) -> Optional[str]:
+        parent = self._mgr.topology.parents[self._idx]
+        return self._mgr.topology.keys[parent] if parent >= 0 else None
+
+    @property
+    def children(self) -> List[str]:
+        keys = self._mgr.topology.keys
+        return [keys[c] for c in self._mgr.topology.children[self._idx]]
+
+    @property
+    def power_ratio(self) -> float:
+        return self._mgr.topology.ratios[self._idx]
+
+    @property
+    def priority(self) -> int:
+        return self._mgr.topology.priorities[self._idx]
+
+    @property
+    def allocation(self) -> float:
+        return self._mgr.allocations[self._idx]
+
+    @allocation.setter
+    def allocation(self, value: float) -> None:
+        self._mgr.allocations[self._idx] = value
+
+# Shared compiled hierarchy
+_POWER_TOPOLOGY: Optional[PowerTopology] = None
+
+def get_power_topology() -> PowerTopology:
+    """Get or compile the shared power topology."""
+    global _POWER_TOPOLOGY
+    if _POWER_TOPOLOGY is None:
+        _POWER_TOPOLOGY = PowerTopology(build_power_hierarchy())
+    return _POWER_TOPOLOGY
+
 class PowerManager:
     """
     Handles hierarchical power allocation for space objects.
     Implements dynamic power distribution based on reactor output and subsystem priorities.
+
+    ``request_power`` answers immediately for this ship; each power tick the
+    fleet solver (see ``managers.power_solver``) then re-solves every ship's
+    standing requests together by priority.
     """
 
+    # Every live manager, so the power tick can solve the whole fleet at once
+    _registry: "weakref.WeakSet[PowerManager]" = weakref.WeakSet()
+
     def __init__(self, space_object):
         self.obj = space_object
-        self.systems: Dict[str, PowerSystem] = {}
-        self._init_power_hierarchy()
+        self.topology = get_power_topology()
+        self.allocations = array('d', bytes(8 * len(self.topology)))
+        self.requests = array('d', bytes(8 * len(self.topology)))  # Standing requests
+        PowerManager._registry.add(self)
+        self.systems: Dict[str, PowerSystemView] = {
+            key: PowerSystemView(self, i) for i, key in enumerate(self.topology.keys)
+        }
 
         # Initialize db.alloc if not exists
         if not hasattr(self.obj.db, 'alloc'):
@@ -38,43 +194,30 @@ class PowerManager:
                 "operations": 0.0,
                 "transporters": 0.0,
                 "misc": 0.0,
-                "shield": [0.0] * 6  # For the 6 shield facings
+                "shield": [0.0] * len(SHIELD_FACINGS)  # For the 6 shield facings
             }
+        self._load_requests()
         self._update_available_power()
 
-    def _init_power_hierarchy(self):
-        """Initialize the power system hierarchy with relative power ratios."""
-        # Initialize systems with empty children lists
-        self.systems = {
-            "total": PowerSystem("Total EPS", power_ratio=1.0, priority=0),
-            "helm": PowerSystem("Total Helm", parent="total", power_ratio=0.6, priority=3),
-            "movement": PowerSystem("Movement", parent="helm", power_ratio=0.4, priority=3),
-            "shields": PowerSystem("Shields", parent="helm", power_ratio=0.2, priority=2),
-            "tactical": PowerSystem("Total Tactical", parent="total", power_ratio=0.3, priority=2),
-            "beam": PowerSystem("Beam Weapons", parent="tactical", power_ratio=0.15, priority=2),
-            "missile": PowerSystem("Missile Weapons", parent="tactical", power_ratio=0.15, priority=1),
-            "operations": PowerSystem("Total Operations", parent="total", power_ratio=0.1, priority=1),
-            "transporters": PowerSystem("Transporters", parent="operations", power_ratio=0.06, priority=1),
-            "misc": PowerSystem("Miscellaneous", parent="operations", power_ratio=0.04, priority=0),
-        }
+    def _load_requests(self) -> None:
+        """Seed standing requests from the saved leaf allocations, so a solve keeps them."""
+        alloc = self.obj.db.alloc
+        shields = alloc.get("shield") or []
+        for idx in self.topology.leaves:
+            slot = self.topology.shield_slots[idx]
+            if slot >= 0:
+                saved = shields[slot] if slot < len(shields) else 0.0
+            else:
+                saved = alloc.get(self.topology.keys[idx], 0.0)
+            self.requests[idx] = max(float(saved or 0.0), 0.0)
 
-        # Initialize shield facings with equal power ratios
-        shield_facings = ["forward", "starboard", "aft", "port", "dorsal", "ventral"]
-        shield_ratio = 0.2 / len(shield_facings)  # Divide shield power among facings
-        for facing in shield_facings:
-            key = f"shield_{facing}"
-            self.systems[key] = PowerSystem(
-                f"{facing.capitalize()} shield",
-                parent="shields",
-                power_ratio=shield_ratio,
-                priority=2
-            )
-
-        # Set up children lists
-        for name, system in self.systems.items():
-            if system.parent and system.parent in self.systems:
-                if name not in self.systems[system.parent].children:
-                    self.systems[system.parent].children.append(name)
+    @classmethod
+    def for_object(cls, space_object) -> "PowerManager":
+        """Get the live manager for a space object, creating one if it has none."""
+        for mgr in list(cls._registry):
+            if mgr.obj is space_object:
+                return mgr
+        return cls(space_object)
 
     def _get_reactor_power(self) -> tuple[float, float, float]:
         """Get power from main reactor, aux reactor, and batteries."""
@@ -92,10 +235,11 @@ class PowerManager:
 
         return main_power, aux_power, batt_power
 
-    def _update_available_power(self):
+    def _update_available_power(self) -> float:
         """Update available power based on reactor outputs and battery."""
         main_power, aux_power, batt_power = self._get_reactor_power()
         self._available_power = main_power + aux_power + batt_power
+        return self._available_power
 
     def get_available_power(self) -> float:
         """Get total available power based on reactor output."""
@@ -103,69 +247,91 @@ class PowerManager:
 
     def get_max_system_power(self, system: str) -> float:
         """Calculate maximum power for a system based on reactor capacity."""
-        if system not in self.systems:
+        idx = self.topology.index.get(system)
+        if idx is None:
             return 0.0
+        return self._update_available_power() * self.topology.ratios[idx]
 
-        main_power, aux_power, batt_power = self._get_reactor_power()
-        total_reactor_power = main_power + aux_power + batt_power
-        return total_reactor_power * self.systems[system].power_ratio
+    def _store(self, idx: int, allocation: float) -> None:
+        """Write one allocation to the array and its db.alloc slot."""
+        self.allocations[idx] = allocation
+        slot = self.topology.shield_slots[idx]
+        if slot >= 0:
+            self.obj.db.alloc["shield"][slot] = allocation
+        else:
+            self.obj.db.alloc[self.topology.keys[idx]] = allocation
 
     def request_power(self, system: str, amount: float) -> float:
         """
         Request power for a system with constraints and rollup calculations.
         Also updates persistent db.alloc values.
         """
-        if system not in self.systems or amount <= 0:
+        idx = self.topology.index.get(system)
+        if idx is None or amount <= 0:
             return 0.0
+        self.requests[idx] = amount
 
-        self._update_available_power()  # Ensure we have current power levels
-        if self._available_power <= 0:
+        available = self._update_available_power()  # Ensure we have current power levels
+        if available <= 0:
             return 0.0
 
-        # Calculate max allowed power based on system's ratio of total reactor power
-        max_allowed = min(self.get_max_system_power(system), amount)
-        # Allocate power within available limits
-        allocated = min(max_allowed, self._available_power)
-
-        # Update system allocation in memory
-        self.systems[system].allocation = allocated
-
-        # Update persistent allocation in db
-        if system.startswith("shield_"):
-            # Extract shield index (0-5) from facing name
-            shield_idx = ["forward", "starboard", "aft", "port", "dorsal", "ventral"].index(
-                system.split("_")[1]
-            )
-            self.obj.db.alloc["shield"][shield_idx] = allocated
-        else:
-            self.obj.db.alloc[system] = allocated
-
-        # Update parent allocations both in memory and db
-        current = system
-        while current in self.systems and self.systems[current].parent:
-            parent = self.systems[current].parent
-            if parent not in self.systems:
-                break
-            parent_system = self.systems[parent]
-            parent_allocation = sum(
-                self.systems[child].allocation 
-                for child in parent_system.children
-            )
-            parent_system.allocation = parent_allocation
-            self.obj.db.alloc[parent] = parent_allocation
-            current = parent
+        # Cap by the system's ratio of total reactor power, then by what is available
+        allocated = min(available * self.topology.ratios[idx], amount, available)
+        self._store(idx, allocated)
+
+        # Roll the change up the parent chain
+        allocations = self.allocations
+        parents = self.topology.parents
+        children = self.topology.children
+        parent = parents[idx]
+        while parent >= 0:
+            self._store(parent, sum(allocations[c] for c in children[parent]))
+            parent = parents[parent]
 
+        self._publish_weapon_power()
         return allocated
 
+    def _publish_weapon_power(self) -> None:
+        """Pass beam and missile allocations to the capacitor engine."""
+        index = self.topology.index
+        get_capacitor_engine().set_power(
+            self.obj, self.allocations[index["beam"]], self.allocations[index["missile"]]
+        )
+
+    def release_power(self, system: str) -> None:
+        """Withdraw a system's standing request; it is dropped on the next power tick."""
+        idx = self.topology.index.get(system)
+        if idx is not None:
+            self.requests[idx] = 0.0
+
+    def load_allocations(self, allocations: Sequence[float]) -> None:
+        """Replace every allocation (rollups included) and persist them in one write."""
+        self.allocations = array('d', allocations)
+        alloc = dict(self.obj.db.alloc)
+        shields = list(alloc.get("shield", [0.0] * len(SHIELD_FACINGS)))
+        for key, slot, value in zip(self.topology.keys, self.topology.shield_slots, self.allocations):
+            if slot >= 0:
+                shields[slot] = value
+            else:
+                alloc[key] = value
+        alloc["shield"] = shields
+        self.obj.db.alloc = alloc
+        self._publish_weapon_power()
+
+    @classmethod
+    async def update_all_systems(cls) -> None:
+        """Power tick: solve allocations for every ship in an active sector."""
+        from managers.power_solver import get_power_solver
+        get_power_solver().solve(get_sector_activity().select(list(cls._registry)))
+
     def get_system_power(self, system: str) -> float:
         """Get current power allocation for a system."""
-        if system not in self.systems:
+        idx = self.topology.index.get(system)
+        if idx is None:
             return 0.0
 
         # Return allocation from db for persistence
-        if system.startswith("shield_"):
-            shield_idx = ["forward", "starboard", "aft", "port", "dorsal", "ventral"].index(
-                system.split("_")[1]
-            )
-            return self.obj.db.alloc["shield"][shield_idx]
-        return self.obj.db.alloc.get(system, 0.0)
\ No newline at end of file
+        slot = self.topology.shield_slots[idx]
+        if slot >= 0:
+            return self.obj.db.alloc["shield"][slot]
+        return self.obj.db.alloc.get(system, 0.0)
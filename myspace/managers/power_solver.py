@@ -0,0 +1,140 @@
+"""
+Fleet-wide power solver.
+
+Once per power tick every ship's reactor output and standing power requests
+are stacked into matrices and allocated in one NumPy pass: priority levels
+are served highest first, and within a level the remaining power is
+water-filled so small requests are met in full before large ones are
+trimmed. Results, parent rollups included, are then written back to each
+``PowerManager`` in bulk.
+"""
+from typing import Iterable, List, Optional
+from managers.power_manager import PowerManager, PowerTopology, get_power_topology
+import numpy as np
+
+def water_fill(demand: np.ndarray, budget: np.ndarray) -> np.ndarray:
+    """
+    Share each row's budget across its demands by water-filling.
+
+    Every demand receives min(demand, level), with the level chosen per row so
+    the allocations sum to the budget (or every demand is met in full).
+
+    Args:
+        demand: (N, K) non-negative demands
+        budget: (N,) non-negative budgets
+
+    Returns:
+        (N, K) allocations
+    """
+    n, k = demand.shape
+    if k == 0:
+        return demand.copy()
+
+    ordered = np.sort(demand, axis=1)
+    before = np.cumsum(ordered, axis=1) - ordered  # Sum of smaller demands
+    remaining = k - np.arange(k)  # Demands at or above each sorted position
+    needed = before + ordered * remaining  # Power needed to lift the level to each demand
+
+    filled = (needed <= budget[:, None]).sum(axis=1)  # Demands met in full
+    pivot = np.minimum(filled, k - 1)
+    rows = np.arange(n)
+    level = (budget - before[rows, pivot]) / remaining[pivot]
+    level = np.where(filled >= k, np.inf, level)
+    return np.minimum(demand, level[:, None])
+
+class FleetPowerSolver:
+    """
+    Solves priority-weighted power allocation for many ships at once.
+
+    Requests on systems with children are spread over their leaf systems in
+    proportion to the leaves' power ratios, so only leaves are solved for;
+    parent allocations are the rollup of their children.
+    """
+
+    def __init__(self, topology: Optional[PowerTopology] = None):
+        self.topology = topology or get_power_topology()
+        topo = self.topology
+        size = len(topo)
+        self.leaves = np.array(topo.leaves, dtype=np.intp)
+        self.ratios = np.array(topo.ratios, dtype=np.float64)
+
+        # (systems, leaves): how a request on each system maps onto leaves
+        self.leaf_share = np.zeros((size, len(self.leaves)))
+        for col, leaf in enumerate(topo.leaves):
+            node = leaf
+            while node >= 0:
+                self.leaf_share[node, col] = self.ratios[leaf]
+                node = topo.parents[node]
+        totals = self.leaf_share.sum(axis=1, keepdims=True)
+        np.divide(self.leaf_share, totals, out=self.leaf_share, where=totals > 0)
+
+        leaf_priorities = np.array([topo.priorities[i] for i in topo.leaves])
+        # Leaf columns grouped by priority, highest first
+        self.priority_groups: List[np.ndarray] = [
+            np.flatnonzero(leaf_priorities == level)
+            for level in sorted(set(leaf_priorities.tolist()), reverse=True)
+        ]
+        self.children = [np.array(topo.children[i], dtype=np.intp) for i in range(size)]
+
+    def allocate(self, available: np.ndarray, requests: np.ndarray) -> np.ndarray:
+        """
+        Solve allocations for stacked ships.
+
+        Args:
+            available: (N,) reactor power per ship
+            requests: (N, S) standing requests per ship and system
+
+        Returns:
+            (N, S) allocations for every system, parents rolled up
+        """
+        available = np.maximum(np.asarray(available, dtype=np.float64), 0.0)
+        requests = np.maximum(np.asarray(requests, dtype=np.float64), 0.0)
+
+        caps = available[:, None] * self.ratios[self.leaves][None, :]
+        demand = np.minimum(requests @ self.leaf_share, caps)
+
+        leaf_alloc = np.zeros_like(demand)
+        budget = available.copy()
+        for group in self.priority_groups:
+            granted = water_fill(demand[:, group], budget)
+            leaf_alloc[:, group] = granted
+            budget = np.maximum(budget - granted.sum(axis=1), 0.0)
+
+        result = np.zeros((available.shape[0], len(self.topology)))
+        result[:, self.leaves] = leaf_alloc
+        for parent in self.topology.rollup_order:
+            result[:, parent] = result[:, self.children[parent]].sum(axis=1)
+        return result
+
+    def solve(self, managers: Optional[Iterable[PowerManager]] = None) -> np.ndarray:
+        """
+        Re-solve and write back allocations for every ship.
+
+        Args:
+            managers: Managers to solve; defaults to every live manager
+
+        Returns:
+            (N, S) allocations in the order the managers were solved
+        """
+        managers = list(PowerManager._registry if managers is None else managers)
+        if not managers:
+            return np.zeros((0, len(self.topology)))
+
+        available = np.fromiter((mgr._update_available_power() for mgr in managers),
+                                dtype=np.float64, count=len(managers))
+        requests = np.vstack([np.frombuffer(mgr.requests, dtype=np.float64) for mgr in managers])
+        result = self.allocate(available, requests)
+
+        for mgr, row in zip(managers, result):
+            mgr.load_allocations(row.tolist())
+        return result
+
+# Global power solver instance
+_POWER_SOLVER: Optional[FleetPowerSolver] = None
+
+def get_power_solver() -> FleetPowerSolver:
+    """Get or create the global fleet power solver."""
+    global _POWER_SOLVER
+    if _POWER_SOLVER is None:
+        _POWER_SOLVER = FleetPowerSolver()
+    return _POWER_SOLVER
@@ -1,8 +1,9 @@
 """
 Sensor management system for space objects.
 """
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+from collections import deque
+from dataclasses import dataclass, field
 try:
     from world.constants import (
         DetectionLevel, 
@@ -21,26 +22,145 @@ except ImportError:
         SECTOR_SIZE_SU,
         SENSOR_RANGES
     )
+from world.space.spatial_index import get_spatial_index
+from world.space.sectors.activity import get_sector_activity
+from world.space.database.position_buffer import flush_positions
+from world.database.queries import get_db_connection
+from world.metrics import get_logger, get_metrics
+from psycopg2.extras import execute_values
 from math import sqrt
+import numpy as np
+import weakref
 import json
 
+logger = get_logger("sensors")
+
+# (object_id, position_su, distance_su)
+RangeHit = Tuple[int, Tuple[float, float, float], float]
+
+# Seconds between rescans of a contact, by detection level
+SCAN_INTERVALS: Dict[DetectionLevel, float] = {
+    DetectionLevel.FULL: 1.0,
+    DetectionLevel.PARTIAL: 2.0,
+    DetectionLevel.BASIC: 4.0,
+    DetectionLevel.FAINT: 8.0,
+    DetectionLevel.NONE: 8.0
+}
+MIN_SCAN_INTERVAL: float = 0.25
+# Fraction of the range a closing contact may cover between scans
+CLOSING_FRACTION: float = 0.1
+
 @dataclass
 class Contact:
-    """Represents a sensor contact."""
+    """
+    Represents a sensor contact.
+
+    Position and velocity are tracked with an alpha-beta filter so the
+    contact can be dead-reckoned between scans with ``predict``.
+    """
     object_id: int
-    position: Tuple[float, float, float]  # Position in SU
-    velocity: float
+    position: Tuple[float, float, float]  # Filtered position in SU at last_update
+    velocity: float  # Speed in SU per second
     detection_level: DetectionLevel
     last_update: float
     is_active: bool = False
+    velocity_vector: Tuple[float, float, float] = (0.0, 0.0, 0.0)  # SU per second
+    scan_interval: float = 1.0
+    history: Deque[Tuple[float, Tuple[float, float, float]]] = field(
+        default_factory=lambda: deque(maxlen=8)
+    )
+
+    # Filter gains: position and velocity correction per observation
+    ALPHA = 0.85
+    BETA = 0.5
+
+    def observe(self, position: Tuple[float, float, float], timestamp: float) -> None:
+        """Fold a new position measurement into the track."""
+        self.history.append((timestamp, position))
+        dt = timestamp - self.last_update
+        if dt <= 0:
+            self.position = position
+            self.last_update = timestamp
+            return
+
+        predicted = self.predict(timestamp)
+        residual = [position[i] - predicted[i] for i in range(3)]
+        self.position = tuple(predicted[i] + self.ALPHA * residual[i] for i in range(3))
+        self.velocity_vector = tuple(
+            self.velocity_vector[i] + self.BETA * residual[i] / dt for i in range(3)
+        )
+        self.velocity = sqrt(sum(v * v for v in self.velocity_vector))
+        self.last_update = timestamp
+
+    def predict(self, timestamp: float) -> Tuple[float, float, float]:
+        """Extrapolate the contact's position to a time."""
+        dt = timestamp - self.last_update
+        return tuple(self.position[i] + self.velocity_vector[i] * dt for i in range(3))
+
+    def plan_rescan(self, origin: Tuple[float, float, float]) -> float:
+        """
+        Choose how long to wait before rescanning this contact.
+
+        Starts from the detection level's interval and shortens it when the
+        contact is closing fast relative to its range.
+        """
+        interval = SCAN_INTERVALS.get(self.detection_level, SCAN_INTERVALS[DetectionLevel.NONE])
+        offset = [self.position[i] - origin[i] for i in range(3)]
+        distance = sqrt(sum(d * d for d in offset))
+        if distance > 0:
+            closing = -sum(self.velocity_vector[i] * offset[i] for i in range(3)) / distance
+            if closing > 0:
+                interval = min(interval, CLOSING_FRACTION * distance / closing)
+        self.scan_interval = max(MIN_SCAN_INTERVAL, interval)
+        return self.scan_interval
+
+@dataclass
+class ContactDelta:
+    """Changes to a manager's contacts produced by one scan."""
+    gained: List[Contact] = field(default_factory=list)
+    lost: List[Contact] = field(default_factory=list)
+    # (contact, previous detection level)
+    changed: List[Tuple[Contact, DetectionLevel]] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.gained or self.lost or self.changed)
+
+# Called with (manager, delta) whenever a scan changes the contact list
+ContactListener = Callable[["SensorManager", ContactDelta], None]
 
 class SensorManager:
     """Handles sensor operations and contact tracking."""
 
+    # Passive sweep ranges in parsecs for each sensor array
+    SRS_RANGE_PC: float = 100.0
+    LRS_RANGE_PC: float = 500.0
+
+    # Seconds a contact outside the scanned volume is kept before it is dropped
+    CONTACT_TTL: float = 10.0
+    # Seconds between sweeps for a ship with no contacts
+    DISCOVERY_INTERVAL: float = 2.0
+
+    # Every live manager, so the sensor tick can sweep the whole fleet at once
+    _registry: "weakref.WeakSet[SensorManager]" = weakref.WeakSet()
+
     def __init__(self, space_object):
         self.obj = space_object
         self.contacts: Dict[int, Contact] = {}
+        self.last_delta = ContactDelta()
+        self.next_scan = 0.0  # When the next fleet sweep should rescan this ship
+        self._listeners: List[ContactListener] = []
         self._scan_counter = 0
+        SensorManager._registry.add(self)
+
+    def add_listener(self, listener: ContactListener) -> None:
+        """Register a callback for contact changes."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: ContactListener) -> None:
+        """Unregister a contact change callback."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
 
     def scan_range(self, max_range_pc: float, active_mode: bool = False) -> List[Contact]:
         """
@@ -51,18 +171,268 @@ class SensorManager:
             active_mode: Whether to use active scanning
         """
         if not self._check_sensors_active():
-            print("Sensors not active")
+            logger.debug("Sensors not active on %s", self.obj.key)
             return []
 
         # Convert range to SU for calculations
         max_range_su = max_range_pc * PARSEC_TO_SU
         su_coords = self.obj.db.coords.su
 
-        print(f"Scanning from {self.obj.key} at coordinates (SU): {su_coords}")
-        print(f"Max range: {max_range_su:.2f} SU")
-        print(f"Active mode: {active_mode}")
+        logger.debug("Scanning from %s at %s SU, range %.2f SU, active %s",
+                     self.obj.key, su_coords, max_range_su, active_mode)
+
+        with get_metrics().timer("sensors.scan_time"):
+            found = self._find_in_range(su_coords, max_range_su)
+            origin = (su_coords["x"], su_coords["y"], su_coords["z"])
+            results = self._record_contacts(found, active_mode, origin, max_range_su)
+
+        logger.debug("Scan complete. Found %d contacts", len(results))
+        return results
+
+    def _record_contacts(self, found: Iterable[RangeHit], active_mode: bool,
+                         origin: Tuple[float, float, float], range_su: float) -> List[Contact]:
+        """
+        Merge range hits into the contact list and notify listeners of changes.
+
+        Existing contacts are updated in place. A known contact missing from
+        the scan is lost straight away if its last position lies inside the
+        scanned volume; otherwise it is kept until CONTACT_TTL has passed.
+
+        Args:
+            found: Range hits from this scan
+            active_mode: Whether the scan was active
+            origin: Scan origin in SU
+            range_su: Scanned radius in SU
+
+        Returns:
+            Contacts seen by this scan
+        """
+        now = self.obj.get_current_time()
+        delta = ContactDelta()
+        results = []
+        seen = set()
+
+        for obj_id, pos, distance_su in found:
+            detection = self._calculate_detection_level(pos, distance_su)
+            contact = self.contacts.get(obj_id)
+            if contact is None:
+                contact = Contact(
+                    object_id=obj_id,
+                    position=pos,  # Store in SU
+                    velocity=0.0,
+                    detection_level=detection,
+                    last_update=now,
+                    is_active=active_mode
+                )
+                contact.history.append((now, pos))
+                self.contacts[obj_id] = contact
+                delta.gained.append(contact)
+            else:
+                if contact.detection_level != detection:
+                    delta.changed.append((contact, contact.detection_level))
+                    contact.detection_level = detection
+                contact.observe(pos, now)
+                contact.is_active = active_mode
+            contact.plan_rescan(origin)
+            seen.add(obj_id)
+            results.append(contact)
+
+        ox, oy, oz = origin
+        range_sq = range_su * range_su
+        for obj_id, contact in list(self.contacts.items()):
+            if obj_id in seen:
+                continue
+            x, y, z = contact.predict(now)
+            in_volume = (x - ox) ** 2 + (y - oy) ** 2 + (z - oz) ** 2 <= range_sq
+            if in_volume or now - contact.last_update > self.CONTACT_TTL:
+                del self.contacts[obj_id]
+                delta.lost.append(contact)
+
+        self.next_scan = now + min(
+            (c.scan_interval for c in self.contacts.values()),
+            default=self.DISCOVERY_INTERVAL
+        )
+        self._notify(delta)
+        return results
+
+    def predicted_contacts(self, timestamp: Optional[float] = None) -> Dict[int, Tuple[float, float, float]]:
+        """Get every contact's dead-reckoned position, for displays between scans."""
+        if timestamp is None:
+            timestamp = self.obj.get_current_time()
+        return {obj_id: contact.predict(timestamp) for obj_id, contact in self.contacts.items()}
+
+    def expire_contacts(self) -> List[Contact]:
+        """Drop contacts that have not been seen within CONTACT_TTL."""
+        now = self.obj.get_current_time()
+        expired = [c for c in self.contacts.values() if now - c.last_update > self.CONTACT_TTL]
+        if expired:
+            for contact in expired:
+                del self.contacts[contact.object_id]
+            self._notify(ContactDelta(lost=expired))
+        return expired
+
+    def _notify(self, delta: ContactDelta) -> None:
+        """Record a delta and pass it to listeners if anything changed."""
+        self.last_delta = delta
+        if not delta:
+            return
+        for listener in list(self._listeners):
+            try:
+                listener(self, delta)
+            except Exception:
+                logger.exception("Contact listener error")
+
+    def sweep_range_su(self) -> float:
+        """Get the passive sweep range of the active, working sensor arrays in SU."""
+        sensor = self.obj.db.sensor
+        range_pc = 0.0
+        if sensor.get("lrs_active") and sensor.get("lrs_damage", 0.0) < 1.0:
+            range_pc = max(range_pc, self.LRS_RANGE_PC)
+        if sensor.get("srs_active") and sensor.get("srs_damage", 0.0) < 1.0:
+            range_pc = max(range_pc, self.SRS_RANGE_PC)
+        return range_pc * PARSEC_TO_SU
+
+    @classmethod
+    def sweep(cls, managers: Optional[Iterable["SensorManager"]] = None,
+              force: bool = False) -> Dict[int, List[Contact]]:
+        """
+        Passive sensor sweep for every ship with active sensors.
+
+        All scanners are resolved together: from the spatial index with one
+        candidate query per occupied grid cell, or otherwise from a single
+        PostGIS self-join. Results are written into each manager's contacts.
+        Ships are only rescanned once their ``next_scan`` time is due; in
+        between, their contacts are dead-reckoned.
+
+        Args:
+            managers: Managers to sweep; defaults to every live manager
+            force: Rescan every ship regardless of its schedule
+
+        Returns:
+            Contacts found, keyed by scanning object ID
+        """
+        scanners = []
+        for mgr in list(cls._registry if managers is None else managers):
+            if not force and mgr.obj.get_current_time() < mgr.next_scan:
+                continue
+            range_su = mgr.sweep_range_su()
+            if range_su > 0:
+                coords = mgr.obj.db.coords.su
+                scanners.append((mgr, (coords["x"], coords["y"], coords["z"]), range_su))
+            elif mgr.contacts:
+                # Blind ships lose contacts as they age out
+                mgr.expire_contacts()
+
+        if not scanners:
+            return {}
+
+        if get_spatial_index().loaded:
+            hits = cls._sweep_index(scanners)
+        else:
+            hits = cls._sweep_database(scanners)
+
+        return {
+            mgr.obj.id: mgr._record_contacts(hits.get(mgr.obj.id, []), False, origin, range_su)
+            for mgr, origin, range_su in scanners
+        }
+
+    @classmethod
+    async def update_sensor_contacts(cls) -> None:
+        """Sensor tick: sweep every ship in an active sector."""
+        cls.sweep(get_sector_activity().select(list(cls._registry)))
+
+    @staticmethod
+    def _sweep_index(scanners: List[Tuple["SensorManager", Tuple[float, float, float], float]]
+                     ) -> Dict[int, List[RangeHit]]:
+        """Resolve a sweep from the spatial index, batching scanners by grid cell."""
+        index = get_spatial_index()
+        by_cell: Dict[Tuple[int, int, int], list] = {}
+        for scanner in scanners:
+            by_cell.setdefault(index.cell_for(*scanner[1]), []).append(scanner)
+
+        hits: Dict[int, List[RangeHit]] = {}
+        for group in by_cell.values():
+            origins = np.array([pos for _, pos, _ in group], dtype=np.float64)
+            ranges = np.array([range_su for _, _, range_su in group], dtype=np.float64)
+
+            # One candidate query covering every scanner in the cell
+            lo, hi = origins.min(axis=0), origins.max(axis=0)
+            center = tuple(float(v) for v in (lo + hi) / 2)
+            reach = float(ranges.max() + np.linalg.norm(hi - lo) / 2)
+            candidates = [entry for _, entry in index.query_radius(center, reach)]
+            if not candidates:
+                continue
+
+            ids = np.array([entry.object_id for entry in candidates])
+            positions = np.array([entry.position for entry in candidates], dtype=np.float64)
+            delta = positions[None, :, :] - origins[:, None, :]
+            distances = np.sqrt(np.einsum('ijk,ijk->ij', delta, delta))
+            visible = distances <= ranges[:, None]
+
+            for row, (mgr, _, _) in enumerate(group):
+                own_id = mgr.obj.id
+                hits[own_id] = [
+                    (candidates[col].object_id, candidates[col].position, float(distances[row, col]))
+                    for col in np.nonzero(visible[row] & (ids != own_id))[0]
+                ]
+        return hits
+
+    @staticmethod
+    def _sweep_database(scanners: List[Tuple["SensorManager", Tuple[float, float, float], float]]
+                        ) -> Dict[int, List[RangeHit]]:
+        """Resolve a sweep with one PostGIS self-join over every scanner."""
+        flush_positions()
+        rows = [(mgr.obj.id, *pos, range_su) for mgr, pos, range_su in scanners]
+        hits: Dict[int, List[RangeHit]] = {}
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                results = execute_values(cur, """
+                    SELECT
+                        s.id,
+                        o.id,
+                        ST_X(o.position),
+                        ST_Y(o.position),
+                        ST_Z(o.position),
+                        ST_3DDistance(o.position, s.origin)
+                    FROM (
+                        SELECT id, range_su,
+                            ST_SetSRID(ST_MakePoint(x, y, z), 3857) AS origin
+                        FROM (VALUES %s) AS v(id, x, y, z, range_su)
+                    ) AS s
+                    JOIN space_objects o
+                        ON o.id != s.id
+                        AND o.power_systems IS NOT NULL
+                        AND ST_3DDWithin(o.position, s.origin, s.range_su)
+                """, rows,
+                    template="(%s, %s::float8, %s::float8, %s::float8, %s::float8)",
+                    page_size=len(rows), fetch=True)
+
+        for scanner_id, obj_id, x, y, z, distance_su in results:
+            hits.setdefault(scanner_id, []).append(
+                (obj_id, (float(x), float(y), float(z or 0.0)), float(distance_su))
+            )
+        return hits
+
+    def _find_in_range(self, su_coords: Dict[str, float], max_range_su: float) -> List[RangeHit]:
+        """
+        Find other objects within range of the given SU position.
+
+        Uses the in-memory spatial index once it mirrors the database,
+        falling back to a PostGIS query otherwise.
+
+        Returns:
+            (object_id, position_su, distance_su) tuples
+        """
+        index = get_spatial_index()
+        center = (su_coords["x"], su_coords["y"], su_coords["z"])
+        if index.loaded:
+            return [
+                (entry.object_id, entry.position, distance)
+                for distance, entry in index.query_radius(center, max_range_su, exclude=self.obj.id)
+            ]
 
-        # Query objects within range using PostGIS
+        # Query objects within range using PostGIS, after persisting staged moves
+        flush_positions()
         with self.obj.db.get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute("""
@@ -96,7 +466,7 @@ class SensorManager:
                     max_range_su
                 ))
 
-                results = []
+                found = []
                 for row in cur.fetchall():
                     obj_id = row[0]
                     obj_key = row[1]
@@ -108,24 +478,13 @@ class SensorManager:
                     main_power = power_systems.get('main', {})
                     power_output = float(main_power.get('out', 100.0))
 
-                    print(f"Found {obj_key} (ID: {obj_id}) at distance {distance_su:.1f} SU with power {power_output:.1f}GW")
+                    logger.debug("Found %s (ID: %s) at distance %.1f SU with power %.1fGW",
+                                 obj_key, obj_id, distance_su, power_output)
 
-                    # If within range, create contact
+                    # If within range, keep it
                     if distance_su <= max_range_su:
-                        detection = self._calculate_detection_level(pos, distance_su)
-                        contact = Contact(
-                            object_id=obj_id,
-                            position=pos,  # Store in SU
-                            velocity=0.0,
-                            detection_level=detection,
-                            last_update=self.obj.get_current_time(),
-                            is_active=active_mode
-                        )
-                        self.contacts[obj_id] = contact
-                        results.append(contact)
-
-                print(f"Scan complete. Found {len(results)} contacts")
-                return results
+                        found.append((obj_id, pos, distance_su))
+                return found
 
     def _check_sensors_active(self) -> bool:
         """Check if sensors are active and operational."""
@@ -0,0 +1,50 @@
+"""
+Weapon targeting driven by sensor contact deltas.
+
+Targeting does not re-poll the contact list. It listens to each ship's
+``SensorManager`` and reacts only to what a scan changed: when a contact is
+lost, every beam bank and missile tube locked on it is released, so stale
+locks never reach the combat engine.
+
+``attach_targeting`` is called for every space object's sensor manager.
+Commands check locks against ``has_contact``.
+"""
+from typing import Any, List
+from managers.sensor_manager import ContactDelta, SensorManager
+from world.metrics import get_logger, get_metrics
+
+logger = get_logger("targeting")
+
+WEAPON_LISTS = ("blist", "mlist")  # Beam banks, missile tubes
+
+def has_contact(ship: Any, contact_id: int) -> bool:
+    """Check whether a ship's sensors currently hold a contact."""
+    sensor_mgr = getattr(ship, "sensor_mgr", None)
+    return sensor_mgr is not None and contact_id in sensor_mgr.contacts
+
+def release_lost_locks(manager: SensorManager, delta: ContactDelta) -> List[int]:
+    """
+    Contact listener releasing weapon locks on contacts a scan lost.
+
+    Returns:
+        IDs of the contacts whose locks were released
+    """
+    if not delta.lost:
+        return []
+    lost = {contact.object_id for contact in delta.lost}
+    released = set()
+    db = manager.obj.db
+    for attr in WEAPON_LISTS:
+        for weapon in getattr(db, attr, None) or []:
+            if weapon.get("lock") in lost:
+                released.add(weapon["lock"])
+                weapon["lock"] = None
+
+    if released:
+        get_metrics().inc("targeting.locks_released", len(released))
+        logger.debug("%s lost lock on %s", getattr(manager.obj, "key", manager.obj), sorted(released))
+    return sorted(released)
+
+def attach_targeting(manager: SensorManager) -> None:
+    """Subscribe targeting to a sensor manager's contact deltas."""
+    manager.add_listener(release_lost_locks)
@@ -2,7 +2,9 @@
 Weapon management system for space objects.
 """
 from typing import Optional, Dict, List
-import time
+from managers.capacitor_engine import get_capacitor_engine, capacitor_kind
+from world.clock import now
+from world import utils
 
 class MessageMixin:
     """Mixin class for handling weapon messages."""
@@ -14,20 +16,23 @@ class MessageMixin:
 class Weapon:
     """Represents a ship weapon system like beams or missiles."""
     def __init__(self, name: str, damage: float, bonus: float, 
-                 cost: float, arc: float, cooldown: float):
+                 cost: float, arc: float, cooldown: float,
+                 optimal_range: float = 100.0, tracking: float = 90.0):
         self.name = name
         self.damage = damage  
         self.bonus = bonus
         self.cost = cost
         self.arc = arc
         self.cooldown = cooldown
+        self.optimal_range = optimal_range  # SU before damage falls off
+        self.tracking = tracking  # Degrees per tick the weapon can follow
         self.ready = True
-        self._last_fired = 0
+        self._last_fired = float("-inf")
+        self._recharge_timer = None  # Pending cooldown callback
 
     def can_fire(self, capacitor: float) -> bool:
         """Check if weapon can fire based on capacitor charge and cooldown."""
-        current_time = time.time()
-        if current_time - self._last_fired < self.cooldown:
+        if now() - self._last_fired < self.cooldown:
             return False
         return capacitor >= self.cost
 
@@ -41,36 +46,47 @@ class Weapon:
             return False
 
         # Update capacitor
-        if "beam" in self.name.lower():
-            ship.ndb.beam_capacitor -= self.cost
-        else:
-            ship.ndb.missile_capacitor -= self.cost
-
-        # Start cooldown
-        self.ready = False
-        self._last_fired = time.time()
-        # Assuming utils.delay exists and takes a function and arguments
-        utils.delay(self.cooldown, self._recharge, ship) #Added utils.delay call
+        get_capacitor_engine().set_charge(ship, capacitor_kind(self.name), capacitor - self.cost)
 
+        self.start_cooldown(ship)
         ship.msg(f"{self.name} fired!")
         return True
 
+    def start_cooldown(self, ship):
+        """Mark the weapon as fired and schedule it to become ready again."""
+        self.ready = False
+        self._last_fired = now()
+        if self._recharge_timer is not None:
+            self._recharge_timer.cancel()
+        self._recharge_timer = utils.delay(self.cooldown, self._recharge, ship)
+
     def _recharge(self, ship):
         """Re-enable weapon after cooldown."""
+        self._recharge_timer = None
         self.ready = True
         ship.msg(f"{self.name} is ready to fire again!")
 
+# Weapon stats for each mounted bank, by weapon type
+BANK_WEAPONS: Dict[str, Dict[str, float]] = {
+    "beam": {"damage": 50.0, "bonus": 1.0, "cost": 25.0, "arc": 60.0, "cooldown": 3.0,
+             "optimal_range": 100.0, "tracking": 90.0},
+    "missile": {"damage": 75.0, "bonus": 1.0, "cost": 15.0, "arc": 180.0, "cooldown": 5.0,
+                "optimal_range": 300.0, "tracking": 45.0},
+}
+
 class WeaponManager:
     """Handles weapon systems for space objects."""
 
     def __init__(self, space_object):
         self.obj = space_object
         self.weapons = []  # Initialize weapons list
+        self.banks: Dict[tuple, Weapon] = {}  # (type, bank) -> mounted weapon
         # Set default capacitor max
         self.obj.ndb.beam_cap_max = 100.0  # Match test expectations
         self.obj.ndb.missile_cap_max = 100.0
         self._init_capacitors()
-        
+        self._start_power_loop()
+
     def add_weapon(self, weapon):
         """Add weapon to manager."""
         self.weapons.append(weapon)
@@ -85,39 +101,22 @@ class WeaponManager:
 
 
     def _start_power_loop(self):
-        """Start capacitor charging loop."""
-        if not hasattr(self.obj.ndb, 'power_event'):
-            #Assuming utils.delay exists
-            self.obj.ndb.power_event = utils.delay(1, self._update_capacitors)
-
-    def _update_capacitors(self):
-        """Update capacitor charges based on power allocation."""
-        dt = 1.0  # 1 second update cycle
-
-        # Get power allocations from power manager
-        power_mgr = self.obj.db.power_manager
-        beam_power = power_mgr.get_system_power("beam") if power_mgr else 0.0
-        missile_power = power_mgr.get_system_power("missile") if power_mgr else 0.0
-
-        # Update beam capacitor
-        if self.obj.ndb.beam_capacitor < self.obj.ndb.beam_cap_max:
-            charge_rate = beam_power * self.obj.db.beam.get("charge_rate", 0.1) * dt
-            self.obj.ndb.beam_capacitor = min(
-                self.obj.ndb.beam_capacitor + charge_rate,
-                self.obj.ndb.beam_cap_max
-            )
-
-        # Update missile capacitor
-        if self.obj.ndb.missile_capacitor < self.obj.ndb.missile_cap_max:
-            charge_rate = missile_power * dt
-            self.obj.ndb.missile_capacitor = min(
-                self.obj.ndb.missile_capacitor + charge_rate,
-                self.obj.ndb.missile_cap_max
-            )
-
-        # Schedule next update
-        #Assuming utils.delay exists
-        self.obj.ndb.power_event = utils.delay(1, self._update_capacitors)
+        """Start charging capacitors from the central capacitor engine."""
+        get_capacitor_engine().register(self)
+
+    def _stop_power_loop(self):
+        """Stop charging capacitors."""
+        get_capacitor_engine().unregister(self.obj)
+
+    def get_bank_weapon(self, weapon_type: str, bank: int) -> Weapon:
+        """Get the weapon mounted in a beam bank or missile tube, creating it on first use."""
+        key = (weapon_type, bank)
+        weapon = self.banks.get(key)
+        if weapon is None:
+            label = "Beam Bank" if weapon_type == "beam" else "Missile Tube"
+            weapon = Weapon(f"{label} {bank}", **BANK_WEAPONS[weapon_type])
+            self.banks[key] = weapon
+        return weapon
 
     def add_weapon(self, weapon):
         """Add a weapon to the manager."""
@@ -136,5 +135,3 @@ class WeaponManager:
     def get_weapons(self):
         """Get list of managed weapons."""
         return self.weapons.copy()
-
-import utils # Added import statement
\ No newline at end of file
@@ -1,7 +1,7 @@
 """
 Server startstop hooks
 """
-from managers.main import initialize_systems
+from managers.main import start_engine, stop_engine
 from evennia import logger
 
 def at_server_init():
@@ -18,7 +18,8 @@ def at_server_start():
     # Initialize our space engine systems after Evennia is fully started
     logger.log_info("Initializing Space Engine systems...")
     try:
-        initialize_systems()
+        # Runs on the reactor's asyncio loop; returns without blocking
+        start_engine()
         logger.log_info("Space Engine initialization complete")
     except Exception as e:
         logger.log_err(f"Error initializing Space Engine: {str(e)}")
@@ -29,7 +30,10 @@ def at_server_stop():
     This is called just before the server is shut down, regardless
     of it is for a reload, reset or shutdown.
     """
-    pass
+    try:
+        stop_engine()
+    except Exception as e:
+        logger.log_err(f"Error stopping Space Engine: {str(e)}")
 
 def at_server_reload_start():
     """
@@ -1,19 +1,22 @@
 """
 Server plugin services for Space Engine integration.
 
-This module initializes the Space Engine systems and integrates them 
-with Evennia's server architecture using the priority event system.
+The engine itself is started from ``at_server_start`` on the reactor's
+asyncio loop. This plugin only clears tickers left over from earlier
+versions of the engine, which ran each system from its own ticker.
 """
 from evennia import TICKER_HANDLER, logger
-from managers.main import event_manager
-from managers.events.priority_manager import SystemPriority
 import traceback
-import asyncio
+
+def remove_engine_tickers():
+    """Remove persistent tickers registered by earlier versions of the engine."""
+    for idstring in TICKER_HANDLER.all_display():
+        if str(idstring).startswith("space_engine_"):
+            TICKER_HANDLER.remove(idstring)
 
 def start_plugin_services(server):
     """
-    Initialize Space Engine systems and start event processing.
-    Uses Evennia's TICKER_HANDLER for event scheduling.
+    Clear stale Space Engine tickers before the engine starts.
 
     Args:
         server: The main Evennia server application
@@ -21,57 +24,8 @@ def start_plugin_services(server):
         bool: True if initialization successful
     """
     try:
-        logger.log_info("Initializing Space Engine priority event system...")
-
-        # Define system update intervals (in seconds)
-        INTERVALS = {
-            "movement": 0.1,  # 10 updates/sec
-            "combat": 0.2,    # 5 updates/sec
-            "power": 1.0,     # 1 update/sec
-            "shields": 0.5,   # 2 updates/sec
-            "sensors": 1.0    # 1 update/sec
-        }
-
-        # Schedule recurring system events with appropriate priorities
-        async def schedule_system_update(system_name):
-            """Process events for a specific system"""
-            try:
-                await event_manager.process_events(
-                    system=system_name,
-                    max_process=event_manager.BATCH_SIZES.get(system_name, 1)
-                )
-            except Exception as e:
-                logger.log_err(f"Error processing {system_name} events: {str(e)}\n{traceback.format_exc()}")
-
-        def run_system_update(system_name):
-            """Wrapper to run async function in Evennia's event loop"""
-            asyncio.create_task(schedule_system_update(system_name))
-
-        # Register system updates with Evennia's ticker
-        for system_name, interval in INTERVALS.items():
-            TICKER_HANDLER.add(
-                interval,
-                run_system_update,
-                args=(system_name,),
-                persistent=True,
-                idstring=f"space_engine_{system_name}"
-            )
-
-        # Add general event processing for other events
-        async def process_general_events():
-            await event_manager.process_events(max_process=10)
-
-        def run_general_events():
-            asyncio.create_task(process_general_events())
-
-        TICKER_HANDLER.add(
-            0.1,  # 10 times per second
-            run_general_events,
-            persistent=True,
-            idstring="space_engine_general"
-        )
-
-        logger.log_info("Space Engine systems initialized with priority event architecture")
+        remove_engine_tickers()
+        logger.log_info("Space Engine tickers cleared; engine starts with the server")
         return True
 
     except Exception as e:
@@ -81,7 +35,7 @@ def start_plugin_services(server):
 def stop_plugin_services(server):
     """
     Called by Evennia when the server is shutting down.
-    Clean up any running tasks.
+    The engine is stopped by ``at_server_stop``.
 
     Args:
         server: The main Evennia server application
@@ -89,12 +43,8 @@ def stop_plugin_services(server):
         bool: True if cleanup successful
     """
     try:
-        logger.log_info("Shutting down Space Engine systems...")
-        # Remove all our registered tickers
-        for idstring in TICKER_HANDLER.all_display():
-            if idstring.startswith("space_engine_"):
-                TICKER_HANDLER.remove(idstring)
+        remove_engine_tickers()
         return True
     except Exception as e:
         logger.log_err(f"Error shutting down Space Engine: {str(e)}\n{traceback.format_exc()}")
-        return False
\ No newline at end of file
+        return False
@@ -0,0 +1,45 @@
+"""
+Tests for the in-process hit-chance engine.
+"""
+from world.space.ballistics import calculate_hit_chance, calculate_hit_chances
+import numpy as np
+import random
+
+def test_close_range_bonus():
+    """Targets inside close range get the flat close-range chance."""
+    assert calculate_hit_chance((0, 0, 0), (10, 0, 0), 90.0) == 0.95
+
+def test_moving_target_is_harder_to_hit():
+    """A moving target at range is harder to hit than a close stationary one."""
+    close = calculate_hit_chance((0, 0, 0), (10, 0, 0), 90.0)
+    moving = calculate_hit_chance((0, 0, 0), (50, 50, 50), 90.0, (10, 10, 0))
+    assert moving < close
+
+def test_target_outruns_tracking():
+    """Targets crossing faster than the weapon can track cannot be hit."""
+    chance = calculate_hit_chance((0, 0, 0), (100, 0, 0), 5.0, (0, 50, 0))
+    assert chance == 0.0
+
+def test_batch_matches_scalar():
+    """The vectorized engine agrees with the scalar one pair by pair."""
+    rng = random.Random(42)
+    shooters, targets, velocities, tracking = [], [], [], []
+    for _ in range(500):
+        shooters.append(tuple(rng.uniform(-500, 500) for _ in range(3)))
+        targets.append(tuple(rng.uniform(-500, 500) for _ in range(3)))
+        velocities.append(tuple(rng.uniform(-40, 40) for _ in range(3)))
+        tracking.append(rng.uniform(0.0, 90.0))
+
+    batch = calculate_hit_chances(shooters, targets, velocities, tracking)
+    expected = [
+        calculate_hit_chance(s, t, w, v)
+        for s, t, v, w in zip(shooters, targets, velocities, tracking)
+    ]
+    assert batch.shape == (500,)
+    assert np.allclose(batch, expected)
+
+def test_batch_defaults():
+    """Velocities default to stationary and tracking may be a single value."""
+    chances = calculate_hit_chances([(0, 0, 0), (0, 0, 0)], [(5, 0, 0), (300, 0, 0)])
+    assert chances[0] == 0.95
+    assert 0.0 < chances[1] < 0.95
@@ -0,0 +1,38 @@
+"""
+Tests for the benchmark galaxy generator and harness.
+"""
+from benchmarks.galaxy import generate_galaxy
+from benchmarks.run import run_suite, compare
+from typeclass.organizations.federation import FederationRegistry
+from unittest import TestCase
+
+class TestGalaxy(TestCase):
+    def test_seeded_and_sized(self):
+        """The same seed gives the same galaxy, of exactly the requested size."""
+        first, second = generate_galaxy(300, seed=7), generate_galaxy(300, seed=7)
+        self.assertEqual(len(first), 300)
+        self.assertEqual([o.position_pc for o in first.objects], [o.position_pc for o in second.objects])
+        self.assertNotEqual([o.position_pc for o in generate_galaxy(300, seed=8).objects],
+                            [o.position_pc for o in first.objects])
+
+        types = {o.object_type for o in first.objects}
+        self.assertEqual(types, {"planet", "station", "ship"})
+        for ship in first.ships:
+            self.assertIn(ship.ship_class, FederationRegistry.SHIP_CLASSES)
+            self.assertEqual(ship.db.main["gw"],
+                             FederationRegistry.SHIP_CLASSES[ship.ship_class]["power_systems"]["main_gw"])
+
+class TestHarness(TestCase):
+    def test_suite_output_and_regressions(self):
+        """Results are machine-readable and slower runs are flagged against a baseline."""
+        results = run_suite(sizes=[60], repeat=1, use_db=False, report=lambda line: None)
+        self.assertEqual({r["benchmark"] for r in results["results"]},
+                         {"scan", "power_tick", "combat_tick"})
+        self.assertTrue(all(r["ops"] > 0 and r["error"] is None for r in results["results"]))
+        self.assertEqual(results["meta"]["sizes"], [60])
+
+        baseline = {"results": [dict(r, ops_per_sec=r["ops_per_sec"] * 2) for r in results["results"]]}
+        regressions = compare(results, baseline, tolerance=0.1)
+        self.assertEqual(len(regressions), 3)
+        self.assertAlmostEqual(regressions[0]["ratio"], 0.5)
+        self.assertEqual(compare(results, results), [])
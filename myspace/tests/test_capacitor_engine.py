@@ -0,0 +1,82 @@
+"""
+Tests for the central capacitor engine.
+"""
+from managers.capacitor_engine import CapacitorEngine, BEAM, MISSILE
+from types import SimpleNamespace
+from unittest import TestCase
+
+def make_ship(beam_power=0.0, missile_power=0.0, charge_rate=0.1):
+    """Build a minimal object with capacitor attributes."""
+    return SimpleNamespace(
+        ndb=SimpleNamespace(beam_capacitor=0.0, beam_cap_max=100.0,
+                            missile_capacitor=0.0, missile_cap_max=50.0),
+        db=SimpleNamespace(beam={"charge_rate": charge_rate}, power_manager=None),
+        power=(beam_power, missile_power)
+    )
+
+class FakeManager:
+    """Stands in for a WeaponManager (which must be weak-referenceable)."""
+    def __init__(self, obj):
+        self.obj = obj
+
+class TestCapacitorEngine(TestCase):
+    def setUp(self):
+        self.engine = CapacitorEngine(capacity=2)
+        self.managers = []
+
+    def register(self, ship):
+        manager = FakeManager(ship)
+        self.managers.append(manager)  # The engine only holds weak references
+        self.engine.register(manager)
+        self.engine.set_power(ship, *ship.power)
+        return manager
+
+    def test_charges_and_clamps(self):
+        """Capacitors charge by power and rate, clamped at their maximum."""
+        ship = make_ship(beam_power=200.0, missile_power=20.0)
+        self.register(ship)
+
+        self.engine.tick(1.0)
+        self.assertEqual(ship.ndb.beam_capacitor, 20.0)  # 200GW * 0.1
+        self.assertEqual(ship.ndb.missile_capacitor, 20.0)
+
+        for _ in range(5):
+            self.engine.tick(1.0)
+        self.assertEqual(ship.ndb.beam_capacitor, 100.0)
+        self.assertEqual(ship.ndb.missile_capacitor, 50.0)
+
+    def test_full_capacitors_not_written(self):
+        """Only ships whose charge changed are written back."""
+        charging = make_ship(beam_power=10.0)
+        idle = make_ship()
+        self.register(charging)
+        self.register(idle)
+        self.register(make_ship(beam_power=10.0))  # Grows past the initial capacity
+
+        self.assertEqual(self.engine.tick(1.0), 2)
+        self.assertEqual(idle.ndb.beam_capacitor, 0.0)
+
+    def test_set_charge_and_unregister(self):
+        """Draws are mirrored to ndb, and unregistered ships stop charging."""
+        ship = make_ship(beam_power=100.0)
+        self.register(ship)
+        self.engine.set_charge(ship, BEAM, 95.0)
+        self.assertEqual(ship.ndb.beam_capacitor, 95.0)
+
+        self.engine.tick(1.0)
+        self.assertEqual(ship.ndb.beam_capacitor, 100.0)
+
+        self.engine.set_charge(ship, BEAM, 0.0)
+        self.engine.unregister(ship)
+        self.engine.tick(1.0)
+        self.assertEqual(ship.ndb.beam_capacitor, 0.0)
+        self.assertEqual(len(self.engine), 0)
+
+    def test_collected_managers_are_released(self):
+        """A garbage-collected manager frees its row."""
+        self.register(make_ship(missile_power=1.0))
+        self.assertEqual(len(self.engine), 1)
+        self.managers.clear()
+        self.assertEqual(len(self.engine), 0)
+        self.assertEqual(self.engine.tick(1.0), 0)
+        self.assertEqual(self.engine.charge[:, MISSILE].sum(), 0.0)
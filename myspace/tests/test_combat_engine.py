@@ -0,0 +1,165 @@
+"""
+Tests for batched combat resolution.
+"""
+from managers.combat_engine import CombatEngine, damage_falloff, shield_dissipation, select_facings
+from managers.power_manager import SHIELD_FACINGS
+from managers.weapon_manager import Weapon
+from world.space.spatial_index import get_spatial_index, register_object
+from world import utils
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+import numpy as np
+
+class AlwaysHit:
+    """Random source whose rolls always hit."""
+    def random(self, n):
+        return np.zeros(n)
+
+def make_ship(obj_id, x, y=0.0, z=0.0, beam=100.0, missile=100.0, shields=0.0):
+    """Build a minimal indexed ship."""
+    ship = SimpleNamespace(
+        id=obj_id,
+        db=SimpleNamespace(coords={"x": x, "y": y, "z": z},
+                           alloc={"shield": [shields] * len(SHIELD_FACINGS)},
+                           structure={"superstructure": 1000.0, "max_structure": 1000.0}),
+        ndb=SimpleNamespace(beam_capacitor=beam, missile_capacitor=missile),
+        messages=[]
+    )
+    ship.msg = ship.messages.append
+    get_spatial_index().update(obj_id, (x, y, z), "ship", f"Ship-{obj_id}", ship)
+    return ship
+
+class LoadedShip(SimpleNamespace):
+    """Ship stand-in that can be registered as a live object."""
+
+def _database_rows(rows):
+    """Connection stand-in whose cursor returns rows."""
+    conn = MagicMock()
+    conn.__enter__.return_value = conn
+    cursor = conn.cursor.return_value.__enter__.return_value
+    cursor.fetchall.return_value = rows
+    return lambda: conn
+
+def beam(name="Beam Bank 0"):
+    return Weapon(name, damage=50.0, bonus=1.0, cost=25.0, arc=60.0, cooldown=3.0,
+                  optimal_range=100.0)
+
+class TestCombatMath(TestCase):
+    def test_falloff_matches_utils(self):
+        """The array falloff agrees with calculate_damage_falloff."""
+        distances = np.array([0.0, 50.0, 100.0, 150.0, 400.0])
+        result = damage_falloff(np.full(5, 50.0), distances, np.full(5, 100.0))
+        expected = [utils.calculate_damage_falloff(50.0, d, 100.0) for d in distances]
+        np.testing.assert_allclose(result, expected)
+
+    def test_dissipation_drains_shields_in_order(self):
+        """Hits on one facing share its strength, like repeated calculate_shield_dissipation."""
+        damage = np.array([40.0, 30.0, 20.0, 10.0])
+        groups = np.array([0, 1, 0, 0])
+        strength = np.array([50.0, 5.0, 50.0, 50.0])
+        absorbed, remaining = shield_dissipation(damage, strength, groups)
+
+        left = {0: 50.0, 1: 5.0}
+        for i in range(4):
+            expected_absorbed, expected_remaining = utils.calculate_shield_dissipation(
+                damage[i], left[groups[i]])
+            left[groups[i]] -= expected_absorbed
+            self.assertAlmostEqual(absorbed[i], expected_absorbed)
+            self.assertAlmostEqual(remaining[i], expected_remaining)
+
+    def test_facing_selection(self):
+        """Shots strike the facing toward the shooter, relative to the target's heading."""
+        target = np.zeros((5, 3))
+        shooters = np.array([[10, 0, 0], [-10, 0, 0], [0, 10, 0], [0, -10, 0], [1, 0, 10]], float)
+        facings = select_facings(target, shooters, np.zeros(5), np.zeros(5))
+        self.assertEqual([SHIELD_FACINGS[f] for f in facings],
+                         ["forward", "aft", "port", "starboard", "dorsal"])
+
+        turned = select_facings(target[:1], shooters[:1], np.array([180.0]), np.zeros(1))
+        self.assertEqual(SHIELD_FACINGS[turned[0]], "aft")
+
+class TestCombatEngine(TestCase):
+    def setUp(self):
+        self.engine = CombatEngine(rng=AlwaysHit())
+        self.ids = []
+
+    def tearDown(self):
+        for obj_id in self.ids:
+            get_spatial_index().remove(obj_id)
+
+    def ship(self, obj_id, *args, **kwargs):
+        self.ids.append(obj_id)
+        return make_ship(obj_id, *args, **kwargs)
+
+    def test_volley_resolved_together(self):
+        """Every queued shot is resolved and applied in one pass."""
+        target = self.ship(9001, 0.0, shields=20.0)
+        shooters = [self.ship(9002, -50.0), self.ship(9003, -60.0)]
+        for shooter in shooters:
+            shooter.db.course = SimpleNamespace(yaw_out=0.0, pitch_out=0.0)
+        fired = []
+        for shooter in shooters:
+            self.engine.queue(shooter, 9001, beam(), on_fire=lambda s=shooter: fired.append(s))
+        self.assertEqual(len(self.engine), 2)
+
+        results = self.engine.resolve()
+        self.assertEqual(len(self.engine), 0)
+        self.assertTrue(all(r.fired and r.hit for r in results))
+        self.assertEqual([r.facing for r in results], ["aft", "aft"])  # Shooters are astern of the target
+        # 20GW of aft shields absorb 40 of the first hit then nothing more
+        self.assertEqual([r.absorbed for r in results], [20.0, 0.0])
+        self.assertEqual(target.db.structure["superstructure"], 1000.0 - 80.0)
+        self.assertEqual(fired, shooters)
+        self.assertEqual([s.ndb.beam_capacitor for s in shooters], [75.0, 75.0])
+
+    def test_power_arc_and_cooldown(self):
+        """Orders that cannot fire are reported and spend nothing."""
+        self.ship(9011, 0.0)
+        shooter = self.ship(9012, -20.0, beam=30.0)
+        behind = self.ship(9013, 20.0)  # Facing +X, away from the target
+
+        weapon = beam()
+        self.engine.queue(shooter, 9011, weapon)
+        self.engine.queue(shooter, 9011, weapon)  # Same weapon twice in one tick
+        self.engine.queue(shooter, 9011, beam("Beam Bank 1"))  # Capacitor already drained
+        self.engine.queue(behind, 9011, beam())
+        self.engine.queue(shooter, 4242, beam("Beam Bank 2"))
+
+        results = self.engine.resolve()
+        self.assertEqual([r.fired for r in results], [True, False, False, False, False])
+        self.assertEqual([r.reason for r in results][1:],
+                         ["cooldown", "insufficient power", "out of arc", "no target"])
+        self.assertEqual(shooter.ndb.beam_capacitor, 5.0)
+        self.assertEqual(behind.ndb.beam_capacitor, 100.0)
+        self.assertFalse(weapon.can_fire(100.0))
+
+    def test_target_loaded_from_database(self):
+        """Targets mirrored from the database resolve to their live objects."""
+        shooter = self.ship(9021, -20.0)
+        target = LoadedShip(id=9022, msg=lambda text: target.messages.append(text), messages=[],
+                            db=SimpleNamespace(coords={"x": 0.0, "y": 0.0, "z": 0.0}, alloc={},
+                                               structure={"superstructure": 1000.0,
+                                                          "max_structure": 1000.0}))
+        self.ids.append(9022)
+        index = get_spatial_index()
+        loaded = index.loaded
+        with patch("world.space.spatial_index.get_db_connection",
+                   _database_rows([(9022, "Ship-9022", "ship", 0.0, 0.0, 0.0)])), \
+                patch("world.space.spatial_index.flush_positions"):
+            index.load_from_database()
+        index.loaded = loaded
+        self.assertIsNone(index.get(9022).obj)
+
+        # Unknown to the registry and the loader: no target
+        loader, index.object_loader = index.object_loader, None
+        self.addCleanup(setattr, index, "object_loader", loader)
+        self.engine.queue(shooter, 9022, beam())
+        self.assertEqual(self.engine.resolve()[0].reason, "no target")
+
+        register_object(target)
+        self.engine.queue(shooter, 9022, beam("Beam Bank 1"))
+        result = self.engine.resolve()[0]
+        self.assertTrue(result.fired and result.hit)
+        self.assertIs(index.get(9022).obj, target)
+        self.assertEqual(len(target.messages), 1)
@@ -0,0 +1,133 @@
+"""
+Tests for the shared database connection pool.
+"""
+from world.database.pool import ConnectionPool, get_db_connection, get_pool_stats
+from world.database import queries as world_queries
+from world.space.database import queries as space_queries
+from psycopg2.pool import PoolError
+from unittest import TestCase
+import threading
+
+class TestConnectionPool(TestCase):
+    def setUp(self):
+        """Create a small private pool for each test."""
+        self.pool = ConnectionPool(minconn=1, maxconn=2, timeout=0.5)
+
+    def tearDown(self):
+        self.pool.closeall()
+
+    def test_nested_checkout_reuses_thread_connection(self):
+        """Nested checkouts on one thread share a connection."""
+        with self.pool.connection() as outer:
+            with self.pool.connection() as inner:
+                self.assertIs(outer, inner)
+
+        stats = self.pool.get_stats()
+        self.assertEqual(stats["checkouts"], 1)
+        self.assertEqual(stats["reuses"], 1)
+
+    def test_threads_get_distinct_connections(self):
+        """Concurrent threads never share a connection."""
+        seen = []
+        barrier = threading.Barrier(2)
+
+        def worker():
+            with self.pool.connection() as conn:
+                barrier.wait()
+                seen.append(conn)
+
+        threads = [threading.Thread(target=worker) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(seen), 2)
+        self.assertIsNot(seen[0], seen[1])
+
+    def test_exhausted_pool_times_out(self):
+        """Checkouts beyond maxconn wait and then raise PoolError."""
+        errors = []
+
+        def worker():
+            try:
+                with self.pool.connection():
+                    pass
+            except PoolError as e:
+                errors.append(e)
+
+        with self.pool.connection():
+            # A second thread can still take the last free connection
+            other = threading.Thread(target=worker)
+            other.start()
+            other.join()
+            self.assertEqual(errors, [])
+
+            # Hold the last connection so the pool is exhausted
+            held = self.pool._acquire()
+            late = threading.Thread(target=worker)
+            late.start()
+            late.join()
+            self.pool._release(held)
+
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(self.pool.get_stats()["timeouts"], 1)
+
+    def test_uncommitted_work_is_rolled_back(self):
+        """Connections come back from the pool without an open transaction."""
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("CREATE TEMP TABLE pool_probe (id INT)")
+
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT to_regclass('pg_temp.pool_probe')")
+                self.assertIsNone(cur.fetchone()[0])
+
+    def test_nested_error_rolls_back_to_savepoint(self):
+        """An error in a nested block undoes only that block's work."""
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("CREATE TEMP TABLE pool_probe (id INT)")
+                cur.execute("INSERT INTO pool_probe VALUES (1)")
+
+            with self.assertRaises(ValueError):
+                with self.pool.connection() as inner:
+                    with inner.cursor() as cur:
+                        cur.execute("INSERT INTO pool_probe VALUES (2)")
+                    raise ValueError("inner failure")
+
+            with self.pool.connection() as inner:
+                with inner.cursor() as cur:
+                    cur.execute("INSERT INTO pool_probe VALUES (3)")
+
+            with conn.cursor() as cur:
+                cur.execute("SELECT id FROM pool_probe ORDER BY id")
+                self.assertEqual(cur.fetchall(), [(1,), (3,)])
+
+    def test_nested_commit_ends_outer_transaction(self):
+        """A commit inside a nested block commits the shared transaction."""
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("CREATE TEMP TABLE pool_probe (id INT) ON COMMIT PRESERVE ROWS")
+            with self.pool.connection() as inner:
+                inner.commit()
+                with inner.cursor() as cur:
+                    cur.execute("INSERT INTO pool_probe VALUES (1)")
+            conn.rollback()
+
+            with conn.cursor() as cur:
+                cur.execute("SELECT count(*) FROM pool_probe")
+                self.assertEqual(cur.fetchone()[0], 0)
+
+    def test_modules_share_global_pool(self):
+        """Both query modules check out from the same global pool."""
+        self.assertIs(world_queries.get_db_connection, get_db_connection)
+        self.assertIs(space_queries.get_db_connection, get_db_connection)
+
+        before = get_pool_stats()["checkouts"]
+        with world_queries.get_db_connection():
+            pass
+        with space_queries.get_db_connection():
+            pass
+        self.assertEqual(get_pool_stats()["checkouts"], before + 2)
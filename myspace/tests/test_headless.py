@@ -0,0 +1,72 @@
+"""
+Tests for the virtual clock and headless fast-forward runner.
+"""
+from managers.events.headless import HeadlessSimulation
+from managers.events.master_loop import MasterLoop
+from managers.events.priority_manager import SystemPriority
+from managers.weapon_manager import Weapon
+from world.clock import VirtualClock, get_clock, now
+from types import SimpleNamespace
+from unittest import TestCase
+import time
+
+class TestVirtualClock(TestCase):
+    def test_only_moves_forward(self):
+        clock = VirtualClock(10.0)
+        self.assertEqual(clock.advance(5), 15.0)
+        self.assertEqual(clock.set(20), 20.0)
+        with self.assertRaises(ValueError):
+            clock.set(19)
+
+class TestHeadlessSimulation(TestCase):
+    def test_hour_of_fleet_activity(self):
+        """An hour of recurring fleet updates runs quickly, at exact virtual times."""
+        with HeadlessSimulation() as sim:
+            self.assertIs(get_clock(), sim.clock)
+            manager = sim.event_manager
+            ticks = {}
+
+            def move(ship):
+                ticks.setdefault(ship, []).append(now())
+
+            for ship in range(20):
+                manager.add_recurring(move, 1.0, SystemPriority.MOVEMENT, ship, delay=0)
+            stats = sim.run(3600)
+
+        self.assertIs(get_clock(), time.time)
+        self.assertEqual(stats.events, 20 * 3601)
+        self.assertEqual(ticks[7][:3], [0.0, 1.0, 2.0])
+        self.assertEqual(ticks[7][-1], 3600.0)
+        self.assertLess(stats.wall_time, 60)
+        self.assertGreater(stats.speedup, 60)
+
+    def test_weapon_cooldowns_use_virtual_time(self):
+        """Cooldown checks and recharge timers follow the simulation clock."""
+        ship = SimpleNamespace(ndb=SimpleNamespace(beam_capacitor=100.0), messages=[])
+        ship.msg = ship.messages.append
+        weapon = Weapon("Beam Bank 0", damage=50.0, bonus=1.0, cost=10.0, arc=60.0, cooldown=3.0)
+        shots = []
+
+        def volley():
+            if weapon.can_fire(100.0):
+                weapon.start_cooldown(ship)
+                shots.append(now())
+
+        with HeadlessSimulation() as sim:
+            sim.event_manager.add_recurring(volley, 1.0, SystemPriority.COMBAT, delay=0)
+            sim.run(10)
+
+        self.assertEqual(shots, [0.0, 3.0, 6.0, 9.0])
+        self.assertEqual(ship.messages.count("Beam Bank 0 is ready to fire again!"), 3)
+
+    def test_master_loop_frames(self):
+        """Master loop frames run on virtual time alongside events."""
+        sim = HeadlessSimulation()
+        master = MasterLoop(dt=0.1, clock=sim.clock)
+        frames = []
+        master.add_stage("movement", lambda: frames.append(now()), 0.5, SystemPriority.MOVEMENT)
+        sim.master = master
+        stats = sim.run(2.0)
+
+        self.assertEqual(stats.frames, 21)
+        self.assertEqual(frames, [0.0, 0.5, 1.0, 1.5, 2.0])
@@ -0,0 +1,68 @@
+"""
+Tests for the fixed-timestep master loop.
+"""
+from managers.events.master_loop import MasterLoop
+from managers.events.priority_manager import PriorityEventManager, SystemPriority
+from managers.events.tick_scheduler import TickScheduler
+from unittest import TestCase
+import asyncio
+
+class TestMasterLoop(TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.loop = MasterLoop(dt=0.1, clock=lambda: self.now, max_catchup=5)
+        self.log = []
+
+    def stage(self, name, interval, priority):
+        self.loop.add_stage(name, lambda: self.log.append((self.loop.frame, name)), interval, priority)
+
+    def test_priority_order_and_periods(self):
+        """Stages run in priority order each frame, at whole-frame periods."""
+        self.stage("sensors", 1.0, SystemPriority.SENSORS)
+        self.stage("combat", 0.2, SystemPriority.COMBAT)
+        self.stage("movement", 0.1, SystemPriority.MOVEMENT)
+
+        async def run():
+            for _ in range(11):
+                await self.loop.step()
+
+        asyncio.run(run())
+        self.assertEqual(self.log[:3], [(0, "movement"), (0, "combat"), (0, "sensors")])
+        self.assertEqual([f for f, n in self.log if n == "combat"], [0, 2, 4, 6, 8, 10])
+        self.assertEqual([f for f, n in self.log if n == "sensors"], [0, 10])
+        self.assertAlmostEqual(self.loop.sim_time, 1.1)
+
+    def test_catch_up_and_drop(self):
+        """Slipped frames are run back to back, up to the catch-up limit."""
+        self.stage("movement", 0.1, SystemPriority.MOVEMENT)
+
+        async def run():
+            self.assertEqual(await self.loop.advance(), 1)  # Frame 0
+            self.now = 0.35
+            self.assertEqual(await self.loop.advance(), 3)  # Frames 1-3
+            self.now = 2.0
+            self.assertEqual(await self.loop.advance(), 5)  # 17 due, 5 run
+
+        asyncio.run(run())
+        stats = self.loop.get_stats()
+        self.assertEqual(stats["frames"], 9)
+        self.assertEqual(stats["catchup_frames"], 2 + 4)
+        self.assertEqual(stats["dropped_frames"], 12)
+
+        # After dropping, the loop is back on schedule
+        asyncio.run(self.loop.advance(2.05))
+        self.assertEqual(self.loop.frame, 9)
+        asyncio.run(self.loop.advance(2.15))
+        self.assertEqual(self.loop.frame, 10)
+
+    def test_scheduler_systems_as_stages(self):
+        """Tick scheduler systems are dispatched by the loop."""
+        manager = PriorityEventManager()
+        scheduler = TickScheduler(manager, clock=lambda: self.now)
+        self.loop.add_scheduler(scheduler)
+        manager.add_event(self.log.append, SystemPriority.COMBAT, 0, "combat")
+        manager.add_event(self.log.append, SystemPriority.MOVEMENT, 0, "movement")
+
+        asyncio.run(self.loop.step())
+        self.assertEqual(self.log, ["movement", "combat"])
+        self.assertEqual(scheduler.get_stats()["combat"]["runs"], 1)
@@ -0,0 +1,85 @@
+"""
+Tests for the engine metrics registry.
+"""
+from world.metrics import MetricsRegistry, Histogram, SIZE_BUCKETS, get_metrics
+from world.database.pool import query_label
+from managers.events.priority_manager import PriorityEventManager
+from unittest import TestCase
+import asyncio
+
+class TestHistogram(TestCase):
+    def test_summary_and_percentiles(self):
+        """Percentiles come from bucket bounds, clamped to the observed range."""
+        histogram = Histogram("rows", buckets=SIZE_BUCKETS)
+        for value in [0] * 50 + [3] * 40 + [40] * 9 + [700]:
+            histogram.observe(value)
+
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot["count"], 100)
+        self.assertEqual(snapshot["min"], 0)
+        self.assertEqual(snapshot["max"], 700)
+        self.assertEqual(histogram.percentile(50), 0)
+        self.assertEqual(histogram.percentile(90), 5)
+        self.assertEqual(histogram.percentile(99), 50)
+        self.assertEqual(histogram.percentile(100), 700)
+
+class TestRegistry(TestCase):
+    def test_labels_and_kinds(self):
+        """Metrics are keyed by name and label, and a name keeps one kind."""
+        registry = MetricsRegistry()
+        registry.inc("events", label="power")
+        registry.inc("events", 2, label="power")
+        registry.inc("events", label="sensors")
+        registry.set("depth", 4)
+        registry.set("depth", 1)
+        with registry.timer("work"):
+            pass
+
+        snapshot = registry.snapshot()
+        self.assertEqual(snapshot["events"]["power"]["value"], 3)
+        self.assertEqual(snapshot["events"]["sensors"]["value"], 1)
+        self.assertEqual(snapshot["depth"][""], {"value": 1, "max": 4})
+        self.assertEqual(snapshot["work"][""]["count"], 1)
+        with self.assertRaises(TypeError):
+            registry.histogram("events", "power")
+
+    def test_disabled_registry_records_nothing(self):
+        registry = MetricsRegistry(enabled=False)
+        registry.inc("events")
+        registry.observe("lateness", 0.5)
+        self.assertEqual(registry.snapshot(), {})
+
+    def test_query_labels(self):
+        self.assertEqual(query_label("\n SELECT id FROM space_objects WHERE id = %s"),
+                         "select space_objects")
+        self.assertEqual(query_label('UPDATE "sectors" SET active = true'), "update sectors")
+        self.assertEqual(query_label("SELECT 1"), "select")
+
+class TestEventMetrics(TestCase):
+    def setUp(self):
+        get_metrics().reset()
+
+    def test_event_processing_is_measured(self):
+        """Processing records queue depth, lateness and per-callback duration."""
+        manager = PriorityEventManager()
+        calls = []
+
+        def update():
+            calls.append(1)
+
+        async def failing():
+            raise RuntimeError("boom")
+
+        manager.add_event(update, 80, -0.5)
+        manager.add_event(failing, 80, -0.5)
+        asyncio.run(manager.process_events("power", max_process=5))
+
+        snapshot = get_metrics().snapshot("events.")
+        self.assertEqual(calls, [1])
+        self.assertEqual(snapshot["events.queue_depth_sampled"]["power"]["max"], 2)
+        self.assertEqual(snapshot["events.queue_depth"][""]["value"], 0)
+        self.assertEqual(snapshot["events.lateness"]["power"]["count"], 2)
+        self.assertGreaterEqual(snapshot["events.lateness"]["power"]["min"], 0.5)
+        callbacks = snapshot["events.callback_duration"]
+        self.assertEqual(callbacks[update.__qualname__]["count"], 1)
+        self.assertEqual(callbacks[failing.__qualname__]["count"], 1)
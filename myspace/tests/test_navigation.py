@@ -0,0 +1,85 @@
+"""
+Tests for the in-process route planner.
+"""
+from world.space.navigation import PathPlanner, _point_segment_distance
+from world.space.spatial_index import get_spatial_index
+from unittest import TestCase
+
+class TestPathPlanner(TestCase):
+    def setUp(self):
+        self.planner = PathPlanner()
+
+    def assertRouteClear(self, route, obstacles, clearance):
+        for a, b in zip(route, route[1:]):
+            for obstacle in obstacles:
+                self.assertGreater(_point_segment_distance(obstacle, a, b), clearance)
+
+    def test_clear_line_is_direct(self):
+        """An unobstructed route is just the two endpoints."""
+        route = self.planner.find_path((0, 0, 0), (100, 100, 100), 25.0,
+                                       obstacles=[(500, 0, 0)])
+        self.assertEqual(route, [(0, 0, 0), (100, 100, 100)])
+
+    def test_routes_around_obstacle(self):
+        """A blocked route detours and keeps the avoidance radius."""
+        obstacles = [(50, 50, 50)]
+        route = self.planner.find_path((0, 0, 0), (100, 100, 100), 25.0,
+                                       obstacles=obstacles)
+
+        self.assertEqual(route[0], (0, 0, 0))
+        self.assertEqual(route[-1], (100, 100, 100))
+        self.assertGreater(len(route), 2)
+        self.assertRouteClear(route, obstacles, 25.0)
+
+    def test_routes_through_field(self):
+        """Smoothed routes through a cluttered field stay clear."""
+        obstacles = [(x, y, 0) for x in range(100, 500, 80) for y in range(-200, 240, 80)]
+        route = self.planner.find_path((0, 0, 0), (600, 0, 0), 20.0, obstacles=obstacles)
+
+        self.assertEqual(route[-1], (600, 0, 0))
+        self.assertRouteClear(route, obstacles, 20.0)
+
+    def test_endpoint_obstacles_ignored(self):
+        """Obstacles at the start or destination do not block the route."""
+        route = self.planner.find_path((0, 0, 0), (100, 0, 0), 25.0,
+                                       obstacles=[(0, 0, 0), (100, 5, 0)])
+        self.assertEqual(route, [(0, 0, 0), (100, 0, 0)])
+
+    def test_route_cache(self):
+        """Repeat routes between the same sectors reuse the cached search."""
+        index = get_spatial_index()
+        index.clear()
+        index.update(-1, (50, 50, 50), object_type="asteroid")
+        index.loaded = True
+        try:
+            first = self.planner.find_path((0, 0, 0), (100, 100, 100), 25.0)
+            second = self.planner.find_path((1, 0, 0), (100, 100, 101), 25.0)
+        finally:
+            index.clear()
+
+        self.assertEqual(self.planner.stats["searches"], 1)
+        self.assertEqual(self.planner.stats["cache_hits"], 1)
+        self.assertEqual(first[1:-1], second[1:-1])
+        self.assertEqual(second[0], (1, 0, 0))
+        self.assertEqual(second[-1], (100, 100, 101))
+
+    def test_route_cache_survives_ship_movement(self):
+        """Ships moving elsewhere do not invalidate cached routes; planets moving does."""
+        index = get_spatial_index()
+        index.clear()
+        index.update(-1, (50, 50, 50), object_type="planet")
+        index.update(-2, (5000, 5000, 5000), object_type="ship")
+        index.loaded = True
+        try:
+            self.planner.find_path((0, 0, 0), (100, 100, 100), 25.0)
+            index.update(-2, (5100, 5000, 5000))  # An unrelated ship moves
+            self.planner.find_path((0, 0, 0), (100, 100, 100), 25.0)
+            self.assertEqual(self.planner.stats["cache_hits"], 1)
+
+            index.update(-1, (50, 50, 51))  # The planet moves
+            self.planner.find_path((0, 0, 0), (100, 100, 100), 25.0)
+        finally:
+            index.clear()
+
+        self.assertEqual(self.planner.stats["searches"], 2)
+        self.assertEqual(self.planner.stats["cache_hits"], 1)
@@ -0,0 +1,93 @@
+"""
+Tests for the write-behind position buffer.
+"""
+from world.space.database.position_buffer import PositionWriteBuffer
+from world.database.queries import get_db_connection
+from .conftest import BaseTest
+import json
+
+class TestPositionWriteBuffer(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.buffer = PositionWriteBuffer(flush_interval=60.0, max_age=60.0, max_pending=1000)
+
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("DELETE FROM space_objects WHERE key LIKE 'TEST-Buffer%'")
+                self.ids = []
+                for i in range(3):
+                    cur.execute("""
+                        INSERT INTO space_objects (
+                            key, object_type, position, orientation, status, power_systems
+                        ) VALUES (
+                            %s, 'ship',
+                            ST_SetSRID(ST_MakePoint(0, 0, 0), 3857),
+                            ST_SetSRID(ST_MakePoint(1, 0, 0), 3857),
+                            %s, '{}'::jsonb
+                        ) RETURNING id
+                    """, (f"TEST-Buffer-{i}", json.dumps({"active": True})))
+                    self.ids.append(cur.fetchone()[0])
+                conn.commit()
+
+    def _positions(self):
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT id, ST_X(position), ST_Y(position), ST_Z(position)
+                    FROM space_objects WHERE id = ANY(%s)
+                """, (self.ids,))
+                return {row[0]: tuple(row[1:]) for row in cur.fetchall()}
+
+    def test_moves_collapse_until_flush(self):
+        """Repeated moves of one object are written once with the latest value."""
+        for step in range(5):
+            self.buffer.stage(self.ids[0], (step, step, step))
+        self.buffer.stage(self.ids[1], (10.0, 20.0, 30.0))
+
+        self.assertEqual(self.buffer.pending_count(), 2)
+        self.assertEqual(self.buffer.stats["collapsed"], 4)
+        self.assertEqual(self._positions()[self.ids[0]], (0.0, 0.0, 0.0))
+
+        self.assertEqual(self.buffer.flush(), 2)
+        positions = self._positions()
+        self.assertEqual(positions[self.ids[0]], (4.0, 4.0, 4.0))
+        self.assertEqual(positions[self.ids[1]], (10.0, 20.0, 30.0))
+        self.assertEqual(positions[self.ids[2]], (0.0, 0.0, 0.0))
+        self.assertEqual(self.buffer.pending_count(), 0)
+
+    def test_pending_limit_forces_flush(self):
+        """Reaching max_pending flushes without waiting for the interval."""
+        buffer = PositionWriteBuffer(flush_interval=0.001, max_age=60.0, max_pending=3)
+        buffer._last_flush -= 1.0
+        for obj_id in self.ids:
+            buffer.stage(obj_id, (1.0, 2.0, 3.0))
+
+        self.assertEqual(buffer.pending_count(), 0)
+        self.assertEqual(buffer.stats["rows_flushed"], 3)
+
+    def test_later_move_keeps_staged_sector(self):
+        """A move without a sector does not drop a sector change staged before it."""
+        self.buffer.stage(self.ids[0], (1.0, 1.0, 1.0), sector_id=42)
+        self.buffer.stage(self.ids[0], (2.0, 2.0, 2.0))
+        self.assertEqual(self.buffer._pending[self.ids[0]], (2.0, 2.0, 2.0, 42))
+
+        self.buffer.stage(self.ids[0], (3.0, 3.0, 3.0), sector_id=43)
+        self.assertEqual(self.buffer._pending[self.ids[0]][3], 43)
+
+    def test_flush_deferred_inside_connection_block(self):
+        """A flush inside a caller's block leaves its transaction alone."""
+        self.buffer.stage(self.ids[0], (7.0, 8.0, 9.0))
+        with get_db_connection():
+            self.assertEqual(self.buffer.flush(), 0)
+        self.assertEqual(self.buffer.stats["deferred"], 1)
+        self.assertEqual(self.buffer.pending_count(), 1)
+
+        self.assertEqual(self.buffer.flush(), 1)
+        self.assertEqual(self._positions()[self.ids[0]], (7.0, 8.0, 9.0))
+
+    def tearDown(self):
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("DELETE FROM space_objects WHERE key LIKE 'TEST-Buffer%'")
+                conn.commit()
+        super().tearDown()
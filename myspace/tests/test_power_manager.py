@@ -151,6 +151,22 @@ class TestPowerManager(BaseTest):
         self.assertEqual(self.obj.db.alloc["helm"], movement_alloc + shield_alloc)
         self.assertEqual(self.obj.db.alloc["tactical"], beam_alloc)
 
+    def test_shared_topology(self):
+        """Test the hierarchy is compiled once and shared between managers."""
+        other = PowerManager(self.obj)
+        self.assertIs(other.topology, self.power_mgr.topology)
+
+        topology = self.power_mgr.topology
+        forward = topology.index["shield_forward"]
+        self.assertEqual(topology.keys[topology.parents[forward]], "shields")
+        self.assertEqual(topology.shield_slots[forward], 0)
+        self.assertEqual(topology.shield_slots[topology.index["beam"]], -1)
+
+        # Allocations live in each manager's own array
+        self.power_mgr.request_power("beam", 10.0)
+        self.assertEqual(self.power_mgr.systems["beam"].allocation, 10.0)
+        self.assertEqual(other.systems["beam"].allocation, 0.0)
+
     @pytest.mark.skip(reason="UI reporting functionality temporarily disabled")
     def test_allocation_report(self):
         """Test power allocation report generation."""
@@ -0,0 +1,118 @@
+"""
+Tests for the fleet-wide power solver.
+"""
+from managers.power_manager import PowerManager, PowerSystem, PowerTopology
+from managers.power_solver import FleetPowerSolver, water_fill
+from types import SimpleNamespace
+from unittest import TestCase
+import numpy as np
+import gc
+
+def make_ship(main_out):
+    """Build a minimal object with a power manager."""
+    db = SimpleNamespace(main={"out": main_out}, aux={"out": 0.0}, batt={"out": 0.0})
+    obj = SimpleNamespace(db=db)
+    obj.power_mgr = PowerManager(obj)
+    return obj
+
+class TestWaterFill(TestCase):
+    def test_small_demands_met_first(self):
+        """Budget is levelled across demands, meeting small ones in full."""
+        result = water_fill(np.array([[1.0, 5.0, 10.0]]), np.array([9.0]))
+        np.testing.assert_allclose(result, [[1.0, 4.0, 4.0]])
+
+    def test_sufficient_budget(self):
+        """Every demand is met when the budget allows."""
+        result = water_fill(np.array([[1.0, 2.0], [0.0, 0.0]]), np.array([10.0, 5.0]))
+        np.testing.assert_allclose(result, [[1.0, 2.0], [0.0, 0.0]])
+
+class TestFleetPowerSolver(TestCase):
+    def setUp(self):
+        self.solver = FleetPowerSolver()
+
+    def test_matches_single_requests(self):
+        """With ample power the solver grants what request_power granted."""
+        ship = make_ship(1000.0)
+        mgr = ship.power_mgr
+        movement = mgr.request_power("movement", 50.0)
+        beam = mgr.request_power("beam", 10.0)
+
+        self.solver.solve([mgr])
+        self.assertAlmostEqual(mgr.get_system_power("movement"), movement)
+        self.assertAlmostEqual(mgr.get_system_power("beam"), beam)
+        self.assertAlmostEqual(mgr.get_system_power("total"), movement + beam)
+        self.assertAlmostEqual(mgr.systems["tactical"].allocation, beam)
+
+    def test_caps_scale_with_reactor(self):
+        """Each system is capped at its share of current reactor output."""
+        ship = make_ship(100.0)  # 10GW available
+        mgr = ship.power_mgr
+        mgr.requests[mgr.topology.index["movement"]] = 4.0
+        mgr.requests[mgr.topology.index["beam"]] = 1.5
+        mgr.requests[mgr.topology.index["misc"]] = 0.4
+
+        self.solver.solve([mgr])
+        self.assertAlmostEqual(mgr.get_system_power("movement"), 4.0)
+        self.assertAlmostEqual(mgr.get_system_power("beam"), 1.5)
+        self.assertAlmostEqual(mgr.get_system_power("misc"), 0.4)
+
+        ship.db.main["out"] = 50.0  # 5GW available
+        self.solver.solve([mgr])
+        self.assertAlmostEqual(mgr.get_system_power("movement"), 2.0)  # Capped at 40%
+        self.assertAlmostEqual(mgr.get_system_power("beam"), 0.75)      # Capped at 15%
+        self.assertAlmostEqual(mgr.get_system_power("misc"), 0.2)       # Capped at 4%
+
+    def test_priority_under_shortage(self):
+        """When ratios overcommit the reactor, higher priorities are served first."""
+        systems = {
+            "total": PowerSystem("Total", power_ratio=1.0),
+            "engines": PowerSystem("Engines", parent="total", power_ratio=0.6, priority=2),
+            "phasers": PowerSystem("Phasers", parent="total", power_ratio=0.6, priority=1),
+            "torpedoes": PowerSystem("Torpedoes", parent="total", power_ratio=0.6, priority=1),
+        }
+        for name, system in systems.items():
+            if system.parent:
+                systems[system.parent].children.append(name)
+        solver = FleetPowerSolver(PowerTopology(systems))
+
+        requests = np.array([[0.0, 10.0, 10.0, 1.0]])
+        result = solver.allocate(np.array([10.0]), requests)
+        # Engines take their 6GW cap; the other 4GW is levelled at priority 1
+        np.testing.assert_allclose(result, [[10.0, 6.0, 3.0, 1.0]])
+
+    def test_parent_requests_spread_over_leaves(self):
+        """A request on a parent system is shared by its leaves."""
+        mgr = make_ship(1000.0).power_mgr
+        mgr.requests[mgr.topology.index["shields"]] = 12.0
+
+        self.solver.solve([mgr])
+        self.assertAlmostEqual(mgr.get_system_power("shields"), 12.0)
+        np.testing.assert_allclose(mgr.obj.db.alloc["shield"], [2.0] * 6)
+
+    def test_fleet_solved_together(self):
+        """Every ship is solved in one pass with its own reactor output."""
+        ships = [make_ship(out) for out in (1000.0, 100.0, 0.0)]
+        for ship in ships:
+            ship.power_mgr.requests[ship.power_mgr.topology.index["movement"]] = 10.0
+
+        result = self.solver.solve([ship.power_mgr for ship in ships])
+        self.assertEqual(result.shape[0], 3)
+        self.assertEqual([s.power_mgr.get_system_power("movement") for s in ships], [10.0, 4.0, 0.0])
+
+    def test_saved_allocations_survive_solve(self):
+        """A manager created over saved allocations keeps them as standing requests."""
+        ship = make_ship(1000.0)
+        ship.power_mgr.request_power("movement", 20.0)
+        ship.power_mgr.request_power("shield_aft", 3.0)
+        ship.power_mgr.request_power("beam", 10.0)
+
+        # As after a reload, with only db.alloc to go on
+        del ship.power_mgr
+        gc.collect()
+        mgr = PowerManager(ship)
+        self.assertIs(PowerManager.for_object(ship), mgr)
+        self.solver.solve([mgr])
+        self.assertAlmostEqual(mgr.get_system_power("movement"), 20.0)
+        self.assertAlmostEqual(mgr.get_system_power("beam"), 10.0)
+        self.assertAlmostEqual(mgr.get_system_power("shield_aft"), 3.0)
+        self.assertAlmostEqual(mgr.get_system_power("helm"), 23.0)
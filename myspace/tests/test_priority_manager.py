@@ -8,8 +8,13 @@ import asyncio
 from managers.events.priority_manager import (
     PriorityEventManager, 
     Event,
-    SystemPriority
+    SystemPriority,
+    ExecutionClass
 )
+import os
+import threading
+import weakref
+import gc
 
 @pytest_asyncio.fixture
 async def event_manager():
@@ -184,4 +189,150 @@ async def test_async_callback(event_manager):
     # Process events
     await event_manager.process_events()
     await asyncio.sleep(0.2)  # Let async processing complete
-    assert results == [1, 2]
\ No newline at end of file
+    assert results == [1, 2]
+@pytest.mark.asyncio
+async def test_future_events_not_reordered(event_manager):
+    """Ticks only touch due events for their own system"""
+    results = []
+
+    def callback(value):
+        results.append(value)
+
+    for i in range(100):
+        event_manager.add_event(callback, SystemPriority.COMBAT, 60, "later")
+    event_manager.add_event(callback, SystemPriority.SENSORS, 0.05, "sensors")
+    event_manager.add_event(callback, SystemPriority.COMBAT, 0, "combat")
+
+    assert await event_manager.process_events(system="sensors") == 0
+    assert await event_manager.process_events(system="combat", max_process=10) == 1
+    assert results == ["combat"]
+    assert event_manager.get_queue_size() == 101
+
+    # The next due event is the sensor event, not the head of any one queue
+    next_time = event_manager.get_next_event_time()
+    assert next_time == event_manager.get_next_event_time(system="sensors")
+    assert next_time < time.time() + 0.1
+    assert event_manager.get_next_event_time(system="combat") > time.time() + 30
+
+@pytest.mark.asyncio
+async def test_recurring_events(event_manager):
+    """Recurring events reuse one slot, keep their phase and can be cancelled"""
+    runs = []
+    handle = event_manager.add_recurring(runs.append, 0.05, SystemPriority.POWER, "tick", delay=0)
+    event = handle.event
+
+    await event_manager.process_events(system="power")
+    assert runs == ["tick"]
+    assert event_manager.get_queue_size() == 1
+    assert event_manager.get_next_event_time() == pytest.approx(handle.start + 0.05)
+
+    # A slow tick skips missed runs instead of bursting, staying on phase
+    await asyncio.sleep(0.12)
+    await event_manager.process_events(system="power")
+    assert runs == ["tick", "tick"]
+    assert event_manager.get_next_event_time() == pytest.approx(handle.start + 0.15)
+    assert handle.event is event
+
+    assert handle.cancel()
+    assert not handle.cancel()
+    assert not handle.active
+    assert event_manager.get_queue_size() == 0
+    await asyncio.sleep(0.06)
+    await event_manager.process_events()
+    assert runs == ["tick", "tick"]
+
+@pytest.mark.asyncio
+async def test_next_event_time_skips_cancelled(event_manager):
+    """Cancelled events waiting at the head of a bucket do not count as next due"""
+    handle = event_manager.add_recurring(lambda: None, 1.0, SystemPriority.POWER, delay=0)
+    event_manager.add_event(lambda: None, SystemPriority.POWER, 5)
+    assert event_manager.get_next_event_time() == pytest.approx(handle.start)
+
+    handle.cancel()
+    assert event_manager.get_next_event_time() == pytest.approx(time.time() + 5, abs=0.5)
+    assert event_manager.get_next_event_time(system="power") == event_manager.get_next_event_time()
+    assert await event_manager.process_events() == 0
+
+@pytest.mark.asyncio
+async def test_cancel_after_clear(event_manager):
+    """Cancelling a cleared event does not change the queue size"""
+    handle = event_manager.add_recurring(lambda: None, 1.0, SystemPriority.POWER)
+    event_manager.add_event(lambda: None, SystemPriority.POWER, 5)
+    event_manager.clear_events()
+    assert event_manager.get_queue_size() == 0
+
+    assert handle.cancel()
+    assert event_manager.get_queue_size() == 0
+    event_manager.add_event(lambda: None, SystemPriority.POWER, 0)
+    assert event_manager.get_queue_size() == 1
+
+@pytest.mark.asyncio
+async def test_recurring_cancel_from_callback(event_manager):
+    """A recurring callback can cancel itself"""
+    runs = []
+
+    def callback():
+        runs.append(1)
+        handle.cancel()
+
+    handle = event_manager.add_recurring(callback, 0.01, delay=0)
+    await event_manager.process_events()
+    await asyncio.sleep(0.02)
+    await event_manager.process_events()
+    assert runs == [1]
+    assert event_manager.get_queue_size() == 0
+
+def record_pid(results):
+    """Module-level so it can run in the process pool"""
+    return os.getpid()
+
+@pytest.mark.asyncio
+async def test_execution_classes(event_manager):
+    """Sync callbacks run inline by default, or in the pool they are assigned"""
+    threads = []
+
+    def where(label):
+        threads.append((label, threading.current_thread()))
+
+    def blocking(label):
+        where(label)
+
+    event_manager.add_event(where, 0, 0, "inline")
+    event_manager.add_event(where, 0, 0, "thread", execution=ExecutionClass.THREAD)
+    event_manager.register_callback("blocking", blocking, execution=ExecutionClass.THREAD)
+    event_manager.add_event(event_manager.get_callback("blocking"), 0, 0, "registered")
+    event_manager.add_event(record_pid, 0, 0, [], execution=ExecutionClass.PROCESS)
+
+    await event_manager.process_events()
+    assert dict(threads)["inline"] is threading.current_thread()
+    assert dict(threads)["thread"] is not threading.current_thread()
+    assert dict(threads)["registered"] is not threading.current_thread()
+
+    stats = event_manager.get_executor_stats()
+    assert stats["inline"]["completed"] == 1
+    assert stats["thread"]["completed"] == 2
+    assert stats["process"]["completed"] == 1
+    assert all(s["queued"] == 0 for s in stats.values())
+    event_manager.shutdown_executors()
+
+@pytest.mark.asyncio
+async def test_execution_class_does_not_keep_owner_alive(event_manager):
+    """Registering a bound method with an execution class holds its object weakly"""
+    class Owner:
+        def update(self):
+            pass
+
+    owner = Owner()
+    event_manager.register_callback("owned", owner.update, execution=ExecutionClass.THREAD)
+    event_manager.set_execution_class(len, ExecutionClass.THREAD)
+    assert event_manager.get_execution_class(owner.update) is ExecutionClass.THREAD
+    assert event_manager.get_execution_class(len) is ExecutionClass.THREAD
+
+    event_manager.remove_callback("owned")
+    assert event_manager.get_execution_class(owner.update) is ExecutionClass.INLINE
+
+    event_manager.set_execution_class(owner.update, ExecutionClass.THREAD)
+    ref = weakref.ref(owner)
+    del owner
+    gc.collect()
+    assert ref() is None
@@ -0,0 +1,62 @@
+"""
+Tests for the reactor/asyncio bridge.
+"""
+from managers.events.reactor_bridge import ReactorBridge
+from managers.events.master_loop import MasterLoop
+from types import SimpleNamespace
+from unittest import TestCase
+import asyncio
+import time
+
+class TestReactorBridge(TestCase):
+    def test_native_loop_is_shared(self):
+        """On the asyncio reactor the engine uses the reactor's own loop."""
+        native = asyncio.new_event_loop()
+        try:
+            bridge = ReactorBridge(reactor=SimpleNamespace(_asyncioEventloop=native))
+            self.assertIs(bridge.start(), native)
+            self.assertTrue(bridge.native)
+            bridge.pump()  # Nothing to pump; the reactor drives the loop
+            bridge.stop()
+            self.assertFalse(bridge.running)
+            self.assertFalse(native.is_closed())  # Owned by the reactor
+        finally:
+            native.close()
+
+    def test_pump_runs_ready_work_without_blocking(self):
+        """Each pump runs ready callbacks and returns, leaving timers pending."""
+        bridge = ReactorBridge(reactor=SimpleNamespace())
+        bridge.loop = asyncio.new_event_loop()
+        ran = []
+
+        async def engine():
+            ran.append("started")
+            await asyncio.sleep(3600)
+            ran.append("finished")
+
+        task = bridge.run(engine())
+        bridge.pump()
+        self.assertEqual(ran, ["started"])
+        self.assertFalse(task.done())
+
+        bridge.stop()
+        self.assertTrue(task.cancelled())
+        self.assertEqual(ran, ["started"])
+
+    def test_master_loop_frames_on_pumped_loop(self):
+        """The master loop advances frames as the reactor pumps the loop."""
+        bridge = ReactorBridge(reactor=SimpleNamespace())
+        bridge.loop = asyncio.new_event_loop()
+        master = MasterLoop(dt=0.001)
+        frames = []
+        master.add_stage("count", lambda: frames.append(master.frame), 0.001)
+        master.start(bridge.loop)
+
+        for _ in range(20):
+            bridge.pump()
+            if len(frames) >= 3:
+                break
+            time.sleep(0.002)  # Reactor does other work between pumps
+        master.stop()
+        bridge.stop()
+        self.assertGreaterEqual(len(frames), 3)
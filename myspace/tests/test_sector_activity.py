@@ -0,0 +1,127 @@
+"""
+Tests for sector activation.
+"""
+from types import SimpleNamespace
+from world.clock import VirtualClock, set_clock
+from world.constants import SECTOR_SIZE_SU
+from world.space.sectors.activity import (
+    SectorActivity, get_sector_activity, space_object_for, update_crew
+)
+from unittest import TestCase
+
+def _object(obj_id, sector_x, sector_y):
+    """Space object stand-in at the centre of a sector."""
+    x, y = (sector_x + 0.5) * SECTOR_SIZE_SU, (sector_y + 0.5) * SECTOR_SIZE_SU
+    return SimpleNamespace(id=obj_id, db=SimpleNamespace(coords={"x": x, "y": y, "z": 0.0}))
+
+def _manager(obj):
+    return SimpleNamespace(obj=obj)
+
+class TestSectorActivity(TestCase):
+    def setUp(self):
+        self.clock = VirtualClock(1000.0)
+        self.previous = set_clock(self.clock)
+        self.activity = SectorActivity(idle_timeout=30.0, wake_range_pc=20.0)
+
+    def tearDown(self):
+        set_clock(self.previous)
+
+    def test_idle_galaxy_is_asleep(self):
+        """With nothing happening, no sector is active and systems get no managers."""
+        managers = [_manager(_object(i, i * 7, -i)) for i in range(50)]
+        self.assertEqual(self.activity.update(), 0)
+        self.assertEqual(list(self.activity.select(managers)), [])
+
+    def test_activity_wakes_sectors_in_range(self):
+        """Activity wakes its own sector and those within wake range at the next update."""
+        mover = _object(1, 10, 10)
+        self.activity.note_object(mover)
+        self.assertFalse(self.activity.is_active((10.5 * SECTOR_SIZE_SU, 10.5 * SECTOR_SIZE_SU, 0.0)))
+
+        self.assertEqual(self.activity.update(), 25)  # 20pc is two sectors each way
+        near, edge, far = _object(2, 12, 8), _object(3, 8, 12), _object(4, 13, 10)
+        selected = list(self.activity.select(map(_manager, [mover, near, edge, far])))
+        self.assertEqual([mgr.obj.id for mgr in selected], [1, 2, 3])
+
+    def test_sectors_sleep_after_idle_timeout(self):
+        """Sectors fall asleep once idle for the timeout, unless activity continues."""
+        ship = _object(1, 0, 0)
+        self.activity.note_object(ship)
+        self.activity.update()
+
+        self.clock.advance(20.0)
+        self.activity.note_object(_object(2, 4, 0))
+        self.activity.update()
+
+        self.clock.advance(15.0)
+        self.assertEqual(self.activity.update(), 25)  # Only sectors around the later activity
+        self.assertFalse(self.activity.is_active((0.5 * SECTOR_SIZE_SU, 0.0, 0.0)))
+        self.assertTrue(self.activity.is_active((4.5 * SECTOR_SIZE_SU, 0.0, 0.0)))
+
+        self.clock.advance(30.0)
+        self.assertEqual(self.activity.update(), 0)
+
+    def test_crewed_ship_stays_awake(self):
+        """A ship with players aboard keeps its surroundings awake until they leave."""
+        ship = _object(1, -3, 5)
+        self.activity.board(ship)
+        self.activity.board(ship)
+        self.activity.update()
+
+        self.clock.advance(100.0)
+        self.activity.update()
+        self.assertEqual(len(list(self.activity.select([_manager(ship)]))), 1)
+
+        self.activity.leave(ship)
+        self.assertTrue(self.activity.is_crewed(ship))
+        self.activity.leave(ship)
+        self.assertFalse(self.activity.is_crewed(ship))
+
+        self.clock.advance(31.0)
+        self.assertEqual(self.activity.update(), 0)
+
+    def test_bridge_room_boards_its_ship(self):
+        """Rooms without coordinates resolve to the ship they belong to."""
+        ship = _object(1, 7, -7)
+        linked = SimpleNamespace(id=101, db=SimpleNamespace(is_bridge=True, space_object=ship))
+        contained = SimpleNamespace(id=102, db=SimpleNamespace(is_bridge=True), location=ship)
+        adrift = SimpleNamespace(id=103, db=SimpleNamespace(is_bridge=True), location=None)
+        self.assertIs(space_object_for(linked), ship)
+        self.assertIs(space_object_for(contained), ship)
+        self.assertIs(space_object_for(ship), ship)
+        self.assertIsNone(space_object_for(adrift))
+
+        self.activity.board(space_object_for(linked))
+        self.assertTrue(self.activity.is_crewed(ship))
+        self.assertGreater(self.activity.update(), 0)
+        self.assertEqual(len(list(self.activity.select([_manager(ship)]))), 1)
+
+        self.activity.leave(space_object_for(contained))
+        self.assertFalse(self.activity.is_crewed(ship))
+
+    def test_crew_follows_puppeting(self):
+        """Logging on or off a bridge boards or leaves the ship, once per character."""
+        activity = get_sector_activity()
+        activity.clear()
+        self.addCleanup(activity.clear)
+        ship = _object(1, 2, 2)
+        bridge = SimpleNamespace(id=101, db=SimpleNamespace(is_bridge=True, space_object=ship))
+        player = SimpleNamespace(has_account=True, location=bridge, ndb=SimpleNamespace())
+
+        self.assertIs(update_crew(player), ship)  # Puppeted, or found there after a reload
+        update_crew(player)
+        self.assertTrue(activity.is_crewed(ship))
+
+        player.has_account, player.location = False, None  # Logged off
+        self.assertIsNone(update_crew(player))
+        self.assertFalse(activity.is_crewed(ship))
+
+        npc = SimpleNamespace(has_account=False, location=bridge, ndb=SimpleNamespace())
+        self.assertIsNone(update_crew(npc))
+        self.assertFalse(activity.is_crewed(ship))
+
+    def test_disabled_selects_everything(self):
+        """With activation disabled every manager is ticked."""
+        activity = SectorActivity(enabled=False)
+        managers = [_manager(_object(i, i, i)) for i in range(5)]
+        self.assertEqual(list(activity.select(managers)), managers)
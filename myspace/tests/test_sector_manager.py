@@ -1,8 +1,9 @@
 """
 Tests for the sector manager implementation.
 """
-from world.sectors.sector_manager import SectorManager
+from world.space.sectors.sector_manager import SectorManager
 from world.database.queries import get_db_connection
+from world.space.database.position_buffer import get_position_buffer
 from .conftest import BaseTest
 
 class TestSectorManager(BaseTest):
@@ -14,6 +15,7 @@ class TestSectorManager(BaseTest):
         with get_db_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute("TRUNCATE sectors CASCADE")
+            conn.commit()
 
     def test_sector_creation(self):
         """Test creating sectors for positions."""
@@ -110,8 +112,9 @@ class TestSectorManager(BaseTest):
                 self.assertIsNotNone(result, "Failed to create test object")
                 obj_id = result[0]
 
-        # Move object to new sector
+        # Move object to new sector and persist the staged move
         self.manager.update_object_sector(obj_id, pos1, pos2)
+        get_position_buffer().flush()
 
         # Verify sector changed
         with get_db_connection() as conn:
@@ -152,4 +155,48 @@ class TestSectorManager(BaseTest):
         delta_pos = (100.0, -100.0, 0.0)
         delta_x, delta_y = self.manager.get_sector_coordinates(delta_pos)
         delta_sector = self.manager.get_sector_name(delta_x, delta_y)
-        self.assertEqual(delta_sector, "D-10.10")
\ No newline at end of file
+        self.assertEqual(delta_sector, "D-10.10")
+
+    def test_cached_sector_lookup(self):
+        """Test repeat lookups are served from the sector cache."""
+        pos = (50.0, 50.0, 50.0)
+        sector_id = self.manager.get_sector_for_position(pos)
+        self.assertEqual(self.manager.stats["misses"], 1)
+
+        # Anywhere in the same sector resolves without the database
+        self.assertEqual(self.manager.get_sector_for_position((59.9, 50.1, -400.0)), sector_id)
+        self.assertEqual(self.manager.stats["hits"], 1)
+
+        # A fresh manager finds the existing row rather than creating another
+        other = SectorManager()
+        self.assertEqual(other.get_sector_for_position(pos), sector_id)
+        self.assertEqual(other.stats["created"], 0)
+
+    def test_cache_eviction(self):
+        """Test the sector cache keeps only the most recently used IDs."""
+        manager = SectorManager(cache_size=2)
+        first = manager.get_sector_for_position((5.0, 5.0, 0.0))
+        manager.get_sector_for_position((15.0, 5.0, 0.0))
+        manager.get_sector_for_position((25.0, 5.0, 0.0))
+
+        self.assertEqual(manager.get_sector_for_position((5.0, 5.0, 0.0)), first)
+        self.assertEqual(manager.stats["misses"], 4)
+        self.assertEqual(manager.stats["created"], 3)
+
+    def test_prewarm_region(self):
+        """Test prewarming creates and caches every sector in a region."""
+        resolved = self.manager.prewarm((-15.0, -15.0, 0.0), (15.0, 15.0, 0.0))
+        self.assertEqual(resolved, 16)
+        self.assertEqual(self.manager.stats["created"], 16)
+
+        # Prewarming again is served from the cache
+        self.assertEqual(self.manager.prewarm((-15.0, -15.0, 0.0), (15.0, 15.0, 0.0)), 16)
+        self.assertEqual(self.manager.stats["created"], 16)
+
+        self.manager.get_sector_for_position((-9.0, 9.0, 0.0))
+        self.assertEqual(self.manager.stats["misses"], 0)
+
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT COUNT(*) FROM sectors")
+                self.assertEqual(cur.fetchone()[0], 16)
@@ -0,0 +1,47 @@
+"""
+Tests for sector ring and spiral iteration.
+"""
+from world.space.sectors.sector_manager import SectorManager, ring_cells
+from unittest import TestCase
+from itertools import islice
+import math
+
+class TestSectorRings(TestCase):
+    def setUp(self):
+        self.manager = SectorManager()
+
+    def test_ring_cells(self):
+        """Each ring holds every sector at exactly its Chebyshev distance, once."""
+        center = (-918, 6)
+        self.assertEqual(list(ring_cells(center, 0)), [center])
+        for radius in range(1, 6):
+            ring = list(ring_cells(center, radius))
+            self.assertEqual(len(ring), 8 * radius)
+            self.assertEqual(len(set(ring)), len(ring))
+            for x, y in ring:
+                self.assertEqual(max(abs(x - center[0]), abs(y - center[1])), radius)
+
+    def test_rings_are_lazy_and_ordered(self):
+        """Rings move outwards without end, nearest the position first within each ring."""
+        position = (-9174.044174, 61.8, 0.0)
+        rings = list(islice(self.manager.iter_rings(position), 4))
+        self.assertEqual(rings[0], [(-918, 6)])
+        self.assertEqual([len(ring) for ring in rings], [1, 8, 16, 24])
+
+        centre = lambda cell: ((cell[0] + 0.5) * 10.0, (cell[1] + 0.5) * 10.0)
+        for ring in rings:
+            distances = [math.dist(position[:2], centre(cell)) for cell in ring]
+            self.assertEqual(distances, sorted(distances))
+
+        spiral = list(self.manager.iter_spiral(position, max_range=3))
+        self.assertEqual(spiral, [cell for ring in rings for cell in ring])
+
+    def test_nearby_cells(self):
+        """Nearby cells cover the square around the position's sector, nearest first."""
+        position = (12.0, -3.0, 40.0)
+        cells = self.manager.get_nearby_cells(position, range_sectors=2)
+        expected = {(x, y) for x in range(-1, 4) for y in range(-3, 2)}
+        self.assertEqual(set(cells), expected)
+        self.assertEqual(cells[0], (1, -1))
+        with self.assertRaises(ValueError):
+            self.manager.get_nearby_cells(position, range_sectors=0)
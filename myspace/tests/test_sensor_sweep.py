@@ -0,0 +1,171 @@
+"""
+Tests for the fleet-wide sensor sweep.
+"""
+from managers.sensor_manager import SensorManager
+from world.space.spatial_index import get_spatial_index
+from world.constants import PARSEC_TO_SU, DetectionLevel
+from typeclass.spaceobject import SpaceCoords
+from types import SimpleNamespace
+from unittest import TestCase
+
+def move(obj, x):
+    """Move a test object to (x, 0, 0) parsecs."""
+    obj.db.coords.set_su_coords(x * PARSEC_TO_SU, 0.0, 0.0)
+    get_spatial_index().update(obj.id, (x * PARSEC_TO_SU, 0.0, 0.0))
+
+def make_ship(obj_id, x, srs=False, lrs=False, clock=None):
+    """Build a minimal sensor-equipped object at (x, 0, 0) parsecs."""
+    clock = clock or [0.0]
+    db = SimpleNamespace(
+        coords=SpaceCoords(),
+        sensor={"srs_active": srs, "srs_damage": 0.0, "lrs_active": lrs, "lrs_damage": 0.0}
+    )
+    db.coords.set_su_coords(x * PARSEC_TO_SU, 0.0, 0.0)
+    obj = SimpleNamespace(id=obj_id, key=f"Test-{obj_id}", db=db,
+                          get_current_time=lambda: clock[0])
+    obj.sensor_mgr = SensorManager(obj)
+    get_spatial_index().update(obj_id, (x * PARSEC_TO_SU, 0.0, 0.0), object_type="ship")
+    return obj
+
+class TestSensorSweep(TestCase):
+    def setUp(self):
+        self.index = get_spatial_index()
+        self.index.clear()
+        self.index.loaded = True
+
+    def tearDown(self):
+        self.index.clear()
+
+    def test_sweep_fans_out_contacts(self):
+        """One sweep fills in contacts for every scanning ship."""
+        alpha = make_ship(1, 0.0, srs=True)
+        beta = make_ship(2, 40.0, lrs=True)
+        far = make_ship(3, 300.0)
+        results = SensorManager.sweep([alpha.sensor_mgr, beta.sensor_mgr, far.sensor_mgr], force=True)
+
+        # The ship with no active sensors does not scan
+        self.assertEqual(set(results), {1, 2})
+        self.assertEqual({c.object_id for c in results[1]}, {2})
+        self.assertEqual({c.object_id for c in results[2]}, {1, 3})
+
+        self.assertIn(2, alpha.sensor_mgr.contacts)
+        self.assertEqual(beta.sensor_mgr.contacts[1].detection_level, DetectionLevel.FULL)
+        self.assertEqual(beta.sensor_mgr.contacts[3].detection_level, DetectionLevel.FAINT)
+        self.assertEqual(far.sensor_mgr.contacts, {})
+
+    def test_sweep_matches_single_scans(self):
+        """A sweep sees the same objects as per-ship range scans."""
+        ships = [make_ship(i, i * 30.0, srs=True) for i in range(1, 8)]
+        results = SensorManager.sweep([ship.sensor_mgr for ship in ships], force=True)
+
+        for ship in ships:
+            coords = ship.db.coords.su
+            single = ship.sensor_mgr._find_in_range(coords, SensorManager.SRS_RANGE_PC * PARSEC_TO_SU)
+            self.assertEqual({hit[0] for hit in single},
+                             {c.object_id for c in results[ship.id]})
+
+class TestContactDeltas(TestCase):
+    def setUp(self):
+        self.index = get_spatial_index()
+        self.index.clear()
+        self.index.loaded = True
+        self.clock = [0.0]
+        self.ship = make_ship(1, 0.0, srs=True, clock=self.clock)
+        self.deltas = []
+        self.ship.sensor_mgr.add_listener(lambda mgr, delta: self.deltas.append(delta))
+
+    def tearDown(self):
+        self.index.clear()
+
+    def sweep(self):
+        SensorManager.sweep([self.ship.sensor_mgr], force=True)
+
+    def test_gained_changed_lost(self):
+        """Scans report only what changed since the previous scan."""
+        target = make_ship(2, 80.0)
+        self.sweep()
+        self.assertEqual([c.object_id for c in self.deltas[-1].gained], [2])
+        contact = self.ship.sensor_mgr.contacts[2]
+
+        # No change, no event
+        self.sweep()
+        self.assertEqual(len(self.deltas), 1)
+
+        move(target, 30.0)
+        self.sweep()
+        changed, previous = self.deltas[-1].changed[0]
+        self.assertIs(changed, contact)  # Updated in place
+        self.assertEqual(previous, DetectionLevel.PARTIAL)
+        self.assertEqual(contact.detection_level, DetectionLevel.FULL)
+
+        self.index.remove(2)
+        self.sweep()
+        self.assertEqual([c.object_id for c in self.deltas[-1].lost], [2])
+        self.assertNotIn(2, self.ship.sensor_mgr.contacts)
+
+    def test_contacts_expire_outside_scan_volume(self):
+        """Contacts last seen beyond the scanned range are kept until the TTL."""
+        make_ship(2, 400.0)
+        self.ship.db.sensor["lrs_active"] = True
+        self.sweep()
+        self.assertIn(2, self.ship.sensor_mgr.contacts)
+
+        # Short-range only: the contact is outside the scanned volume
+        self.ship.db.sensor["lrs_active"] = False
+        self.sweep()
+        self.assertIn(2, self.ship.sensor_mgr.contacts)
+
+        self.clock[0] = SensorManager.CONTACT_TTL + 1
+        self.sweep()
+        self.assertNotIn(2, self.ship.sensor_mgr.contacts)
+        self.assertEqual([c.object_id for c in self.deltas[-1].lost], [2])
+
+class TestDeadReckoning(TestCase):
+    def setUp(self):
+        self.index = get_spatial_index()
+        self.index.clear()
+        self.index.loaded = True
+        self.clock = [0.0]
+        self.ship = make_ship(1, 0.0, srs=True, clock=self.clock)
+
+    def tearDown(self):
+        self.index.clear()
+
+    def test_track_predicts_between_scans(self):
+        """A contact moving at constant speed is extrapolated between scans."""
+        target = make_ship(2, 60.0)
+        speed = 1.0  # Parsecs per second
+        for step in range(8):
+            self.clock[0] = float(step)
+            move(target, 60.0 - speed * step)
+            SensorManager.sweep([self.ship.sensor_mgr], force=True)
+
+        contact = self.ship.sensor_mgr.contacts[2]
+        self.assertAlmostEqual(contact.velocity / PARSEC_TO_SU, speed, delta=0.05)
+        self.assertEqual(len(contact.history), 8)
+
+        predicted = self.ship.sensor_mgr.predicted_contacts(7.5)[2]
+        self.assertAlmostEqual(predicted[0] / PARSEC_TO_SU, 52.5, delta=0.1)
+
+    def test_sweeps_follow_scan_schedule(self):
+        """Ships are only rescanned when their next scan is due."""
+        make_ship(2, 80.0)  # PARTIAL contact, rescanned every 2 seconds
+        self.assertIn(1, SensorManager.sweep([self.ship.sensor_mgr]))
+
+        self.clock[0] = 1.0
+        self.assertEqual(SensorManager.sweep([self.ship.sensor_mgr]), {})
+
+        self.clock[0] = 2.0
+        self.assertIn(1, SensorManager.sweep([self.ship.sensor_mgr]))
+
+    def test_closing_contacts_rescan_sooner(self):
+        """A fast closing contact shortens the rescan interval."""
+        target = make_ship(2, 80.0)
+        SensorManager.sweep([self.ship.sensor_mgr], force=True)
+        slow_interval = self.ship.sensor_mgr.contacts[2].scan_interval
+
+        self.clock[0] = 1.0
+        move(target, 60.0)
+        SensorManager.sweep([self.ship.sensor_mgr], force=True)
+        contact = self.ship.sensor_mgr.contacts[2]
+        self.assertLess(contact.scan_interval, slow_interval)
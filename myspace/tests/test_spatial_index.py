@@ -0,0 +1,114 @@
+"""
+Tests for the in-memory spatial index.
+"""
+from world.space.spatial_index import SpatialIndex, get_spatial_index, register_object, forget_object
+import gc
+import weakref
+import math
+import random
+
+def _brute_force(points, center, radius):
+    """Reference radius query ordered by distance."""
+    found = [i for i, p in points.items() if math.dist(p, center) <= radius]
+    return sorted(found, key=lambda i: math.dist(points[i], center))
+
+def _populated_index(count=2000, seed=7):
+    rng = random.Random(seed)
+    index = SpatialIndex(cell_size=100.0)
+    points = {}
+    for obj_id in range(count):
+        pos = tuple(rng.uniform(-2000, 2000) for _ in range(3))
+        points[obj_id] = pos
+        index.update(obj_id, pos, object_type="ship")
+    return index, points, rng
+
+def test_radius_matches_brute_force():
+    """Radius queries return exactly the objects in range, nearest first."""
+    index, points, rng = _populated_index()
+    for _ in range(25):
+        center = tuple(rng.uniform(-2000, 2000) for _ in range(3))
+        radius = rng.uniform(10, 1500)
+        found = [entry.object_id for _, entry in index.query_radius(center, radius)]
+        assert found == _brute_force(points, center, radius)
+
+def test_nearest_matches_brute_force():
+    """k-nearest queries agree with a full sort."""
+    index, points, rng = _populated_index()
+    for _ in range(25):
+        center = tuple(rng.uniform(-3000, 3000) for _ in range(3))
+        k = rng.randint(1, 15)
+        found = [entry.object_id for _, entry in index.nearest(center, k)]
+        expected = sorted(points, key=lambda i: math.dist(points[i], center))[:k]
+        assert found == expected
+
+def test_cone_filters_by_angle():
+    """Cone queries keep only objects inside the half-angle."""
+    index = SpatialIndex(cell_size=10.0)
+    index.update(1, (100, 0, 0))
+    index.update(2, (100, 100, 0))  # 45 degrees off axis
+    index.update(3, (-100, 0, 0))   # Behind
+
+    ahead = [entry.object_id for _, entry in index.query_cone((0, 0, 0), 500, (1, 0, 0), 60)]
+    assert ahead == [1]
+
+    wide = [entry.object_id for _, entry in index.query_cone((0, 0, 0), 500, (1, 0, 0), 100)]
+    assert wide == [1, 2]
+
+def test_static_epoch():
+    """Only planets and stations changing bump the static epoch."""
+    index = SpatialIndex(cell_size=10.0)
+    index.update(1, (0, 0, 0), object_type="ship")
+    index.update(2, (5, 0, 0), object_type="planet")
+    static = index.static_epoch
+
+    index.update(1, (50, 0, 0))
+    index.update(2, (5, 0, 0))
+    assert index.static_epoch == static
+    index.update(2, (6, 0, 0))
+    assert index.static_epoch == static + 1
+    index.remove(2)
+    assert index.static_epoch == static + 2
+
+def test_move_exclude_and_remove():
+    """Moves change cells, the caller can be excluded and removals stick."""
+    index = SpatialIndex(cell_size=10.0)
+    index.update(1, (0, 0, 0))
+    index.update(2, (5, 0, 0))
+    epoch = index.epoch
+
+    index.update(2, (500, 0, 0))
+    assert index.epoch > epoch
+    assert [e.object_id for _, e in index.query_radius((0, 0, 0), 50)] == [1]
+    assert [e.object_id for _, e in index.query_radius((0, 0, 0), 50, exclude=1)] == []
+
+    assert index.remove(2)
+    assert 2 not in index
+    assert not index.remove(2)
+
+class _Station:
+    """Weakly referenceable stand-in for a space object."""
+    def __init__(self, obj_id):
+        self.id = obj_id
+
+def test_forget_deleted_object():
+    """Deleted objects leave queries, the static epoch moves and they can be freed."""
+    index = get_spatial_index()
+    loader, index.object_loader = index.object_loader, None
+    try:
+        station = _Station(-501)
+        register_object(station)
+        index.update(station.id, (0, 0, 0), object_type="station", obj=station)
+        static = index.static_epoch
+
+        assert forget_object(station.id)
+        assert station.id not in index
+        assert index.static_epoch == static + 1
+        assert index.resolve(station.id) is None
+        assert not forget_object(station.id)
+
+        ref = weakref.ref(station)
+        del station
+        gc.collect()
+        assert ref() is None
+    finally:
+        index.object_loader = loader
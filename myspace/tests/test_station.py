@@ -137,6 +137,20 @@ class TestStation(BaseTest):
         self.assertTrue(any(name == '_update_shields' for _, name in events))
         self.assertTrue(any(name == '_update_sensors' for _, name in events))
 
+    def test_delete_stops_updates(self):
+        """Deleting a station cancels its periodic work and releases its callbacks."""
+        updates = list(self.station._updates)
+        self.assertTrue(updates and all(handle.active for handle in updates))
+        self.assertIn(self.station, Station._live)
+
+        self.assertTrue(self.station.at_object_delete())
+        self.assertFalse(any(handle.active for handle in updates))
+        self.assertIsNone(
+            self.event_manager.get_callback(f"station_power_update_{self.station.id}")
+        )
+        self.assertNotIn(self.station, Station._live)
+        self.assertEqual(Station.stop_all_updates(), 0)
+
     def test_repair_and_resupply_with_events(self):
         """Test repair and resupply calculations with event integration"""
         repair_amount = self.station.get_repair_capacity()
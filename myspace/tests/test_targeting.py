@@ -0,0 +1,39 @@
+"""
+Tests for delta-driven weapon targeting.
+"""
+from managers.sensor_manager import Contact, ContactDelta, SensorManager
+from managers.targeting import attach_targeting, has_contact
+from world.constants import DetectionLevel
+from types import SimpleNamespace
+from unittest import TestCase
+
+def _contact(object_id):
+    return Contact(object_id=object_id, position=(0.0, 0.0, 0.0), velocity=0.0,
+                   detection_level=DetectionLevel.FULL, last_update=0.0)
+
+class TestTargeting(TestCase):
+    def setUp(self):
+        db = SimpleNamespace(
+            blist=[{"active": True, "lock": 7}, {"active": True, "lock": 8}],
+            mlist=[{"active": True, "lock": 7}],
+        )
+        self.ship = SimpleNamespace(key="Test Ship", db=db)
+        self.ship.sensor_mgr = SensorManager(self.ship)
+        attach_targeting(self.ship.sensor_mgr)
+
+    def test_lost_contact_releases_locks(self):
+        """Locks on a contact a scan lost are released; others are kept."""
+        mgr = self.ship.sensor_mgr
+        mgr.contacts = {7: _contact(7), 8: _contact(8)}
+        self.assertTrue(has_contact(self.ship, 7))
+
+        lost = mgr.contacts.pop(7)
+        mgr._notify(ContactDelta(lost=[lost]))
+        self.assertFalse(has_contact(self.ship, 7))
+        self.assertEqual([bank["lock"] for bank in self.ship.db.blist], [None, 8])
+        self.assertIsNone(self.ship.db.mlist[0]["lock"])
+
+    def test_gained_contact_leaves_locks(self):
+        """Deltas without losses do not touch weapon locks."""
+        self.ship.sensor_mgr._notify(ContactDelta(gained=[_contact(9)]))
+        self.assertEqual([bank["lock"] for bank in self.ship.db.blist], [7, 8])
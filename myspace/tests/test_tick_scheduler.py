@@ -0,0 +1,110 @@
+"""
+Tests for the tick budget scheduler.
+"""
+from managers.events.priority_manager import PriorityEventManager, SystemPriority
+from managers.events.tick_scheduler import TickScheduler, STEP_COOLDOWN
+from unittest import TestCase
+import asyncio
+import time
+
+class TestTickScheduler(TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.manager = PriorityEventManager()
+        self.scheduler = TickScheduler(self.manager, clock=lambda: self.now)
+
+    def test_degradation_order(self):
+        """Overload sheds low priority systems first and never touches movement or combat."""
+        self.assertEqual(self.scheduler.steps, [
+            ("slow", "general"), ("shed", "general"),
+            ("slow", "sensors"), ("shed", "sensors"),
+            ("slow", "shields"), ("shed", "shields"),
+            ("slow", "power"),
+        ])
+
+        combat = self.scheduler.systems["combat"]
+        modes = [("normal", "normal")]
+        for _ in range(30):
+            self.now += STEP_COOLDOWN
+            self.scheduler._record(combat, lateness=0.0, duration=combat.interval, processed=1)
+            mode = (self.scheduler.mode("sensors"), self.scheduler.mode("shields"))
+            if mode != modes[-1]:
+                modes.append(mode)
+        self.assertEqual(self.scheduler.level, len(self.scheduler.steps))
+        self.assertEqual(modes, [("normal", "normal"), ("slow", "normal"), ("shed", "normal"),
+                                 ("shed", "slow"), ("shed", "shed")])
+        for system in ("movement", "combat"):
+            self.assertEqual(self.scheduler.mode(system), "normal")
+        self.assertEqual(self.scheduler.mode("power"), "slow")
+
+        # Load drops: systems come back, highest priority first
+        for _ in range(30):
+            self.now += STEP_COOLDOWN
+            self.scheduler._record(combat, lateness=0.0, duration=0.0, processed=0)
+        self.assertEqual(self.scheduler.level, 0)
+
+    def test_slowed_and_shed_ticks_skipped(self):
+        """Slowed systems run every other tick and shed systems not at all."""
+        self.scheduler.level = 3  # General shed, sensors slowed
+        self.scheduler._last_step = self.now  # Hold the level for this test
+
+        async def run():
+            started = []
+            for _ in range(4):
+                task = self.scheduler.dispatch("sensors")
+                started.append(task)
+                if task:
+                    await task
+            self.scheduler.dispatch("general")
+            return started
+
+        started = asyncio.run(run())
+        self.assertEqual([t is not None for t in started], [False, True, False, True])
+        stats = self.scheduler.get_stats()
+        self.assertEqual(stats["sensors"]["skipped_slow"], 2)
+        self.assertEqual(stats["sensors"]["runs"], 2)
+        self.assertEqual(stats["general"]["shed"], 1)
+        self.assertEqual(stats["sensors"]["mode"], "slow")
+
+    def test_overlapping_ticks_skipped(self):
+        """A tick still running when the next fires is not started twice."""
+        release = None
+
+        async def slow_event():
+            await release.wait()
+
+        async def run():
+            nonlocal release
+            release = asyncio.Event()
+            self.manager.add_event(slow_event, SystemPriority.COMBAT)
+            first = self.scheduler.dispatch("combat")
+            await asyncio.sleep(0)
+            second = self.scheduler.dispatch("combat")
+            release.set()
+            await first
+            return second
+
+        self.assertIsNone(asyncio.run(run()))
+        stats = self.scheduler.get_stats()["combat"]
+        self.assertEqual(stats["skipped_overlap"], 1)
+        self.assertEqual(stats["runs"], 1)
+
+    def test_lateness_tracked(self):
+        """Lateness is measured against the ideal tick schedule."""
+        async def run():
+            await self.scheduler.dispatch("power")
+            self.now += 1.3  # Due at 1.0
+            await self.scheduler.dispatch("power")
+
+        asyncio.run(run())
+        self.assertAlmostEqual(self.scheduler.get_stats()["power"]["last_lateness"], 0.3)
+
+    def test_time_budget(self):
+        """A tick stops processing once its budget is spent."""
+        for _ in range(5):
+            self.manager.add_event(time.sleep, SystemPriority.SENSORS, 0, 0.01)
+
+        processed = asyncio.run(self.manager.process_events(system="sensors", max_process=5,
+                                                            time_budget=0.015))
+        self.assertEqual(processed, 2)
+        self.assertEqual(self.manager.get_queue_size(), 3)
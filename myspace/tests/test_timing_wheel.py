@@ -0,0 +1,83 @@
+"""
+Tests for the hierarchical timing wheel.
+"""
+from world.timing_wheel import TimingWheel
+from world import utils
+from unittest import TestCase
+import asyncio
+import threading
+
+class TestTimingWheel(TestCase):
+    def setUp(self):
+        self.now = 0.0
+        # Small wheel so timers cascade across levels quickly
+        self.wheel = TimingWheel(tick=0.01, slots=4, levels=3,
+                                 clock=lambda: self.now, autostart=False)
+        self.fired = []
+
+    def run_until(self, end, step=0.01):
+        while self.now < end:
+            self.now = round(self.now + step, 6)
+            self.wheel.advance()
+
+    def test_fires_at_deadline(self):
+        """Callbacks run once their deadline has passed, never early."""
+        for delay in (0.005, 0.03, 0.17, 0.5, 1.23):
+            self.wheel.schedule(delay, lambda d=delay: self.fired.append((d, self.now)))
+
+        self.run_until(2.0)
+        self.assertEqual([d for d, _ in self.fired], [0.005, 0.03, 0.17, 0.5, 1.23])
+        for delay, when in self.fired:
+            self.assertGreaterEqual(when, delay)
+            self.assertLess(when, delay + 0.02)
+        self.assertEqual(len(self.wheel), 0)
+
+    def test_beyond_span(self):
+        """Timers longer than the wheel's span still fire on time."""
+        self.wheel.schedule(2.5, self.fired.append, "late")  # Span is 0.64 seconds
+        self.run_until(2.49)
+        self.assertEqual(self.fired, [])
+        self.run_until(2.52)
+        self.assertEqual(self.fired, ["late"])
+
+    def test_cancel(self):
+        """Cancelled callbacks never run."""
+        handle = self.wheel.schedule(0.1, self.fired.append, "cancelled")
+        self.wheel.schedule(0.1, self.fired.append, "kept")
+        self.assertTrue(handle.cancel())
+        self.assertFalse(handle.cancel())
+        self.assertEqual(len(self.wheel), 1)
+
+        self.run_until(0.2)
+        self.assertEqual(self.fired, ["kept"])
+        self.assertTrue(handle.done)
+
+    def test_large_jump(self):
+        """Advancing a long way at once runs everything due in order."""
+        for delay in (0.3, 0.1, 0.2):
+            self.wheel.schedule(delay, self.fired.append, delay)
+        self.now = 5.0
+        self.assertEqual(self.wheel.advance(), 3)
+        self.assertEqual(self.fired, [0.1, 0.2, 0.3])
+
+class TestDelay(TestCase):
+    def test_delay_without_loop(self):
+        """utils.delay works without an event loop and can be cancelled."""
+        done = threading.Event()
+        utils.delay(0.02, done.set)
+        cancelled = utils.delay(0.02, self.fail)
+        cancelled.cancel()
+        self.assertTrue(done.wait(2.0))
+
+    def test_wheel_on_event_loop(self):
+        """A wheel attached to a loop is driven by that loop."""
+        wheel = TimingWheel(tick=0.005)
+        fired = []
+
+        async def main():
+            wheel.attach(asyncio.get_running_loop())
+            wheel.schedule(0.02, fired.append, threading.current_thread())
+            await asyncio.sleep(0.1)
+
+        asyncio.run(main())
+        self.assertEqual(fired, [threading.main_thread()])
@@ -9,6 +9,8 @@ import json
 class FederationShip(SpaceObject):
     """Standard Federation starship class."""
 
+    object_type = "ship"
+
     def at_object_creation(self):
         """Initialize ship-specific attributes."""
         super().at_object_creation()
@@ -9,6 +9,8 @@ import json
 class Planet(SpaceObject):
     """Basic planetary body."""
 
+    object_type = "planet"
+
     def at_object_creation(self):
         """Initialize planet-specific attributes."""
         super().at_object_creation()
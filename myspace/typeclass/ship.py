@@ -15,6 +15,8 @@ class Ship(SpaceObject, MessageMixin):
     Extends SpaceObject with movement and ship-specific systems.
     """
 
+    object_type = "ship"
+
     def __init__(self):
         super().__init__()
         self.db: DBProtocol
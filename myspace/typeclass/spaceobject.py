@@ -18,6 +18,10 @@ from dataclasses import dataclass
 from world.constants import DetectionLevel
 from world.sectors.sector import Sector
 from world.database.queries import get_db_connection
+from world.space.spatial_index import get_spatial_index, register_object, forget_object
+from world.space.sectors.activity import get_sector_activity
+from world.space.database.position_buffer import get_position_buffer
+from world.clock import now
 import json
 
 class SpaceCoords:
@@ -100,6 +104,7 @@ class SpaceObject:
     """Base class for all space objects."""
 
     _next_id = 1
+    object_type = "object"  # Stored in space_objects.object_type
 
     def __init__(self):
         """Initialize space object attributes."""
@@ -108,9 +113,12 @@ class SpaceObject:
         SpaceObject._next_id += 1
 
         from managers.sensor_manager import SensorManager
+        from managers.targeting import attach_targeting
         self.sensor_mgr = SensorManager(self)
+        attach_targeting(self.sensor_mgr)
 
         self.key = f"Object-{self.id}"
+        register_object(self)
         self.at_object_creation()
 
     @property
@@ -122,16 +130,34 @@ class SpaceObject:
         """Update object position in space units."""
         # Store SU coordinates directly since input is already in SU
         self.db.coords.set_su_coords(x, y, z)
+        get_spatial_index().update(self.id, (x, y, z), self.object_type, self.key, self)
+        # Moving objects keep the sectors around them awake
+        get_sector_activity().note((x, y, z))
 
-        # Store SU coordinates in database
+        # Persisted in bulk by the write-behind buffer
+        get_position_buffer().stage(self.id, (x, y, z))
+
+    def at_init(self):
+        """Called whenever the object is loaded into memory, e.g. after a server restart."""
+        register_object(self)
+        su_coords = self.db.coords.su
+        get_spatial_index().update(
+            self.id,
+            (su_coords["x"], su_coords["y"], su_coords["z"]),
+            self.object_type,
+            self.key,
+            self
+        )
+
+    def at_object_delete(self) -> bool:
+        """Called just before the object is deleted; drops it from the engine and the database."""
+        forget_object(self.id)
+        get_position_buffer().discard(self.id)
         with self.db.get_connection() as conn:
             with conn.cursor() as cur:
-                cur.execute("""
-                    UPDATE space_objects 
-                    SET position = ST_SetSRID(ST_MakePoint(%s, %s, %s), 3857)
-                    WHERE id = %s
-                """, (x, y, z, self.id))
-                conn.commit()
+                cur.execute("DELETE FROM space_objects WHERE id = %s", (self.id,))
+            conn.commit()
+        return True
 
     def scan_range(self, max_range: float, active_mode: bool = False) -> List["Contact"]:
         """Perform sensor scan with range in parsecs."""
@@ -142,8 +168,8 @@ class SpaceObject:
         return float(self.db.main["out"])
 
     def get_current_time(self) -> float:
-        """Get current time."""
-        return 0.0  # Simplified for testing
+        """Get current simulation time in seconds, used to timestamp sensor contacts."""
+        return now()
 
     def at_object_creation(self):
         """Called when object is first created."""
@@ -160,7 +186,7 @@ class SpaceObject:
                 """, (
                     self.id,
                     self.key,
-                    'object',
+                    self.object_type,
                     su_coords["x"],
                     su_coords["y"],
                     su_coords["z"],
@@ -171,4 +197,12 @@ class SpaceObject:
                         'batt': {}
                     })
                 ))
-                conn.commit()
\ No newline at end of file
+                conn.commit()
+
+        get_spatial_index().update(
+            self.id,
+            (su_coords["x"], su_coords["y"], su_coords["z"]),
+            self.object_type,
+            self.key,
+            self
+        )
\ No newline at end of file
@@ -1,24 +1,37 @@
 """
 Space station class extending SpaceObject.
 """
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from .spaceobject import SpaceObject, DBProtocol, NDBProtocol
 from world.database.queries import get_db_connection
-from managers.events.priority_manager import get_event_manager, SystemPriority
+from managers.events.priority_manager import (
+    get_event_manager, SystemPriority, RecurringEvent
+)
+from world.metrics import get_logger
 import json
+import weakref
 from .rooms import SpaceObjectRoom
 
+logger = get_logger("station")
+
 class Station(SpaceObject):
     """
     Station class representing fixed space installations.
     """
 
+    object_type = "station"
+
+    # Stations with periodic work scheduled, so stopping the engine can cancel it
+    _live: "weakref.WeakSet[Station]" = weakref.WeakSet()
+
     def __init__(self):
         """Initialize the station object."""
         self.db: DBProtocol
         self.ndb: NDBProtocol
         # Initialize event manager first
         self._event_manager = get_event_manager()
+        self._updates: List[RecurringEvent] = []  # Periodic system updates
+        self._docking_power: Dict[int, RecurringEvent] = {}  # Port -> docked ship power feed
         super().__init__()
 
     def at_object_creation(self):
@@ -129,6 +142,7 @@ class Station(SpaceObject):
         """Create a new room with the specified properties."""
         room = SpaceObjectRoom()
         room.db.name = name
+        room.db.space_object = self  # Lets the room find its station, e.g. for sector activity
         if properties:
             for key, value in properties.items():
                 setattr(room.db, key, value)
@@ -136,29 +150,52 @@ class Station(SpaceObject):
 
     def _schedule_updates(self):
         """Schedule periodic system updates"""
-        # Schedule power system updates
-        self._event_manager.add_event(
-            self._update_power_systems,
-            priority=SystemPriority.POWER,
-            delay=self._event_manager.INTERVALS["power"]
-        )
+        Station._live.add(self)
+        intervals = self._event_manager.INTERVALS
+        self._updates = [
+            self._event_manager.add_recurring(
+                self._update_power_systems, intervals["power"], SystemPriority.POWER
+            ),
+            self._event_manager.add_recurring(
+                self._update_shields, intervals["shields"], SystemPriority.SHIELDS
+            ),
+            self._event_manager.add_recurring(
+                self._update_sensors, intervals["sensors"], SystemPriority.SENSORS
+            ),
+        ]
+
+    def stop_updates(self):
+        """Cancel all periodic work for this station and release its callbacks."""
+        for handle in self._updates:
+            handle.cancel()
+        self._updates = []
+        for system in ("power", "shield", "sensor"):
+            self._event_manager.remove_callback(f"station_{system}_update_{self.id}")
+        for handle in self._docking_power.values():
+            handle.cancel()
+        self._docking_power.clear()
+        Station._live.discard(self)
+
+    @classmethod
+    def stop_all_updates(cls) -> int:
+        """
+        Stop the periodic work of every live station.
 
-        # Schedule shield updates
-        self._event_manager.add_event(
-            self._update_shields,
-            priority=SystemPriority.SHIELDS,
-            delay=self._event_manager.INTERVALS["shields"]
-        )
+        Returns:
+            Number of stations stopped
+        """
+        stations = list(cls._live)
+        for station in stations:
+            station.stop_updates()
+        return len(stations)
 
-        # Schedule sensor updates
-        self._event_manager.add_event(
-            self._update_sensors,
-            priority=SystemPriority.SENSORS,
-            delay=self._event_manager.INTERVALS["sensors"]
-        )
+    def at_object_delete(self) -> bool:
+        """Called just before the station is deleted; stops its periodic work."""
+        self.stop_updates()
+        return super().at_object_delete()
 
     def _update_power_systems(self):
-        """Update power distribution and schedule next update"""
+        """Update power distribution"""
         try:
             # Calculate and update power distribution
             total_power = self.db.main["gw"] * (1.0 - self.db.main["damage"])
@@ -181,7 +218,7 @@ class Station(SpaceObject):
                                     WHERE id = %s
                                 """, (str(min(50.0, total_power * 0.1)), ship_id))
                     except Exception as e:
-                        print(f"Error updating power for docked ship {ship_id}: {str(e)}")
+                        logger.error("Error updating power for docked ship %s: %s", ship_id, e)
 
             # Update station status in database
             try:
@@ -202,70 +239,47 @@ class Station(SpaceObject):
                         ))
                         result = cur.fetchone()
                         if result:
-                            print(f"Power systems updated successfully for station {self.id}")
+                            logger.debug("Power systems updated for station %s", self.id)
             except Exception as e:
-                print(f"Error updating station power systems: {str(e)}")
+                logger.error("Error updating station power systems: %s", e)
 
         except Exception as e:
-            print(f"Error in power system update: {str(e)}")
-        finally:
-            # Schedule next update regardless of errors
-            self._event_manager.add_event(
-                self._update_power_systems,
-                priority=SystemPriority.POWER,
-                delay=self._event_manager.INTERVALS["power"]
-            )
+            logger.error("Error in power system update: %s", e)
 
     def _update_shields(self):
-        """Update shield status and schedule next update"""
-        try:
-            if hasattr(self.db, 'shield') and self.db.shield.get("exist", False):
-                # Update shield power consumption and status
-                power_available = self.db.main["out"]
-                for direction in range(6):  # 6 shield facings
-                    if self.db.shield[str(direction)]["active"]:
-                        shield_draw = self.db.shield["ratio"]
-                        if shield_draw <= power_available:
-                            power_available -= shield_draw
-                        else:
-                            self.db.shield[str(direction)]["active"] = False
-        finally:
-            # Always schedule next update
-            self._event_manager.add_event(
-                self._update_shields,
-                priority=SystemPriority.SHIELDS,
-                delay=self._event_manager.INTERVALS["shields"]
-            )
-
-    def _update_sensors(self):
-        """Update sensor contacts and schedule next update"""
-        try:
-            if hasattr(self.db, 'sensor'):
-                # Update sensor power consumption and status
-                power_available = self.db.main["out"]
-
-                # Short range sensors
-                if self.db.sensor.get("srs_active", False):
-                    srs_power = 10.0 * self.db.sensor.get("srs_resolution", 1.0)
-                    if srs_power <= power_available:
-                        power_available -= srs_power
+        """Update shield status"""
+        if hasattr(self.db, 'shield') and self.db.shield.get("exist", False):
+            # Update shield power consumption and status
+            power_available = self.db.main["out"]
+            for direction in range(6):  # 6 shield facings
+                if self.db.shield[str(direction)]["active"]:
+                    shield_draw = self.db.shield["ratio"]
+                    if shield_draw <= power_available:
+                        power_available -= shield_draw
                     else:
-                        self.db.sensor["srs_active"] = False
+                        self.db.shield[str(direction)]["active"] = False
 
-                # Long range sensors
-                if self.db.sensor.get("lrs_active", False):
-                    lrs_power = 20.0 * self.db.sensor.get("lrs_resolution", 1.0)
-                    if lrs_power <= power_available:
-                        power_available -= lrs_power
-                    else:
-                        self.db.sensor["lrs_active"] = False
-        finally:
-            # Always schedule next update
-            self._event_manager.add_event(
-                self._update_sensors,
-                priority=SystemPriority.SENSORS,
-                delay=self._event_manager.INTERVALS["sensors"]
-            )
+    def _update_sensors(self):
+        """Update sensor contacts"""
+        if hasattr(self.db, 'sensor'):
+            # Update sensor power consumption and status
+            power_available = self.db.main["out"]
+
+            # Short range sensors
+            if self.db.sensor.get("srs_active", False):
+                srs_power = 10.0 * self.db.sensor.get("srs_resolution", 1.0)
+                if srs_power <= power_available:
+                    power_available -= srs_power
+                else:
+                    self.db.sensor["srs_active"] = False
+
+            # Long range sensors
+            if self.db.sensor.get("lrs_active", False):
+                lrs_power = 20.0 * self.db.sensor.get("lrs_resolution", 1.0)
+                if lrs_power <= power_available:
+                    power_available -= lrs_power
+                else:
+                    self.db.sensor["lrs_active"] = False
 
     def get_available_docking_port(self, ship_size: float) -> Optional[int]:
         """Find available docking port for given ship size."""
@@ -294,10 +308,11 @@ class Station(SpaceObject):
         self.db.docking["status"][port] = True
         self.db.docking["ships"][port] = ship.id
 
-        # Schedule docking events
-        self._event_manager.add_event(
+        # Feed power to the docked ship until it undocks
+        self._docking_power[port] = self._event_manager.add_recurring(
             self._handle_docking_power,
-            priority=SystemPriority.POWER,
+            self._event_manager.INTERVALS["power"],
+            SystemPriority.POWER,
             delay=0,
             ship_id=ship.id
         )
@@ -318,30 +333,21 @@ class Station(SpaceObject):
 
     def _handle_docking_power(self, ship_id: int):
         """Handle power distribution for docked ships"""
-        try:
-            # Calculate available power for docked ship
-            total_power = self.db.main["out"]
-            ship_allocation = min(50.0, total_power * 0.1)  # 10% of total power, max 50 units
+        # Calculate available power for docked ship
+        total_power = self.db.main["out"]
+        ship_allocation = min(50.0, total_power * 0.1)  # 10% of total power, max 50 units
 
-            with get_db_connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute("""
-                        UPDATE space_objects 
-                        SET power_systems = jsonb_set(
-                            COALESCE(power_systems::jsonb, '{}'::jsonb),
-                            '{main,in}',
-                            %s::jsonb
-                        )
-                        WHERE id = %s
-                    """, (str(ship_allocation), ship_id))
-        finally:
-            # Schedule next power update
-            self._event_manager.add_event(
-                self._handle_docking_power,
-                priority=SystemPriority.POWER,
-                delay=self._event_manager.INTERVALS["power"],
-                ship_id=ship_id
-            )
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    UPDATE space_objects 
+                    SET power_systems = jsonb_set(
+                        COALESCE(power_systems::jsonb, '{}'::jsonb),
+                        '{main,in}',
+                        %s::jsonb
+                    )
+                    WHERE id = %s
+                """, (str(ship_allocation), ship_id))
 
     def undock_ship(self, port: int) -> bool:
         """
@@ -354,6 +360,11 @@ class Station(SpaceObject):
         if not self.db.docking["status"][port]:
             return False
 
+        # Stop feeding power to the departing ship
+        handle = self._docking_power.pop(port, None)
+        if handle is not None:
+            handle.cancel()
+
         ship_id = self.db.docking["ships"][port]
         if ship_id is not None:
             with get_db_connection() as conn:
@@ -404,7 +415,7 @@ class Station(SpaceObject):
                         WHERE id = %s
                     """, (ship_id,))
         except Exception as e:
-            print(f"Error handling undocking power for ship {ship_id}: {str(e)}")
+            logger.error("Error handling undocking power for ship %s: %s", ship_id, e)
 
     def get_repair_capacity(self) -> float:
         """Get current repair capacity available."""
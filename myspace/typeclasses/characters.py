@@ -20,6 +20,10 @@ class Character(ObjectParent, DefaultCharacter):
         """Called after the character moves."""
         super().at_after_move(source_location, **kwargs)
         
+        # Players on a bridge keep the sectors around their ship awake
+        from world.space.sectors.activity import update_crew
+        update_crew(self)
+
         # Check if we're in a bridge room
         if hasattr(self.location, "db") and self.location.db.is_bridge:
             # Add bridge commands
@@ -28,3 +32,15 @@ class Character(ObjectParent, DefaultCharacter):
         else:
             # Remove bridge commands when leaving bridge
             self.cmdset.delete("bridge_commands")
+
+    def at_post_puppet(self, **kwargs):
+        """Called when a player takes control; a player back on a bridge crews its ship."""
+        super().at_post_puppet(**kwargs)
+        from world.space.sectors.activity import update_crew
+        update_crew(self)
+
+    def at_post_unpuppet(self, account=None, session=None, **kwargs):
+        """Called when a player lets go; logging off leaves the bridge without a move hook."""
+        super().at_post_unpuppet(account=account, session=session, **kwargs)
+        from world.space.sectors.activity import update_crew
+        update_crew(self)
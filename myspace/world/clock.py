@@ -0,0 +1,70 @@
+"""
+Simulation clock.
+
+Game time is read through ``now()``. This covers event due times, weapon
+cooldowns and sensor contact timestamps. By default ``now()`` is wall time
+(``time.time``). A headless run installs a ``VirtualClock`` with
+``set_clock``, so time only moves when the runner advances it.
+
+Clocks are zero-argument callables returning seconds, like the ``clock``
+arguments taken by the timing wheel, tick scheduler and master loop, so a
+``VirtualClock`` can drive those too.
+
+Durations that measure real CPU cost, such as tick budgets and metrics
+timers, keep using ``time.perf_counter``.
+"""
+from typing import Callable, Optional
+import time
+
+Clock = Callable[[], float]
+
+class VirtualClock:
+    """
+    Clock that only moves when advanced.
+
+    Args:
+        start: Initial time in seconds
+    """
+
+    def __init__(self, start: float = 0.0):
+        self._now = float(start)
+
+    def __call__(self) -> float:
+        return self._now
+
+    def advance(self, seconds: float) -> float:
+        """Move time forward by seconds. Returns the new time."""
+        if seconds < 0:
+            raise ValueError("Virtual time cannot run backwards")
+        self._now += seconds
+        return self._now
+
+    def set(self, when: float) -> float:
+        """Move time forward to when. Returns the new time."""
+        if when < self._now:
+            raise ValueError("Virtual time cannot run backwards")
+        self._now = float(when)
+        return self._now
+
+# Global simulation clock
+_CLOCK: Clock = time.time
+
+def get_clock() -> Clock:
+    """Get the global simulation clock"""
+    return _CLOCK
+
+def set_clock(clock: Optional[Clock]) -> Clock:
+    """
+    Install a global simulation clock; None restores wall time.
+
+    Returns:
+        The previous clock
+    """
+    global _CLOCK
+    previous = _CLOCK
+    _CLOCK = clock if clock is not None else time.time
+    return previous
+
+def now() -> float:
+    """Get the current simulation time in seconds"""
+    return _CLOCK()
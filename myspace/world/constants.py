@@ -16,7 +16,8 @@ from world.space.constants import (
     Z_AXIS_LIMIT_SU,
     QUADRANT_SIZE,
     MAX_WARP,
-    MAX_IMPULSE
+    MAX_IMPULSE,
+    MAX_POWER_OUTPUT
 )
 
 __all__ = [
@@ -33,5 +34,6 @@ __all__ = [
     'Z_AXIS_LIMIT_SU', 
     'QUADRANT_SIZE',
     'MAX_WARP',
-    'MAX_IMPULSE'
+    'MAX_IMPULSE',
+    'MAX_POWER_OUTPUT'
 ]
@@ -0,0 +1,439 @@
+"""
+Thread-safe PostgreSQL connection pool shared by all space engine queries.
+
+Connections are checked out per thread: nested ``get_db_connection()`` calls
+on the same thread reuse the connection already held by that thread, so a
+helper that opens a connection inside another query never waits on the pool
+(or deadlocks it). A nested block runs inside the outer block's transaction,
+under a savepoint: an exception rolls back to the savepoint, undoing only the
+inner block's work. ``commit()`` or ``rollback()`` inside a nested block acts
+on the whole shared transaction, outer work included, so nested helpers should
+leave that to the outermost block. Connections are health-checked when they
+have been idle for a while and are rolled back before being returned to the
+pool.
+
+Pool sizing is read from the environment:
+
+- ``SPACE_DB_POOL_MIN``: connections opened eagerly (default 1)
+- ``SPACE_DB_POOL_MAX``: hard upper bound on open connections (default 20)
+- ``SPACE_DB_POOL_TIMEOUT``: seconds to wait for a free connection (default 30)
+- ``SPACE_DB_POOL_HEALTH_CHECK``: idle seconds before a ``SELECT 1`` probe (default 30)
+
+Connection parameters come from ``DATABASE_URL`` when set, otherwise from the
+standard ``PG*`` variables.
+
+Pooled connections are ``MeteredConnection`` objects. Their cursors record
+each statement's duration and row count in the ``db.query_duration`` and
+``db.query_rows`` histograms, labelled by statement and table, for example
+``select space_objects``.
+"""
+from typing import Dict, List, Optional, Tuple, Any, Iterator
+from dataclasses import dataclass, asdict
+from contextlib import contextmanager
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
+from world.metrics import SIZE_BUCKETS, get_metrics
+import psycopg2
+import functools
+import threading
+import time
+import os
+import re
+
+_VERB_RE = re.compile(r"^\s*(\w+)")
+_TABLE_RE = re.compile(r"\b(?:FROM|INTO|UPDATE|TABLE)\s+([\w.\"]+)", re.IGNORECASE)
+
+@functools.lru_cache(maxsize=1024)
+def query_label(query: str) -> str:
+    """Get the metric label for a statement: its verb and first table."""
+    verb = _VERB_RE.match(query)
+    if not verb:
+        return "other"
+    table = _TABLE_RE.search(query)
+    if not table:
+        return verb.group(1).lower()
+    return verb.group(1).lower() + " " + table.group(1).replace('"', '').lower()
+
+class _MeteredCursor:
+    """Cursor mixin recording statement duration and rows returned or affected."""
+
+    def _record(self, query: Any, elapsed: float) -> None:
+        metrics = get_metrics()
+        if not metrics.enabled:
+            return
+        if isinstance(query, bytes):
+            query = query.decode("utf-8", "replace")
+        label = query_label(query) if isinstance(query, str) else "composed"
+        metrics.observe("db.query_duration", elapsed, label)
+        if self.rowcount >= 0:
+            metrics.observe("db.query_rows", self.rowcount, label, SIZE_BUCKETS)
+
+    def execute(self, query, vars=None):
+        started = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        finally:
+            self._record(query, time.perf_counter() - started)
+
+    def executemany(self, query, vars_list):
+        started = time.perf_counter()
+        try:
+            return super().executemany(query, vars_list)
+        finally:
+            self._record(query, time.perf_counter() - started)
+
+@functools.lru_cache(maxsize=None)
+def _metered_cursor(factory: type) -> type:
+    """Get the metered subclass of a cursor class."""
+    if issubclass(factory, _MeteredCursor):
+        return factory
+    return type(f"Metered{factory.__name__}", (_MeteredCursor, factory), {})
+
+class MeteredConnection(extensions.connection):
+    """Connection whose cursors, of any cursor factory, are metered."""
+
+    transactions_ended = 0  # Commits and rollbacks, so nested blocks can tell their savepoint is gone
+
+    def cursor(self, *args: Any, **kwargs: Any):
+        factory = kwargs.get("cursor_factory") or self.cursor_factory or extensions.cursor
+        kwargs["cursor_factory"] = _metered_cursor(factory)
+        return super().cursor(*args, **kwargs)
+
+    def commit(self) -> None:
+        self.transactions_ended += 1
+        super().commit()
+
+    def rollback(self) -> None:
+        self.transactions_ended += 1
+        super().rollback()
+
+@dataclass
+class PoolStats:
+    """Counters describing pool usage since creation."""
+    checkouts: int = 0  # Connections handed out by the pool
+    reuses: int = 0  # Nested checkouts served by the thread's own connection
+    waits: int = 0  # Checkouts that had to wait for a free connection
+    timeouts: int = 0  # Checkouts that gave up waiting
+    total_wait: float = 0.0  # Seconds spent waiting, summed over all checkouts
+    max_wait: float = 0.0  # Longest single wait in seconds
+    created: int = 0  # Connections opened
+    discarded: int = 0  # Connections closed because they were broken or stale
+
+class ConnectionPool:
+    """
+    Bounded pool of psycopg2 connections with per-thread checkout.
+
+    Args:
+        minconn: Connections opened when the pool is created
+        maxconn: Maximum number of open connections
+        timeout: Seconds to wait for a free connection before raising PoolError
+        health_check_interval: Idle seconds after which a connection is probed
+        **connect_kwargs: Arguments passed through to ``psycopg2.connect``
+    """
+
+    def __init__(self, minconn: int = 1, maxconn: int = 20, timeout: float = 30.0,
+                 health_check_interval: float = 30.0, **connect_kwargs: Any):
+        if minconn < 0 or maxconn < 1 or minconn > maxconn:
+            raise ValueError("Pool size must satisfy 0 <= minconn <= maxconn and maxconn >= 1")
+
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        connect_kwargs.setdefault("connection_factory", MeteredConnection)
+        self._connect_kwargs = connect_kwargs
+
+        self._idle: List[Tuple[extensions.connection, float]] = []  # (conn, idle since)
+        self._size = 0  # Open connections, idle or checked out
+        self._closed = False
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self.stats = PoolStats()
+
+        for _ in range(minconn):
+            self._idle.append((self._connect(), time.monotonic()))
+
+    def _connect(self) -> extensions.connection:
+        """Open a new connection and count it against the pool size."""
+        conn = psycopg2.connect(**self._connect_kwargs)
+        self._size += 1
+        self.stats.created += 1
+        return conn
+
+    def _discard(self, conn: extensions.connection) -> None:
+        """Close a connection that can no longer be used."""
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._size -= 1
+            self.stats.discarded += 1
+            self._cond.notify()
+
+    def _is_healthy(self, conn: extensions.connection, idle_since: float) -> bool:
+        """Check that an idle connection is still usable."""
+        if conn.closed:
+            return False
+        if conn.info.transaction_status == extensions.TRANSACTION_STATUS_UNKNOWN:
+            return False
+        if time.monotonic() - idle_since < self.health_check_interval:
+            return True
+
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _acquire(self) -> extensions.connection:
+        """Take a connection from the pool, waiting up to ``timeout`` seconds."""
+        start = time.monotonic()
+        deadline = start + self.timeout
+        waited = False
+
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise PoolError("connection pool is closed")
+
+                while not self._idle and self._size >= self.maxconn:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.stats.timeouts += 1
+                        raise PoolError(
+                            f"no connection available after {self.timeout:.1f}s "
+                            f"({self._size}/{self.maxconn} in use)"
+                        )
+                    waited = True
+                    self._cond.wait(remaining)
+
+                if self._idle:
+                    conn, idle_since = self._idle.pop()
+                else:
+                    # Reserve the slot while connecting outside the lock
+                    self._size += 1
+                    conn = None
+
+            if conn is None:
+                try:
+                    conn = psycopg2.connect(**self._connect_kwargs)
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self.stats.created += 1
+            elif not self._is_healthy(conn, idle_since):
+                self._discard(conn)
+                continue
+
+            wait = time.monotonic() - start
+            if waited:
+                get_metrics().observe("db.pool_wait", wait)
+            with self._cond:
+                self.stats.checkouts += 1
+                if waited:
+                    self.stats.waits += 1
+                    self.stats.total_wait += wait
+                    self.stats.max_wait = max(self.stats.max_wait, wait)
+            return conn
+
+    def _release(self, conn: extensions.connection) -> None:
+        """Roll back any open transaction and return the connection to the pool."""
+        if conn.closed or self._closed:
+            self._discard(conn)
+            return
+
+        try:
+            if conn.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+        except Exception:
+            self._discard(conn)
+            return
+
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    @staticmethod
+    @contextmanager
+    def _savepoint(conn: extensions.connection, depth: int) -> Iterator[None]:
+        """Run a nested block under a savepoint, rolling back to it on error."""
+        if conn.autocommit:
+            yield
+            return
+
+        name = f"pool_nested_{depth}"
+        with conn.cursor() as cur:
+            cur.execute(f"SAVEPOINT {name}")
+        ended = getattr(conn, "transactions_ended", None)
+
+        def still_open() -> bool:
+            # The savepoint only exists while its transaction does
+            if conn.closed or conn.info.transaction_status == extensions.TRANSACTION_STATUS_IDLE:
+                return False
+            return ended is None or conn.transactions_ended == ended
+
+        try:
+            yield
+        except BaseException:
+            if still_open():
+                with conn.cursor() as cur:
+                    cur.execute(f"ROLLBACK TO SAVEPOINT {name}")
+            raise
+        if still_open():
+            with conn.cursor() as cur:
+                cur.execute(f"RELEASE SAVEPOINT {name}")
+
+    @contextmanager
+    def connection(self) -> Iterator[extensions.connection]:
+        """
+        Check out a connection for the current thread.
+
+        Nested use on the same thread yields the connection the thread already
+        holds, inside the outer transaction. The nested block is wrapped in a
+        savepoint that is rolled back if it raises, so the outer block can
+        carry on. A commit or rollback inside a nested block ends the shared
+        transaction, outer work included. The connection is only rolled back
+        and returned when the outermost block exits.
+        """
+        local = self._local
+        held = getattr(local, "conn", None)
+        if held is not None and not held.closed:
+            local.depth += 1
+            with self._cond:
+                self.stats.reuses += 1
+            try:
+                with self._savepoint(held, local.depth):
+                    yield held
+            finally:
+                local.depth -= 1
+            return
+
+        conn = self._acquire()
+        local.conn = conn
+        local.depth = 1
+        try:
+            yield conn
+        finally:
+            local.conn = None
+            local.depth = 0
+            self._release(conn)
+
+    def holds_connection(self) -> bool:
+        """Check whether the current thread is inside a ``connection()`` block."""
+        held = getattr(self._local, "conn", None)
+        return held is not None and not held.closed
+
+    def closeall(self) -> None:
+        """Close every idle connection and refuse further checkouts."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn, _ in idle:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get usage counters plus current pool occupancy."""
+        with self._cond:
+            stats = asdict(self.stats)
+            stats.update({
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "maxconn": self.maxconn,
+                "avg_wait": (self.stats.total_wait / self.stats.waits
+                             if self.stats.waits else 0.0),
+            })
+        return stats
+
+def _connect_kwargs_from_env() -> Dict[str, Any]:
+    """Build psycopg2 connection arguments from the environment."""
+    database_url = os.getenv('DATABASE_URL')
+    if database_url:
+        return {"dsn": database_url}
+
+    params = {
+        "dbname": os.getenv('PGDATABASE'),
+        "user": os.getenv('PGUSER'),
+        "password": os.getenv('PGPASSWORD'),
+        "host": os.getenv('PGHOST'),
+        "port": os.getenv('PGPORT'),
+    }
+    return {key: value for key, value in params.items() if value is not None}
+
+# Global pool instance, created on first use
+_POOL: Optional[ConnectionPool] = None
+_POOL_LOCK = threading.Lock()
+
+def _create_pool(minconn: Optional[int] = None, maxconn: Optional[int] = None,
+                 timeout: Optional[float] = None,
+                 health_check_interval: Optional[float] = None) -> ConnectionPool:
+    """Create a pool, filling unspecified settings from the environment."""
+    return ConnectionPool(
+        minconn=minconn if minconn is not None else int(os.getenv('SPACE_DB_POOL_MIN', '1')),
+        maxconn=maxconn if maxconn is not None else int(os.getenv('SPACE_DB_POOL_MAX', '20')),
+        timeout=timeout if timeout is not None else float(os.getenv('SPACE_DB_POOL_TIMEOUT', '30')),
+        health_check_interval=(health_check_interval if health_check_interval is not None
+                               else float(os.getenv('SPACE_DB_POOL_HEALTH_CHECK', '30'))),
+        **_connect_kwargs_from_env()
+    )
+
+def configure_pool(minconn: Optional[int] = None, maxconn: Optional[int] = None,
+                   timeout: Optional[float] = None,
+                   health_check_interval: Optional[float] = None) -> ConnectionPool:
+    """
+    (Re)create the global pool. Unspecified settings fall back to the environment.
+
+    Any existing pool is closed; connections it still has checked out are
+    closed when their holders release them.
+    """
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.closeall()
+        _POOL = _create_pool(minconn, maxconn, timeout, health_check_interval)
+        return _POOL
+
+def get_pool() -> ConnectionPool:
+    """Get or create the global connection pool."""
+    global _POOL
+    pool = _POOL
+    if pool is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = _create_pool()
+            pool = _POOL
+    return pool
+
+@contextmanager
+def get_db_connection() -> Iterator[extensions.connection]:
+    """Get a pooled database connection for the current thread."""
+    with get_pool().connection() as conn:
+        yield conn
+
+def holds_db_connection() -> bool:
+    """Check whether the current thread is inside a ``get_db_connection()`` block."""
+    pool = _POOL
+    return pool is not None and pool.holds_connection()
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Get usage counters for the global pool."""
+    return get_pool().get_stats()
+
+def close_all_connections() -> None:
+    """Close the global pool; the next checkout creates a fresh one."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.closeall()
+            _POOL = None
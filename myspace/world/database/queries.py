@@ -1,27 +1,20 @@
 """
 Database connection and query utilities.
-"""
-import os
-import psycopg2
-from psycopg2.pool import SimpleConnectionPool
-from contextlib import contextmanager
 
-# Initialize connection pool
-_pool = SimpleConnectionPool(
-    1, 20,
-    os.environ.get('DATABASE_URL')
+Connections come from the shared, thread-safe pool in ``world.database.pool``.
+"""
+from world.database.pool import (
+    get_db_connection,
+    get_pool,
+    get_pool_stats,
+    configure_pool,
+    close_all_connections
 )
 
-@contextmanager
-def get_db_connection():
-    """Get a database connection from the pool."""
-    conn = _pool.getconn()
-    try:
-        yield conn
-    finally:
-        _pool.putconn(conn)
-
-def close_all_connections():
-    """Close all database connections in the pool."""
-    if _pool:
-        _pool.closeall()
+__all__ = [
+    'get_db_connection',
+    'get_pool',
+    'get_pool_stats',
+    'configure_pool',
+    'close_all_connections'
+]
@@ -0,0 +1,245 @@
+"""
+Engine metrics and logging.
+
+Metrics live in one registry, ``get_metrics()``. Each metric has a name and
+an optional label, such as a system, callback or query name:
+
+- ``Counter``: a running total
+- ``Gauge``: the latest value of a level, such as queue depth
+- ``Histogram``: the distribution of observations in fixed buckets, with
+  count, sum, min, max and estimated percentiles
+
+Recording is a lock, a bisect and a few additions, so it is cheap enough for
+the hot path. Set ``SPACE_METRICS=0`` to turn recording off.
+
+Engine modules log through ``get_logger(name)`` instead of printing. Logs go
+to stderr under the ``space`` logger at ``SPACE_LOG_LEVEL``. The default,
+``WARNING``, shows errors but no tracing. Use ``DEBUG`` or ``INFO`` to
+trace, or ``OFF`` to silence the engine entirely.
+"""
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from contextlib import contextmanager
+import bisect
+import logging
+import threading
+import time
+import os
+
+# Bucket upper bounds for latencies in seconds: 10us to ~84s, doubling
+LATENCY_BUCKETS: Tuple[float, ...] = tuple(1e-5 * 2 ** i for i in range(24))
+# Bucket upper bounds for sizes such as row counts and queue depths
+SIZE_BUCKETS: Tuple[float, ...] = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500,
+                                   1000, 2000, 5000, 10000, 50000, 100000)
+
+Label = Optional[str]
+
+class Counter:
+    """Running total."""
+
+    def __init__(self, name: str, label: Label = None):
+        self.name = name
+        self.label = label
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def snapshot(self) -> Dict[str, float]:
+        return {"value": self.value}
+
+class Gauge:
+    """Latest value of a level, and the highest seen."""
+
+    def __init__(self, name: str, label: Label = None):
+        self.name = name
+        self.label = label
+        self.value = 0.0
+        self.max = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+        if value > self.max:
+            self.max = value
+
+    def snapshot(self) -> Dict[str, float]:
+        return {"value": self.value, "max": self.max}
+
+class Histogram:
+    """
+    Bucketed distribution of observations.
+
+    Args:
+        name: Metric name
+        label: Optional label
+        buckets: Ascending bucket upper bounds; larger values go in an overflow bucket
+    """
+
+    def __init__(self, name: str, label: Label = None,
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.label = label
+        self.bounds: List[float] = list(buckets)
+        self.counts: List[int] = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+            if value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """
+        Estimate the q-th percentile (0-100).
+
+        Returns the upper bound of the bucket holding it, clamped to the
+        observed min and max.
+        """
+        if not self.count:
+            return 0.0
+        rank = q / 100.0 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                bound = self.bounds[index] if index < len(self.bounds) else self.max
+                return min(max(bound, self.min), self.max)
+        return self.max
+
+    def snapshot(self) -> Dict[str, float]:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.mean,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+        }
+
+Metric = Union[Counter, Gauge, Histogram]
+
+class MetricsRegistry:
+    """
+    Named metrics, created on first use.
+
+    Args:
+        enabled: Whether recording helpers record anything
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics: Dict[Tuple[str, Label], Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, kind, name: str, label: Label, **kwargs) -> Metric:
+        key = (name, label)
+        metric = self._metrics.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(key)
+                if metric is None:
+                    metric = self._metrics[key] = kind(name, label, **kwargs)
+        if not isinstance(metric, kind):
+            raise TypeError(f"Metric {name} is a {type(metric).__name__}, not a {kind.__name__}")
+        return metric
+
+    def counter(self, name: str, label: Label = None) -> Counter:
+        return self._get(Counter, name, label)
+
+    def gauge(self, name: str, label: Label = None) -> Gauge:
+        return self._get(Gauge, name, label)
+
+    def histogram(self, name: str, label: Label = None,
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, label, buckets=buckets)
+
+    def inc(self, name: str, amount: float = 1.0, label: Label = None) -> None:
+        """Add to a counter."""
+        if self.enabled:
+            self.counter(name, label).inc(amount)
+
+    def set(self, name: str, value: float, label: Label = None) -> None:
+        """Set a gauge."""
+        if self.enabled:
+            self.gauge(name, label).set(value)
+
+    def observe(self, name: str, value: float, label: Label = None,
+                buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        """Record an observation in a histogram."""
+        if self.enabled:
+            self.histogram(name, label, buckets).observe(value)
+
+    @contextmanager
+    def timer(self, name: str, label: Label = None) -> Iterator[None]:
+        """Record the duration of a block in a histogram."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, label)
+
+    def snapshot(self, prefix: str = "") -> Dict[str, Dict]:
+        """
+        Get every metric's values, keyed by name and then label.
+
+        Unlabelled metrics use the empty string as their label.
+        """
+        result: Dict[str, Dict] = {}
+        for (name, label), metric in sorted(self._metrics.items(), key=lambda item: (item[0][0], item[0][1] or "")):
+            if name.startswith(prefix):
+                result.setdefault(name, {})[label or ""] = metric.snapshot()
+        return result
+
+    def reset(self) -> None:
+        """Drop every metric."""
+        with self._lock:
+            self._metrics = {}
+
+# Global metrics registry instance
+_METRICS: Optional[MetricsRegistry] = None
+
+def get_metrics() -> MetricsRegistry:
+    """Get or create the global metrics registry"""
+    global _METRICS
+    if _METRICS is None:
+        _METRICS = MetricsRegistry(enabled=os.environ.get("SPACE_METRICS", "1") != "0")
+    return _METRICS
+
+_LOGGING_CONFIGURED = False
+
+def get_logger(name: str) -> logging.Logger:
+    """Get the engine logger for a module, e.g. ``get_logger("sensors")``"""
+    global _LOGGING_CONFIGURED
+    if not _LOGGING_CONFIGURED:
+        root = logging.getLogger("space")
+        level = os.environ.get("SPACE_LOG_LEVEL", "WARNING").upper()
+        if level == "OFF":
+            root.addHandler(logging.NullHandler())
+            root.setLevel(logging.CRITICAL + 1)
+        else:
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+            root.addHandler(handler)
+            root.setLevel(getattr(logging, level, logging.WARNING))
+        root.propagate = False
+        _LOGGING_CONFIGURED = True
+    return logging.getLogger(f"space.{name}")
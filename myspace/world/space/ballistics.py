@@ -0,0 +1,129 @@
+"""
+Weapon hit-chance calculations.
+
+The model only needs shooter/target positions, target velocity and weapon
+tracking speed, so it runs in-process instead of round-tripping to PostGIS.
+``calculate_hit_chance`` scores one shot; ``calculate_hit_chances`` scores many
+shooter/target pairs in a single NumPy pass for the combat tick.
+"""
+from typing import Optional, Sequence, Tuple, Union
+import numpy as np
+import math
+
+# Hit-chance model tuning
+CLOSE_RANGE: float = 10.0  # Targets this close get the flat close-range chance
+CLOSE_RANGE_CHANCE: float = 0.95
+MAX_HIT_CHANCE: float = 0.95
+MIN_TRACKING_PENALTY: float = 0.1  # Minimum fraction lost to target tracking
+MAX_VELOCITY_PENALTY: float = 0.3  # Cap on fraction lost to target speed
+VELOCITY_SCALE: float = 100.0  # Target speed at which the velocity penalty caps out
+DISTANCE_SCALE: float = 150.0  # Range over which the distance factor falls below 1
+MIN_DISTANCE: float = 10.0
+
+Vector3 = Tuple[float, float, float]
+ArrayLike3 = Union[np.ndarray, Sequence[Sequence[float]]]
+
+def calculate_hit_chance(
+    shooter_pos: Vector3,
+    target_pos: Vector3,
+    weapon_tracking_speed: float,
+    target_velocity: Optional[Vector3] = None
+) -> float:
+    """
+    Calculate probability of hitting a single target based on its movement.
+
+    Args:
+        shooter_pos: Shooter (x, y, z) position
+        target_pos: Target (x, y, z) position
+        weapon_tracking_speed: Maximum angular rate the weapon can follow, in degrees
+        target_velocity: Target (vx, vy, vz) per tick, or None if stationary
+
+    Returns:
+        Hit chance between 0.0 and MAX_HIT_CHANCE
+    """
+    vx, vy, vz = target_velocity if target_velocity else (0.0, 0.0, 0.0)
+    dx = target_pos[0] - shooter_pos[0]
+    dy = target_pos[1] - shooter_pos[1]
+    dz = target_pos[2] - shooter_pos[2]
+
+    distance = math.sqrt(dx * dx + dy * dy + dz * dz)
+
+    # Very close range bonus
+    if distance <= CLOSE_RANGE:
+        return CLOSE_RANGE_CHANCE
+
+    velocity_magnitude = math.sqrt(vx * vx + vy * vy + vz * vz)
+
+    # Bearing change (X-Y plane) over one tick of target movement
+    current_angle = math.degrees(math.atan2(dy, dx))
+    future_angle = math.degrees(math.atan2(dy + vy, dx + vx))
+    angular_velocity = abs(future_angle - current_angle)
+    if angular_velocity > 180:
+        angular_velocity = 360 - angular_velocity
+
+    if angular_velocity > weapon_tracking_speed:
+        return 0.0
+
+    tracking_ratio = angular_velocity / weapon_tracking_speed if weapon_tracking_speed > 0 else 0.0
+    tracking_penalty = 1.0 - max(MIN_TRACKING_PENALTY, tracking_ratio)
+    velocity_penalty = 1.0 - min(MAX_VELOCITY_PENALTY, velocity_magnitude / VELOCITY_SCALE)
+    distance_penalty = min(MAX_HIT_CHANCE, DISTANCE_SCALE / max(MIN_DISTANCE, distance))
+
+    return max(0.0, min(MAX_HIT_CHANCE, tracking_penalty * velocity_penalty * distance_penalty))
+
+def calculate_hit_chances(
+    shooters: ArrayLike3,
+    targets: ArrayLike3,
+    velocities: Optional[ArrayLike3] = None,
+    tracking_speeds: Union[float, Sequence[float], np.ndarray] = 90.0
+) -> np.ndarray:
+    """
+    Calculate hit chances for many shooter/target pairs at once.
+
+    Row ``i`` of each array describes one shot. Produces the same values as
+    ``calculate_hit_chance`` applied pair by pair.
+
+    Args:
+        shooters: (N, 3) shooter positions
+        targets: (N, 3) target positions
+        velocities: (N, 3) target velocities, or None if all targets are stationary
+        tracking_speeds: (N,) weapon tracking speeds in degrees, or one shared value
+
+    Returns:
+        (N,) array of hit chances
+    """
+    shooters = np.asarray(shooters, dtype=np.float64).reshape(-1, 3)
+    targets = np.asarray(targets, dtype=np.float64).reshape(-1, 3)
+    if shooters.shape != targets.shape:
+        raise ValueError("Shooter and target arrays must have the same shape")
+
+    if velocities is None:
+        velocities = np.zeros_like(targets)
+    else:
+        velocities = np.asarray(velocities, dtype=np.float64).reshape(-1, 3)
+        if velocities.shape != targets.shape:
+            raise ValueError("Velocity array must match the target array shape")
+
+    tracking = np.broadcast_to(
+        np.asarray(tracking_speeds, dtype=np.float64), (targets.shape[0],)
+    )
+
+    delta = targets - shooters
+    distance = np.sqrt(np.einsum('ij,ij->i', delta, delta))
+    velocity_magnitude = np.sqrt(np.einsum('ij,ij->i', velocities, velocities))
+
+    current_angle = np.degrees(np.arctan2(delta[:, 1], delta[:, 0]))
+    future_angle = np.degrees(np.arctan2(delta[:, 1] + velocities[:, 1],
+                                         delta[:, 0] + velocities[:, 0]))
+    angular_velocity = np.abs(future_angle - current_angle)
+    angular_velocity = np.where(angular_velocity > 180, 360 - angular_velocity, angular_velocity)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tracking_ratio = np.where(tracking > 0, angular_velocity / tracking, 0.0)
+    tracking_penalty = 1.0 - np.maximum(MIN_TRACKING_PENALTY, tracking_ratio)
+    velocity_penalty = 1.0 - np.minimum(MAX_VELOCITY_PENALTY, velocity_magnitude / VELOCITY_SCALE)
+    distance_penalty = np.minimum(MAX_HIT_CHANCE, DISTANCE_SCALE / np.maximum(MIN_DISTANCE, distance))
+
+    chances = np.clip(tracking_penalty * velocity_penalty * distance_penalty, 0.0, MAX_HIT_CHANCE)
+    chances = np.where(angular_velocity > tracking, 0.0, chances)
+    return np.where(distance <= CLOSE_RANGE, CLOSE_RANGE_CHANCE, chances)
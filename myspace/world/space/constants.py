@@ -49,4 +49,7 @@ SENSOR_RANGES: Dict[DetectionLevel, float] = {
 
 # Movement Constants
 MAX_WARP: Final = 9.99
-MAX_IMPULSE: Final = 1.0
\ No newline at end of file
+MAX_IMPULSE: Final = 1.0
+
+# Power Constants
+MAX_POWER_OUTPUT: Final = 500.0  # Highest main reactor rating in GW
\ No newline at end of file
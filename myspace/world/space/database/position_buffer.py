@@ -0,0 +1,194 @@
+"""
+Write-behind buffer for space object positions.
+
+Moves are staged in memory and written to ``space_objects`` in a single
+``UPDATE ... FROM (VALUES ...)`` per flush. Repeated moves of the same object
+between flushes collapse into one row, so a tick with hundreds of moving ships
+costs one statement and one commit instead of one per move.
+
+Settings are read from the environment:
+
+- ``SPACE_POSITION_FLUSH_INTERVAL``: seconds between scheduled flushes (default 0.1)
+- ``SPACE_POSITION_MAX_AGE``: durability bound; the longest a staged move may
+  stay unpersisted before staging forces a flush (default 1.0)
+- ``SPACE_POSITION_MAX_PENDING``: staged objects that force a flush (default 5000)
+
+Code that reads positions back from PostGIS should call ``flush()`` first,
+outside any ``get_db_connection()`` block: a flush commits, so inside a block
+it would commit the caller's transaction too, and it is deferred instead.
+"""
+from typing import Dict, Optional, Tuple, Any
+from psycopg2.extras import execute_values
+from world.database.pool import get_db_connection, holds_db_connection
+from world.metrics import get_logger
+import threading
+import time
+import os
+
+Vector3 = Tuple[float, float, float]
+
+logger = get_logger("positions")
+
+class PositionWriteBuffer:
+    """
+    Collects dirty positions and persists them in bulk.
+
+    Args:
+        flush_interval: Seconds between flushes when driven by ``maybe_flush``
+        max_age: Longest time in seconds a staged move may remain unwritten
+        max_pending: Number of staged objects that forces an immediate flush
+    """
+
+    def __init__(self, flush_interval: float = 0.1, max_age: float = 1.0,
+                 max_pending: int = 5000):
+        if flush_interval <= 0 or max_age <= 0 or max_pending < 1:
+            raise ValueError("Flush interval, max age and max pending must be positive")
+        self.flush_interval = flush_interval
+        self.max_age = max_age
+        self.max_pending = max_pending
+
+        # obj_id -> (x, y, z, sector_id or None)
+        self._pending: Dict[int, Tuple[float, float, float, Optional[int]]] = {}
+        self._oldest: Optional[float] = None  # When the oldest pending move was staged
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+        self.stats: Dict[str, Any] = {
+            "staged": 0,
+            "collapsed": 0,  # Moves overwritten before being flushed
+            "flushes": 0,
+            "rows_flushed": 0,
+            "errors": 0,
+            "deferred": 0,  # Flushes skipped inside a caller's connection block
+            "last_flush_duration": 0.0,
+        }
+
+    def stage(self, obj_id: int, position: Vector3, sector_id: Optional[int] = None) -> None:
+        """
+        Record a new position for an object.
+
+        Args:
+            obj_id: Space object ID
+            position: (x, y, z) position
+            sector_id: New sector ID, or None to leave the stored sector alone
+                (including one staged earlier and not yet flushed)
+        """
+        now = time.monotonic()
+        with self._lock:
+            previous = self._pending.get(obj_id)
+            if previous is not None:
+                self.stats["collapsed"] += 1
+                if sector_id is None:
+                    sector_id = previous[3]
+            elif self._oldest is None:
+                self._oldest = now
+            self._pending[obj_id] = (float(position[0]), float(position[1]),
+                                     float(position[2]), sector_id)
+            self.stats["staged"] += 1
+            # Forced flushes are still spaced by the flush interval so a
+            # failing database is not retried on every move
+            overdue = ((len(self._pending) >= self.max_pending
+                        or now - self._oldest >= self.max_age)
+                       and now - self._last_flush >= self.flush_interval)
+
+        if overdue:
+            self.flush()
+
+    def discard(self, obj_id: int) -> None:
+        """Drop any staged move for an object (e.g. when it is deleted)."""
+        with self._lock:
+            self._pending.pop(obj_id, None)
+            if not self._pending:
+                self._oldest = None
+
+    def pending_count(self) -> int:
+        """Get number of objects with unflushed positions."""
+        return len(self._pending)
+
+    def maybe_flush(self) -> int:
+        """Flush if the flush interval has elapsed. Returns rows written."""
+        if time.monotonic() - self._last_flush < self.flush_interval:
+            return 0
+        return self.flush()
+
+    def flush(self) -> int:
+        """
+        Write every staged position in one statement.
+
+        On failure the batch is put back (without overwriting newer moves)
+        so it is retried on the next flush. Inside a ``get_db_connection()``
+        block nothing is written, since the commit would also commit the
+        caller's transaction; the moves stay staged for a later flush.
+
+        Returns:
+            Number of rows written
+        """
+        if holds_db_connection():
+            with self._lock:
+                self.stats["deferred"] += 1
+            return 0
+
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                oldest, self._oldest = self._oldest, None
+                self._last_flush = time.monotonic()
+
+            if not batch:
+                return 0
+
+            rows = [(obj_id, x, y, z, sector_id)
+                    for obj_id, (x, y, z, sector_id) in batch.items()]
+            start = time.perf_counter()
+            try:
+                with get_db_connection() as conn:
+                    with conn.cursor() as cur:
+                        execute_values(cur, """
+                            UPDATE space_objects AS o
+                            SET
+                                position = ST_SetSRID(ST_MakePoint(v.x, v.y, v.z), 3857),
+                                sector_id = COALESCE(v.sector_id, o.sector_id),
+                                orientation = COALESCE(
+                                    o.orientation,
+                                    ST_SetSRID(ST_MakePoint(1, 0, 0), 3857)
+                                )
+                            FROM (VALUES %s) AS v(id, x, y, z, sector_id)
+                            WHERE o.id = v.id
+                        """, rows,
+                            template="(%s, %s::float8, %s::float8, %s::float8, %s::integer)",
+                            page_size=len(rows))
+                    conn.commit()
+            except Exception as e:
+                logger.error("Error flushing %d positions: %s", len(rows), e)
+                with self._lock:
+                    self.stats["errors"] += 1
+                    for obj_id, staged in batch.items():
+                        self._pending.setdefault(obj_id, staged)
+                    staged_times = [t for t in (self._oldest, oldest) if t is not None]
+                    self._oldest = min(staged_times) if staged_times else time.monotonic()
+                return 0
+
+            with self._lock:
+                self.stats["flushes"] += 1
+                self.stats["rows_flushed"] += len(rows)
+                self.stats["last_flush_duration"] = time.perf_counter() - start
+            return len(rows)
+
+# Global position buffer instance
+_POSITION_BUFFER: Optional[PositionWriteBuffer] = None
+
+def get_position_buffer() -> PositionWriteBuffer:
+    """Get or create the global position write buffer."""
+    global _POSITION_BUFFER
+    if _POSITION_BUFFER is None:
+        _POSITION_BUFFER = PositionWriteBuffer(
+            flush_interval=float(os.getenv('SPACE_POSITION_FLUSH_INTERVAL', '0.1')),
+            max_age=float(os.getenv('SPACE_POSITION_MAX_AGE', '1.0')),
+            max_pending=int(os.getenv('SPACE_POSITION_MAX_PENDING', '5000'))
+        )
+    return _POSITION_BUFFER
+
+def flush_positions() -> int:
+    """Flush the global position buffer. Returns rows written."""
+    return get_position_buffer().flush()
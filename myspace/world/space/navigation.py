@@ -0,0 +1,285 @@
+"""
+Obstacle-aware route planning for autopilot.
+
+Routes are planned in-process with A* over a lattice laid out between the
+start and end points. Obstacles are inflated by the avoidance radius, the
+raw lattice route is smoothed by line-of-sight string pulling, and results
+are cached per start/end sector and static-obstacle epoch so ships asking
+for similar routes between the same sectors share one search. The epoch only
+changes when a planet or station is added, moved or removed. Moving ships
+are handled by re-checking cached routes against the current obstacles,
+ships included, before reuse.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+from collections import OrderedDict
+from world.database.queries import get_db_connection
+from world.space.spatial_index import SpatialIndex, get_spatial_index
+from world.space.database.position_buffer import flush_positions
+import threading
+import heapq
+import math
+
+Vector3 = Tuple[float, float, float]
+
+# Object types that never block a route
+PASSABLE_TYPES: Tuple[str, ...] = ("waypoint",)
+
+def _point_segment_distance(point: Vector3, a: Vector3, b: Vector3) -> float:
+    """Shortest distance from a point to the segment a-b."""
+    abx, aby, abz = b[0] - a[0], b[1] - a[1], b[2] - a[2]
+    apx, apy, apz = point[0] - a[0], point[1] - a[1], point[2] - a[2]
+    length_sq = abx * abx + aby * aby + abz * abz
+    t = 0.0 if length_sq == 0 else max(0.0, min(1.0, (apx * abx + apy * aby + apz * abz) / length_sq))
+    dx = apx - t * abx
+    dy = apy - t * aby
+    dz = apz - t * abz
+    return math.sqrt(dx * dx + dy * dy + dz * dz)
+
+class ObstacleField:
+    """
+    Obstacles inflated by a clearance radius, with a local grid for lookups.
+
+    Obstacles whose inflated sphere already contains the start or end point
+    (the ship itself, or the body it is flying to) are ignored, since no
+    route could avoid them.
+    """
+
+    def __init__(self, obstacles: Sequence[Vector3], clearance: float,
+                 start: Vector3, end: Vector3):
+        self.clearance = clearance
+        self._grid = SpatialIndex(cell_size=max(clearance * 2.0, 1e-6))
+        for i, pos in enumerate(obstacles):
+            if math.dist(pos, start) <= clearance or math.dist(pos, end) <= clearance:
+                continue
+            self._grid.update(i, pos)
+
+    def __len__(self) -> int:
+        return len(self._grid)
+
+    def point_clear(self, point: Vector3) -> bool:
+        """Check that a point is outside every inflated obstacle."""
+        return not self._grid.query_radius(point, self.clearance)
+
+    def segment_clear(self, a: Vector3, b: Vector3) -> bool:
+        """Check that the segment a-b stays outside every inflated obstacle."""
+        if not len(self._grid):
+            return True
+        mid = ((a[0] + b[0]) / 2, (a[1] + b[1]) / 2, (a[2] + b[2]) / 2)
+        reach = math.dist(a, b) / 2 + self.clearance
+        for _, entry in self._grid.query_radius(mid, reach):
+            if _point_segment_distance(entry.position, a, b) <= self.clearance:
+                return False
+        return True
+
+class PathPlanner:
+    """
+    A* route planner with line-of-sight smoothing and a route cache.
+
+    Args:
+        max_expansions: Lattice nodes expanded before giving up on a search
+        cache_size: Number of routes kept in the LRU route cache
+    """
+
+    def __init__(self, max_expansions: int = 20000, cache_size: int = 1024):
+        self.max_expansions = max_expansions
+        self.cache_size = cache_size
+        # (start sector, end sector, clearance, epoch) -> (start, end, interior waypoints)
+        self._cache: "OrderedDict[Tuple, Tuple[Vector3, Vector3, List[Vector3]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"searches": 0, "cache_hits": 0, "direct": 0, "failed": 0}
+
+    def find_path(self, start_pos: Vector3, end_pos: Vector3, avoid_radius: float = 25.0,
+                  max_segments: int = 10,
+                  obstacles: Optional[Sequence[Vector3]] = None) -> List[Vector3]:
+        """
+        Plan a route from start to end that keeps ``avoid_radius`` from obstacles.
+
+        Args:
+            start_pos: Route start
+            end_pos: Route end
+            avoid_radius: Clearance kept from every obstacle
+            max_segments: Lattice resolution, in cells per route segment of the
+                straight line (the route itself is smoothed to as few legs as possible)
+            obstacles: Obstacle positions; loaded from the spatial index (or
+                PostGIS when the index is not loaded) when omitted
+
+        Returns:
+            Waypoints beginning with start_pos and ending with end_pos. Falls
+            back to the direct line when no route is found.
+        """
+        index = get_spatial_index()
+        epoch = None
+        if obstacles is None:
+            obstacles, epoch = self._load_obstacles(start_pos, end_pos, avoid_radius)
+
+        field = ObstacleField(obstacles, avoid_radius, start_pos, end_pos)
+        if field.segment_clear(start_pos, end_pos):
+            self.stats["direct"] += 1
+            return [start_pos, end_pos]
+
+        cache_key = None
+        if epoch is not None:
+            # Index cells use the same floor division as sectors
+            cache_key = (
+                index.cell_for(*start_pos),
+                index.cell_for(*end_pos),
+                float(avoid_radius),
+                epoch
+            )
+            with self._lock:
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    self._cache.move_to_end(cache_key)
+            if cached is not None:
+                cached_start, cached_end, interior = cached
+                # Only splice onto routes planned from nearby endpoints, and
+                # only if every leg is still clear
+                reuse_range = self._margin(start_pos, end_pos, avoid_radius)
+                if (math.dist(start_pos, cached_start) <= reuse_range
+                        and math.dist(end_pos, cached_end) <= reuse_range):
+                    route = [start_pos, *interior, end_pos]
+                    if all(field.segment_clear(a, b) for a, b in zip(route, route[1:])):
+                        self.stats["cache_hits"] += 1
+                        return route
+
+        self.stats["searches"] += 1
+        lattice_route = self._search(start_pos, end_pos, field, max(1, max_segments))
+        if lattice_route is None:
+            self.stats["failed"] += 1
+            return [start_pos, end_pos]
+
+        route = self._smooth(lattice_route, field)
+        if cache_key is not None:
+            with self._lock:
+                self._cache[cache_key] = (start_pos, end_pos, route[1:-1])
+                self._cache.move_to_end(cache_key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return route
+
+    def clear_cache(self) -> None:
+        """Drop every cached route."""
+        with self._lock:
+            self._cache.clear()
+
+    def _load_obstacles(self, start: Vector3, end: Vector3,
+                        avoid_radius: float) -> Tuple[List[Vector3], Optional[int]]:
+        """
+        Collect obstacles around the route corridor.
+
+        Returns:
+            (obstacle positions, static-obstacle epoch or None when read from PostGIS)
+        """
+        mid = ((start[0] + end[0]) / 2, (start[1] + end[1]) / 2, (start[2] + end[2]) / 2)
+        reach = math.dist(start, end) / 2 + self._margin(start, end, avoid_radius) * 2 + avoid_radius
+
+        index = get_spatial_index()
+        if index.loaded:
+            epoch = index.static_epoch
+            positions = [
+                entry.position
+                for _, entry in index.query_radius(mid, reach)
+                if entry.object_type not in PASSABLE_TYPES
+            ]
+            return positions, epoch
+
+        flush_positions()
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT ST_X(position), ST_Y(position), ST_Z(position)
+                    FROM space_objects
+                    WHERE object_type != ALL(%s)
+                    AND ST_3DDWithin(
+                        position,
+                        ST_SetSRID(ST_MakePoint(%s, %s, %s), 3857),
+                        %s
+                    )
+                """, (list(PASSABLE_TYPES), *mid, reach))
+                return [(float(x), float(y), float(z or 0.0)) for x, y, z in cur.fetchall()], None
+
+    @staticmethod
+    def _margin(start: Vector3, end: Vector3, avoid_radius: float) -> float:
+        """How far the search box extends beyond the start-end bounding box."""
+        return max(4.0 * avoid_radius, 0.25 * math.dist(start, end))
+
+    def _search(self, start: Vector3, end: Vector3, field: ObstacleField,
+                max_segments: int) -> Optional[List[Vector3]]:
+        """A* over a 26-connected lattice anchored at the start point."""
+        length = math.dist(start, end)
+        step = max(field.clearance / 2.0, length / (max_segments * 4))
+        margin = self._margin(start, end, field.clearance)
+
+        lo = [min(start[i], end[i]) - margin for i in range(3)]
+        hi = [max(start[i], end[i]) + margin for i in range(3)]
+        bounds = [(math.floor((lo[i] - start[i]) / step), math.ceil((hi[i] - start[i]) / step))
+                  for i in range(3)]
+
+        def position(node: Tuple[int, int, int]) -> Vector3:
+            return (start[0] + node[0] * step, start[1] + node[1] * step, start[2] + node[2] * step)
+
+        offsets = [(dx, dy, dz)
+                   for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+                   if dx or dy or dz]
+
+        origin = (0, 0, 0)
+        came_from: Dict[Tuple[int, int, int], Tuple[int, int, int]] = {}
+        cost: Dict[Tuple[int, int, int], float] = {origin: 0.0}
+        frontier = [(length, 0.0, origin)]
+        closed = set()
+        expansions = 0
+
+        while frontier and expansions < self.max_expansions:
+            _, g, node = heapq.heappop(frontier)
+            if node in closed:
+                continue
+            closed.add(node)
+            expansions += 1
+
+            here = start if node == origin else position(node)
+            if field.segment_clear(here, end):
+                route = [end]
+                while node != origin:
+                    route.append(position(node))
+                    node = came_from[node]
+                route.append(start)
+                route.reverse()
+                return route
+
+            for dx, dy, dz in offsets:
+                nxt = (node[0] + dx, node[1] + dy, node[2] + dz)
+                if nxt in closed or not all(bounds[i][0] <= nxt[i] <= bounds[i][1] for i in range(3)):
+                    continue
+                there = position(nxt)
+                if not field.point_clear(there) or not field.segment_clear(here, there):
+                    continue
+                new_cost = g + step * math.sqrt(dx * dx + dy * dy + dz * dz)
+                if new_cost < cost.get(nxt, math.inf):
+                    cost[nxt] = new_cost
+                    came_from[nxt] = node
+                    heapq.heappush(frontier, (new_cost + math.dist(there, end), new_cost, nxt))
+
+        return None
+
+    @staticmethod
+    def _smooth(route: List[Vector3], field: ObstacleField) -> List[Vector3]:
+        """Drop waypoints that can be skipped with a clear line of sight."""
+        smoothed = [route[0]]
+        i = 0
+        while i < len(route) - 1:
+            j = len(route) - 1
+            while j > i + 1 and not field.segment_clear(route[i], route[j]):
+                j -= 1
+            smoothed.append(route[j])
+            i = j
+        return smoothed
+
+# Global path planner instance
+_PATH_PLANNER: Optional[PathPlanner] = None
+
+def get_path_planner() -> PathPlanner:
+    """Get or create the global path planner."""
+    global _PATH_PLANNER
+    if _PATH_PLANNER is None:
+        _PATH_PLANNER = PathPlanner()
+    return _PATH_PLANNER
@@ -0,0 +1,245 @@
+"""
+Sector activation.
+
+Most of the galaxy is empty or idle, so engine systems only tick objects in
+active sectors. A sector wakes when one of these is inside it, or within
+wake range of it:
+
+- a ship with players aboard
+- a combat
+- a moving object
+
+It falls asleep again once nothing has happened near it for the idle timeout.
+
+Reporting activity is cheap enough for the movement path. ``note`` only
+records the sector a thing happened in. The ``update`` stage then wakes the
+sectors around each recorded one, once per interval, and drops sectors that
+have gone idle. Systems filter their objects with ``select``.
+
+Sectors use the same 10pc grid as ``SectorManager``, keyed on (sector_x,
+sector_y) grid coordinates, so no database access is needed.
+"""
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from world.clock import now
+from world.constants import PARSEC_TO_SU, SECTOR_SIZE_SU
+from world.metrics import get_logger, get_metrics
+import threading
+import math
+import os
+
+logger = get_logger("sectors")
+
+SectorCell = Tuple[int, int]
+
+WAKE_RANGE_PC = 100.0  # Short range sensor reach
+
+def _position(obj: Any) -> Optional[Tuple[float, float, float]]:
+    """Get a space object's position in SU, or None if it has no coordinates."""
+    coords = getattr(obj.db, "coords", None)
+    if coords is None:
+        return None
+    return (coords["x"], coords["y"], coords["z"])
+
+def space_object_for(location: Any, max_depth: int = 8) -> Optional[Any]:
+    """
+    Get the space object a room belongs to.
+
+    That is the location itself if it has coordinates, or else the first
+    object with coordinates found through each room's ``db.space_object``
+    link or its containing location.
+
+    Returns:
+        The space object, or None if the room is not inside one
+    """
+    for _ in range(max_depth):
+        if location is None or not hasattr(location, "db"):
+            return None
+        if _position(location) is not None:
+            return location
+        location = getattr(location.db, "space_object", None) or getattr(location, "location", None)
+    return None
+
+def update_crew(character: Any) -> Optional[Any]:
+    """
+    Count a character as crew of the ship whose bridge it is on, if a player
+    controls it, and stop counting it anywhere else.
+
+    Safe to call from any hook: the ship counted is remembered in
+    ``ndb.crewing``, so repeated calls board or leave at most once.
+
+    Returns:
+        The ship the character now crews, or None
+    """
+    location = getattr(character, "location", None)
+    ship = None
+    if (getattr(character, "has_account", False) and location is not None
+            and getattr(getattr(location, "db", None), "is_bridge", False)):
+        ship = space_object_for(location)
+
+    current = getattr(character.ndb, "crewing", None)
+    if current is not ship:
+        activity = get_sector_activity()
+        if current is not None:
+            activity.leave(current)
+        if ship is not None:
+            activity.board(ship)
+        character.ndb.crewing = ship
+    return ship
+
+class SectorActivity:
+    """
+    Tracks which sectors have something happening.
+
+    Args:
+        idle_timeout: Seconds without activity before a sector sleeps
+        wake_range_pc: Distance around activity within which sectors wake
+        enabled: When False every sector counts as active
+    """
+
+    def __init__(self, idle_timeout: float = 60.0, wake_range_pc: float = WAKE_RANGE_PC,
+                 enabled: bool = True):
+        if idle_timeout <= 0:
+            raise ValueError("Idle timeout must be positive")
+        if wake_range_pc < 0:
+            raise ValueError("Wake range must not be negative")
+        self.idle_timeout = idle_timeout
+        self.wake_range = math.ceil(wake_range_pc * PARSEC_TO_SU / SECTOR_SIZE_SU)  # In sectors
+        self.enabled = enabled
+        self._awake: Dict[SectorCell, float] = {}  # Sector -> time it falls asleep
+        self._sources: Dict[SectorCell, float] = {}  # Sectors with activity since the last update
+        self._crewed: Dict[int, List[Any]] = {}  # Object ID -> [object, players aboard]
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def cell_for(position: Tuple[float, float, float]) -> SectorCell:
+        """Get the sector grid coordinates of a position in SU."""
+        return (math.floor(position[0] / SECTOR_SIZE_SU), math.floor(position[1] / SECTOR_SIZE_SU))
+
+    def note(self, position: Tuple[float, float, float]) -> None:
+        """Record activity at a position in SU; nearby sectors wake at the next update."""
+        cell = self.cell_for(position)
+        with self._lock:
+            self._sources[cell] = now()
+
+    def note_object(self, obj: Any) -> None:
+        """Record activity at a space object's position, if it has one."""
+        position = _position(obj)
+        if position is not None:
+            self.note(position)
+
+    def board(self, obj: Any) -> None:
+        """Record a player boarding a space object, keeping its surroundings awake."""
+        with self._lock:
+            entry = self._crewed.setdefault(obj.id, [obj, 0])
+            entry[1] += 1
+        self.note_object(obj)
+
+    def leave(self, obj: Any) -> None:
+        """Record a player leaving a space object."""
+        with self._lock:
+            entry = self._crewed.get(obj.id)
+            if entry is not None:
+                entry[1] -= 1
+                if entry[1] <= 0:
+                    del self._crewed[obj.id]
+
+    def is_crewed(self, obj: Any) -> bool:
+        """Check whether players are aboard a space object."""
+        return obj.id in self._crewed
+
+    def update(self) -> int:
+        """
+        Wake sectors around recorded activity and crewed objects, and put idle ones to sleep.
+
+        Returns:
+            Number of active sectors
+        """
+        with self._lock:
+            sources, self._sources = self._sources, {}
+            crewed = [obj for obj, _ in self._crewed.values()]
+
+        t = now()
+        for obj in crewed:
+            position = _position(obj)
+            if position is not None:
+                sources[self.cell_for(position)] = t
+
+        reach = self.wake_range
+        awake = self._awake
+        woken = 0
+        for (sx, sy), seen in sources.items():
+            until = seen + self.idle_timeout
+            for x in range(sx - reach, sx + reach + 1):
+                for y in range(sy - reach, sy + reach + 1):
+                    if awake.get((x, y), 0.0) < until:
+                        if (x, y) not in awake:
+                            woken += 1
+                        awake[(x, y)] = until
+
+        asleep = [cell for cell, until in awake.items() if until <= t]
+        for cell in asleep:
+            del awake[cell]
+
+        metrics = get_metrics()
+        metrics.set("sectors.active", len(awake))
+        if woken or asleep:
+            logger.debug("Sectors woken %d, asleep %d, active %d", woken, len(asleep), len(awake))
+        return len(awake)
+
+    def is_active(self, position: Tuple[float, float, float]) -> bool:
+        """Check whether the sector containing a position in SU is awake."""
+        if not self.enabled:
+            return True
+        return self._awake.get(self.cell_for(position), 0.0) > now()
+
+    def active_cells(self) -> List[SectorCell]:
+        """Get the grid coordinates of every awake sector."""
+        t = now()
+        return [cell for cell, until in self._awake.items() if until > t]
+
+    def select(self, managers: Iterable[Any]) -> Iterator[Any]:
+        """
+        Filter system managers to those whose object is in an active sector.
+
+        Args:
+            managers: Managers with an ``obj`` space object, such as the
+                power or sensor registries
+
+        Yields:
+            Managers in active sectors
+        """
+        if not self.enabled:
+            yield from managers
+            return
+        awake = self._awake
+        t = now()
+        size = SECTOR_SIZE_SU
+        for mgr in managers:
+            coords = mgr.obj.db.coords
+            if awake.get((math.floor(coords["x"] / size), math.floor(coords["y"] / size)), 0.0) > t:
+                yield mgr
+
+    def clear(self) -> None:
+        """Put every sector to sleep and forget recorded activity and crews."""
+        with self._lock:
+            self._awake.clear()
+            self._sources.clear()
+            self._crewed.clear()
+
+# Global sector activity tracker
+_SECTOR_ACTIVITY: Optional[SectorActivity] = None
+
+def get_sector_activity() -> SectorActivity:
+    """Get or create the global sector activity tracker."""
+    global _SECTOR_ACTIVITY
+    if _SECTOR_ACTIVITY is None:
+        _SECTOR_ACTIVITY = SectorActivity(
+            idle_timeout=float(os.getenv('SPACE_SECTOR_IDLE_TIMEOUT', '60')),
+            wake_range_pc=float(os.getenv('SPACE_SECTOR_WAKE_RANGE', str(WAKE_RANGE_PC))),
+            enabled=os.getenv('SPACE_SECTOR_ACTIVITY', '1') != '0'
+        )
+    return _SECTOR_ACTIVITY
+
+def update_sector_activity() -> int:
+    """Master loop stage updating the global sector activity tracker."""
+    return get_sector_activity().update()
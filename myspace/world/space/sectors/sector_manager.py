@@ -8,10 +8,53 @@ The sector system divides space into 10pc×10pc squares on the X-Y plane:
 - Delta Quadrant: +X, -Y
 
 Each sector extends infinitely along the Z axis, maintaining a 2D grid structure.
+
+The sector for a position is pure floor-division math. Sector IDs are kept
+in a bounded LRU cache keyed on grid coordinates, so assigning a sector on
+the movement path is a dictionary lookup. Misses create or fetch rows in
+bulk with ``INSERT ... ON CONFLICT (name) DO NOTHING``, which is safe when
+several processes reach a new sector at once.
+
+Neighbouring sectors are found by grid arithmetic too. ``ring_cells`` walks
+the square ring of sectors at a given distance, and the manager's ring and
+spiral iterators move outwards from a position lazily.
 """
-from typing import Dict, List, Optional, Tuple, Set
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Set
+from collections import OrderedDict
+from psycopg2.extras import execute_values
 from world.database.queries import get_db_connection
+from world.space.database.position_buffer import get_position_buffer
+from world.metrics import get_logger, get_metrics
+import threading
 import math
+import os
+
+logger = get_logger("sectors")
+
+SectorCell = Tuple[int, int]
+
+def ring_cells(center: SectorCell, radius: int) -> Iterator[SectorCell]:
+    """Yield the sectors at exactly Chebyshev distance radius from center.
+
+    The ring is walked anticlockwise from its bottom-left corner, giving
+    ``8 * radius`` sectors (or center itself for radius 0).
+
+    Args:
+        center: (sector_x, sector_y) grid coordinates
+        radius: Ring distance in sectors
+    """
+    cx, cy = center
+    if radius == 0:
+        yield center
+        return
+    for dx in range(-radius, radius):
+        yield (cx + dx, cy - radius)
+    for dy in range(-radius, radius):
+        yield (cx + radius, cy + dy)
+    for dx in range(radius, -radius, -1):
+        yield (cx + dx, cy + radius)
+    for dy in range(radius, -radius, -1):
+        yield (cx - radius, cy + dy)
 
 class SectorManager:
     """
@@ -22,6 +65,10 @@ class SectorManager:
     - Sector naming in Q-X.Y format 
     - Infinite Z-axis for object positioning
     - PostGIS spatial indexing and queries
+    - LRU cache of sector IDs by grid coordinates
+
+    Args:
+        cache_size: Number of sector IDs kept in the cache
 
     Examples:
         >>> manager = SectorManager()
@@ -33,11 +80,18 @@ class SectorManager:
         >>> assert angela_sector == "G-612.612"
     """
 
-    def __init__(self):
+    def __init__(self, cache_size: int = 65536):
         """Initialize sector manager with default settings."""
+        if cache_size < 1:
+            raise ValueError("Cache size must be positive")
         self.active_sectors: Set[int] = set()
         self.parsec_size = 10.0  # Size of sector in parsecs
         self.max_cochrane_z = 500.0  # Max Z distance for Cochrane field
+        self.cache_size = cache_size
+        # (sector_x, sector_y) -> sector ID, least recently used first
+        self._sector_ids: "OrderedDict[SectorCell, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "created": 0}
 
     def get_sector_name(self, sector_x: int, sector_y: int) -> str:
         """Generate sector name in format Q-X.Y where Q is the quadrant.
@@ -99,6 +153,8 @@ class SectorManager:
     def get_sector_for_position(self, position: Tuple[float, float, float]) -> Optional[int]:
         """Get sector containing the given coordinates (based on X,Y only).
 
+        Cached sectors are resolved without touching the database.
+
         Args:
             position: (x, y, z) coordinates in parsecs
 
@@ -111,94 +167,231 @@ class SectorManager:
             >>> # Returns ID of Earth's sector (creates if doesn't exist)
         """
         try:
-            if not isinstance(position, (tuple, list)) or len(position) != 3:
-                raise ValueError("Position must be a tuple/list of 3 coordinates")
-
             sector_x, sector_y = self.get_sector_coordinates(position)
+            return self.get_sector_id(sector_x, sector_y)
+        except Exception as e:
+            logger.error("Error getting sector: %s", e)
+            return None
 
-            query = """
-            SELECT id FROM sectors
-            WHERE x_min <= %s AND x_max > %s
-            AND y_min <= %s AND y_max > %s;
-            """
-
-            with get_db_connection() as conn:
-                with conn.cursor() as cur:
-                    # Calculate exact boundaries
-                    x = position[0]
-                    y = position[1]
+    def create_sector_for_position(self, position: Tuple[float, float, float]) -> Optional[int]:
+        """Create the 2D square sector containing the given position.
 
-                    cur.execute(query, (x, x, y, y))
-                    result = cur.fetchone()
-                    if result and result[0]:
-                        return result[0]
+        An existing sector is returned rather than duplicated.
 
-                    # If no sector exists, create one
-                    return self.create_sector_for_position(position)
+        Args:
+            position: (x, y, z) coordinates in parsecs
 
+        Returns:
+            Sector ID if created or found, None if error occurs
+        """
+        try:
+            cell = self.get_sector_coordinates(position)
+            return self.resolve_sectors([cell]).get(cell)
         except Exception as e:
-            print(f"Error getting sector: {e}")
+            logger.error("Error creating sector: %s", e)
             return None
 
-    def create_sector_for_position(self, position: Tuple[float, float, float]) -> Optional[int]:
-        """Create a new 2D square sector containing the given position.
+    def get_sector_id(self, sector_x: int, sector_y: int) -> Optional[int]:
+        """Get the ID of a sector by grid coordinates, creating it if needed.
 
         Args:
-            position: (x, y, z) coordinates in parsecs
+            sector_x: X coordinate in sector grid
+            sector_y: Y coordinate in sector grid
 
         Returns:
-            New sector ID if created successfully, None if error occurs
+            Sector ID, or None if it could not be created
         """
-        try:
-            if not isinstance(position, (tuple, list)) or len(position) != 3:
-                raise ValueError("Position must be a tuple/list of 3 coordinates")
+        cell = (sector_x, sector_y)
+        with self._lock:
+            sector_id = self._sector_ids.get(cell)
+            if sector_id is not None:
+                self._sector_ids.move_to_end(cell)
+                self.stats["hits"] += 1
+                return sector_id
+            self.stats["misses"] += 1
+        get_metrics().inc("sectors.cache_misses")
+        return self.resolve_sectors([cell]).get(cell)
+
+    def _sector_row(self, cell: SectorCell) -> Tuple[str, float, float, float, float, int]:
+        """Get the (name, x_min, x_max, y_min, y_max, level) row of a sector."""
+        sector_x, sector_y = cell
+        return (
+            self.get_sector_name(sector_x, sector_y),
+            sector_x * self.parsec_size, (sector_x + 1) * self.parsec_size,
+            sector_y * self.parsec_size, (sector_y + 1) * self.parsec_size,
+            abs(sector_x) + abs(sector_y)  # Distance from origin in sectors
+        )
+
+    def resolve_sectors(self, cells: Iterable[SectorCell],
+                        batch_size: int = 5000) -> Dict[SectorCell, int]:
+        """Get the IDs of many sectors, creating any that do not exist.
+
+        Uncached sectors are inserted in bulk with ``ON CONFLICT (name) DO
+        NOTHING``. Rows that already existed, or that another process
+        inserted first, are then read back by name. Rows are inserted in
+        name order, so overlapping concurrent inserts cannot deadlock. Every
+        resolved ID is cached.
 
-            sector_x, sector_y = self.get_sector_coordinates(position)
+        Args:
+            cells: (sector_x, sector_y) grid coordinates
+            batch_size: Rows per INSERT statement
 
-            # Calculate sector boundaries (X-Y only)
-            x_min = sector_x * self.parsec_size
-            x_max = (sector_x + 1) * self.parsec_size
-            y_min = sector_y * self.parsec_size
-            y_max = (sector_y + 1) * self.parsec_size
-
-            query = """
-            INSERT INTO sectors (
-                name,
-                x_min, x_max,
-                y_min, y_max,
-                level
-            ) VALUES (
-                %s,
-                %s, %s,
-                %s, %s,
-                %s
-            )
-            RETURNING id;
-            """
-
-            with get_db_connection() as conn:
-                with conn.cursor() as cur:
-                    sector_name = self.get_sector_name(sector_x, sector_y)
-                    level = abs(sector_x) + abs(sector_y)  # Distance from origin in sectors
-
-                    cur.execute(query, (
-                        sector_name,
-                        x_min, x_max,
-                        y_min, y_max,
-                        level
-                    ))
-                    result = cur.fetchone()
-                    conn.commit()
-                    return result[0] if result else None
+        Returns:
+            Sector ID by grid coordinates
 
+        Raises:
+            psycopg2.Error: If the database cannot be reached
+        """
+        resolved: Dict[SectorCell, int] = {}
+        missing: Dict[str, SectorCell] = {}
+        with self._lock:
+            for cell in cells:
+                sector_id = self._sector_ids.get(cell)
+                if sector_id is not None:
+                    resolved[cell] = sector_id
+                else:
+                    missing[self.get_sector_name(*cell)] = cell
+        if not missing:
+            return resolved
+
+        # Insert in name order so concurrent callers lock rows in the same order
+        rows = sorted(self._sector_row(cell) for cell in missing.values())
+        found: Dict[SectorCell, int] = {}
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                for start in range(0, len(rows), batch_size):
+                    inserted = execute_values(cur, """
+                        INSERT INTO sectors (name, x_min, x_max, y_min, y_max, level)
+                        VALUES %s
+                        ON CONFLICT (name) DO NOTHING
+                        RETURNING id, name
+                    """, rows[start:start + batch_size], page_size=batch_size, fetch=True)
+                    for sector_id, name in inserted:
+                        found[missing[name]] = sector_id
+                created = len(found)
+
+                existing = [name for name, cell in missing.items() if cell not in found]
+                if existing:
+                    cur.execute("SELECT id, name FROM sectors WHERE name = ANY(%s)", (existing,))
+                    for sector_id, name in cur.fetchall():
+                        found[missing[name]] = sector_id
+            conn.commit()
+
+        with self._lock:
+            self.stats["created"] += created
+            for cell, sector_id in found.items():
+                self._sector_ids[cell] = sector_id
+                self._sector_ids.move_to_end(cell)
+            while len(self._sector_ids) > self.cache_size:
+                self._sector_ids.popitem(last=False)
+        resolved.update(found)
+        return resolved
+
+    def prewarm(self, corner: Tuple[float, float, float],
+                opposite: Tuple[float, float, float]) -> int:
+        """Resolve and cache every sector in a rectangular region.
+
+        Args:
+            corner: (x, y, z) of one corner of the region in parsecs
+            opposite: (x, y, z) of the opposite corner in parsecs
+
+        Returns:
+            Number of sectors resolved
+        """
+        (x0, y0), (x1, y1) = self.get_sector_coordinates(corner), self.get_sector_coordinates(opposite)
+        xs = range(min(x0, x1), max(x0, x1) + 1)
+        ys = range(min(y0, y1), max(y0, y1) + 1)
+        if len(xs) * len(ys) > self.cache_size:
+            logger.warning("Prewarming %d sectors, more than the cache holds (%d)",
+                           len(xs) * len(ys), self.cache_size)
+        return self.prewarm_cells((x, y) for x in xs for y in ys)
+
+    def prewarm_cells(self, cells: Iterable[SectorCell]) -> int:
+        """Resolve and cache sectors by grid coordinates.
+
+        Args:
+            cells: (sector_x, sector_y) grid coordinates
+
+        Returns:
+            Number of sectors resolved, 0 if an error occurs
+        """
+        try:
+            return len(self.resolve_sectors(cells))
         except Exception as e:
-            print(f"Error creating sector: {e}")
-            return None
+            logger.error("Error prewarming sectors: %s", e)
+            return 0
+
+    def clear_cache(self) -> None:
+        """Forget every cached sector ID, e.g. after sectors are deleted."""
+        with self._lock:
+            self._sector_ids.clear()
+
+    def _distance_key(self, position: Tuple[float, float, float]):
+        """Sort key giving a sector's squared distance from position to its centre."""
+        x, y = position[0] / self.parsec_size - 0.5, position[1] / self.parsec_size - 0.5
+        return lambda cell: (cell[0] - x) ** 2 + (cell[1] - y) ** 2
+
+    def iter_rings(self, position: Tuple[float, float, float],
+                   max_range: Optional[int] = None) -> Iterator[List[SectorCell]]:
+        """Lazily yield rings of sectors moving outwards from a position.
+
+        Ring r holds the sectors r steps from the position's sector, nearest
+        the position first. No database access is needed.
+
+        Args:
+            position: (x, y, z) coordinates in parsecs
+            max_range: Last ring to yield; unbounded when None
+
+        Yields:
+            Lists of (sector_x, sector_y) grid coordinates, one per ring
+        """
+        center = self.get_sector_coordinates(position)
+        key = self._distance_key(position)
+        radius = 0
+        while max_range is None or radius <= max_range:
+            yield sorted(ring_cells(center, radius), key=key)
+            radius += 1
+
+    def iter_spiral(self, position: Tuple[float, float, float],
+                    max_range: Optional[int] = None) -> Iterator[SectorCell]:
+        """Lazily yield sectors one at a time, spiralling out from a position.
+
+        Sectors come ring by ring, as from ``iter_rings``.
+
+        Args:
+            position: (x, y, z) coordinates in parsecs
+            max_range: Last ring to yield; unbounded when None
+
+        Yields:
+            (sector_x, sector_y) grid coordinates
+        """
+        for ring in self.iter_rings(position, max_range):
+            yield from ring
+
+    def get_nearby_cells(self, position: Tuple[float, float, float],
+                         range_sectors: int = 1) -> List[SectorCell]:
+        """Get grid coordinates of sectors within range (X-Y plane only).
+
+        Args:
+            position: (x, y, z) coordinates in parsecs
+            range_sectors: Number of sectors to search in each direction
+
+        Returns:
+            (sector_x, sector_y) grid coordinates, ordered by distance from
+            position to each sector's centre
+        """
+        if not isinstance(range_sectors, int) or range_sectors < 1:
+            raise ValueError("Range must be a positive integer")
+        cells = [cell for ring in self.iter_rings(position, range_sectors) for cell in ring]
+        return sorted(cells, key=self._distance_key(position))
 
     def get_nearby_sectors(self, position: Tuple[float, float, float], 
                           range_sectors: int = 1) -> List[int]:
         """Get IDs of sectors within range (X-Y plane only).
 
+        Sectors are found by grid arithmetic and resolved in one batched
+        lookup. Sectors that do not exist yet are created.
+
         Args:
             position: (x, y, z) coordinates in parsecs
             range_sectors: Number of sectors to search in each direction
@@ -207,41 +400,20 @@ class SectorManager:
             List of sector IDs, ordered by distance from position
         """
         try:
-            if not isinstance(position, (tuple, list)) or len(position) != 3:
-                raise ValueError("Position must be a tuple/list of 3 coordinates")
-            if not isinstance(range_sectors, (int)) or range_sectors < 1:
-                raise ValueError("Range must be a positive integer")
-
-            sector_x, sector_y = self.get_sector_coordinates(position)
-            range_dist = range_sectors * self.parsec_size
-
-            query = """
-            SELECT id FROM sectors
-            WHERE 
-                x_min >= %s AND x_max <= %s
-                AND y_min >= %s AND y_max <= %s
-            ORDER BY 
-                POW(x_min - %s, 2) + 
-                POW(y_min - %s, 2);
-            """
-
-            with get_db_connection() as conn:
-                with conn.cursor() as cur:
-                    x, y = position[0], position[1]
-                    cur.execute(query, (
-                        x - range_dist, x + range_dist,
-                        y - range_dist, y + range_dist,
-                        x, y
-                    ))
-                    return [row[0] for row in cur.fetchall()]
+            cells = self.get_nearby_cells(position, range_sectors)
+            sector_ids = self.resolve_sectors(cells)
+            return [sector_ids[cell] for cell in cells if cell in sector_ids]
         except Exception as e:
-            print(f"Error getting nearby sectors: {e}")
+            logger.error("Error getting nearby sectors: %s", e)
             return []
 
     def update_object_sector(self, obj_id: int, old_pos: Tuple[float, float, float], 
                             new_pos: Tuple[float, float, float]) -> None:
         """Update object's sector based on position change (X-Y only).
 
+        The new position and sector are staged in the position write buffer
+        and reach the database on its next flush.
+
         Args:
             obj_id: Object ID to update
             old_pos: Previous (x, y, z) position
@@ -256,28 +428,14 @@ class SectorManager:
 
             new_sector_id = self.get_sector_for_position(new_pos)
             if new_sector_id is None:
-                print(f"Could not find or create sector for position {new_pos}")
+                logger.warning("Could not find or create sector for position %s", new_pos)
                 return
 
-            update_query = """
-            UPDATE space_objects 
-            SET 
-                sector_id = %s,
-                position = ST_SetSRID(ST_MakePoint(%s, %s, %s), 3857),
-                orientation = COALESCE(
-                    orientation,
-                    ST_SetSRID(ST_MakePoint(1, 0, 0), 3857)
-                )
-            WHERE id = %s;
-            """
-
-            with get_db_connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute(update_query, (new_sector_id, *new_pos, obj_id))
-                    conn.commit()
+            # Persisted in bulk by the write-behind buffer
+            get_position_buffer().stage(obj_id, new_pos, sector_id=new_sector_id)
 
         except Exception as e:
-            print(f"Error updating object sector: {e}")
+            logger.error("Error updating object sector: %s", e)
 
     def activate_sector(self, sector_id: int) -> None:
         """Mark sector as active for processing.
@@ -297,4 +455,16 @@ class SectorManager:
         """
         if not isinstance(sector_id, int):
             raise ValueError("Sector ID must be an integer")
-        self.active_sectors.discard(sector_id)
\ No newline at end of file
+        self.active_sectors.discard(sector_id)
+
+# Global sector manager instance
+_SECTOR_MANAGER: Optional[SectorManager] = None
+
+def get_sector_manager() -> SectorManager:
+    """Get or create the global sector manager."""
+    global _SECTOR_MANAGER
+    if _SECTOR_MANAGER is None:
+        _SECTOR_MANAGER = SectorManager(
+            cache_size=int(os.getenv('SPACE_SECTOR_CACHE_SIZE', '65536'))
+        )
+    return _SECTOR_MANAGER
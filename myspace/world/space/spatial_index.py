@@ -0,0 +1,412 @@
+"""
+In-memory 3D spatial index over live space objects.
+
+Positions are owned by the server process, so range, cone and nearest-neighbour
+queries are answered from a uniform hash grid instead of PostGIS. The grid uses
+the same floor-division cell math as ``Sector.from_su_coords`` with one sector
+per cell by default. PostGIS remains the persistence layer: the index is
+mirrored from ``space_objects`` at startup and kept current by
+``SpaceObject.set_position``.
+
+Entries mirrored from the database carry no live object. ``resolve`` finds
+it on first use: from the registry of loaded space objects, or else through
+the index's ``object_loader``, which searches Evennia by ID.
+"""
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from dataclasses import dataclass
+from world.constants import SECTOR_SIZE_SU
+from world.database.queries import get_db_connection
+from world.space.database.position_buffer import flush_positions
+import threading
+import weakref
+import heapq
+import math
+
+Vector3 = Tuple[float, float, float]
+CellKey = Tuple[int, int, int]
+
+# Object types that rarely move; changes to them bump ``static_epoch``
+STATIC_TYPES: Tuple[str, ...] = ("planet", "station")
+
+@dataclass
+class IndexEntry:
+    """A single indexed object."""
+    object_id: int
+    position: Vector3
+    cell: CellKey
+    object_type: str = "object"
+    key: str = ""
+    obj: Any = None  # Live object, when the entry was added in-process
+
+# Loaded space objects by ID, registered by SpaceObject as it loads
+_LIVE_OBJECTS: "weakref.WeakValueDictionary[int, Any]" = weakref.WeakValueDictionary()
+
+def register_object(obj: Any) -> None:
+    """Register a loaded space object so index entries can resolve it by ID."""
+    _LIVE_OBJECTS[obj.id] = obj
+
+def forget_object(object_id: int) -> bool:
+    """
+    Drop a deleted space object from the global index and the live registry.
+
+    Returns:
+        Whether the object was indexed
+    """
+    _LIVE_OBJECTS.pop(object_id, None)
+    return get_spatial_index().remove(object_id)
+
+def _search_object(object_id: int) -> Any:
+    """Find a space object through Evennia's object search."""
+    try:
+        from evennia import search_object
+    except ImportError:
+        return None
+    found = search_object(f"#{object_id}")
+    return found[0] if found else None
+
+class SpatialIndex:
+    """
+    Uniform hash grid answering radius, cone and k-nearest queries.
+
+    Only occupied cells are stored. Queries visit the cells overlapping the
+    search volume, or every occupied cell when that is fewer, so sparse
+    long-range scans stay cheap.
+
+    Args:
+        cell_size: Edge length of a grid cell in SU
+    """
+
+    def __init__(self, cell_size: float = SECTOR_SIZE_SU):
+        if cell_size <= 0:
+            raise ValueError("Cell size must be positive")
+        self.cell_size = float(cell_size)
+        self._entries: Dict[int, IndexEntry] = {}
+        self._cells: Dict[CellKey, Dict[int, IndexEntry]] = {}
+        self._lock = threading.RLock()
+        self.epoch = 0  # Bumped on every insert, move or removal
+        self.static_epoch = 0  # Bumped only when a STATIC_TYPES object changes
+        self.loaded = False  # True once mirrored from the database
+        # Finds live objects for entries loaded without one
+        self.object_loader: Optional[Callable[[int], Any]] = _search_object
+
+    def cell_for(self, x: float, y: float, z: float) -> CellKey:
+        """Get the grid cell containing a position."""
+        size = self.cell_size
+        return (math.floor(x / size), math.floor(y / size), math.floor(z / size))
+
+    def update(self, object_id: int, position: Vector3, object_type: Optional[str] = None,
+               key: Optional[str] = None, obj: Any = None) -> IndexEntry:
+        """
+        Insert an object or move it to a new position.
+
+        Args:
+            object_id: Space object ID
+            position: (x, y, z) position in SU
+            object_type: Object type; keeps the existing value when omitted
+            key: Object key; keeps the existing value when omitted
+            obj: Live object reference; keeps the existing value when omitted
+        """
+        position = (float(position[0]), float(position[1]), float(position[2]))
+        cell = self.cell_for(*position)
+
+        with self._lock:
+            entry = self._entries.get(object_id)
+            if entry is None:
+                entry = IndexEntry(object_id, position, cell,
+                                   object_type or "object", key or "", obj)
+                self._entries[object_id] = entry
+                static_change = entry.object_type in STATIC_TYPES
+            else:
+                was_static = entry.object_type in STATIC_TYPES
+                moved = entry.position != position
+                if entry.cell != cell:
+                    self._remove_from_cell(entry)
+                entry.position = position
+                entry.cell = cell
+                if object_type is not None:
+                    entry.object_type = object_type
+                if key is not None:
+                    entry.key = key
+                if obj is not None:
+                    entry.obj = obj
+                is_static = entry.object_type in STATIC_TYPES
+                static_change = was_static != is_static or (is_static and moved)
+
+            self._cells.setdefault(cell, {})[object_id] = entry
+            self.epoch += 1
+            if static_change:
+                self.static_epoch += 1
+            return entry
+
+    def remove(self, object_id: int) -> bool:
+        """Remove an object. Returns whether it was indexed."""
+        with self._lock:
+            entry = self._entries.pop(object_id, None)
+            if entry is None:
+                return False
+            self._remove_from_cell(entry)
+            self.epoch += 1
+            if entry.object_type in STATIC_TYPES:
+                self.static_epoch += 1
+            return True
+
+    def _remove_from_cell(self, entry: IndexEntry) -> None:
+        """Drop an entry from its cell bucket, deleting empty buckets."""
+        bucket = self._cells.get(entry.cell)
+        if bucket is not None:
+            bucket.pop(entry.object_id, None)
+            if not bucket:
+                del self._cells[entry.cell]
+
+    def get(self, object_id: int) -> Optional[IndexEntry]:
+        """Get the entry for an object, if indexed."""
+        return self._entries.get(object_id)
+
+    def resolve(self, object_id: int) -> Any:
+        """
+        Get the live object for an indexed ID.
+
+        Entries loaded from the database are filled in on first use, from
+        registered space objects or the object loader.
+
+        Returns:
+            The live object, or None if it is not indexed or cannot be found
+        """
+        entry = self._entries.get(object_id)
+        if entry is None:
+            return None
+        if entry.obj is not None:
+            return entry.obj
+        obj = _LIVE_OBJECTS.get(object_id)
+        if obj is None and self.object_loader is not None:
+            obj = self.object_loader(object_id)
+        if obj is not None:
+            with self._lock:
+                entry.obj = obj
+        return obj
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._cells.clear()
+            self.epoch += 1
+            self.static_epoch += 1
+            self.loaded = False
+
+    def positions(self) -> List[Vector3]:
+        """Get a snapshot of every indexed position."""
+        with self._lock:
+            return [entry.position for entry in self._entries.values()]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, object_id: int) -> bool:
+        return object_id in self._entries
+
+    def _cells_in_box(self, lo: CellKey, hi: CellKey) -> Iterator[Dict[int, IndexEntry]]:
+        """Yield occupied cell buckets within an inclusive cell-key box."""
+        span = (hi[0] - lo[0] + 1) * (hi[1] - lo[1] + 1) * (hi[2] - lo[2] + 1)
+        if span > len(self._cells):
+            for cell, bucket in self._cells.items():
+                if (lo[0] <= cell[0] <= hi[0] and lo[1] <= cell[1] <= hi[1]
+                        and lo[2] <= cell[2] <= hi[2]):
+                    yield bucket
+            return
+
+        cells = self._cells
+        for cx in range(lo[0], hi[0] + 1):
+            for cy in range(lo[1], hi[1] + 1):
+                for cz in range(lo[2], hi[2] + 1):
+                    bucket = cells.get((cx, cy, cz))
+                    if bucket:
+                        yield bucket
+
+    def _candidates(self, center: Vector3, radius: float) -> Iterator[IndexEntry]:
+        """Yield entries in cells overlapping the sphere's bounding box."""
+        lo = self.cell_for(center[0] - radius, center[1] - radius, center[2] - radius)
+        hi = self.cell_for(center[0] + radius, center[1] + radius, center[2] + radius)
+        for bucket in self._cells_in_box(lo, hi):
+            yield from bucket.values()
+
+    def query_radius(self, center: Vector3, radius: float, exclude: Optional[int] = None,
+                     types: Optional[Iterable[str]] = None) -> List[Tuple[float, IndexEntry]]:
+        """
+        Find objects within a radius.
+
+        Args:
+            center: (x, y, z) search origin in SU
+            radius: Search radius in SU
+            exclude: Object ID to leave out (usually the caller)
+            types: Only return these object types
+
+        Returns:
+            (distance, entry) pairs ordered by distance
+        """
+        wanted: Optional[Set[str]] = set(types) if types is not None else None
+        cx, cy, cz = center
+        radius_sq = radius * radius
+        results = []
+
+        with self._lock:
+            for entry in self._candidates(center, radius):
+                if entry.object_id == exclude:
+                    continue
+                if wanted is not None and entry.object_type not in wanted:
+                    continue
+                x, y, z = entry.position
+                dist_sq = (x - cx) ** 2 + (y - cy) ** 2 + (z - cz) ** 2
+                if dist_sq <= radius_sq:
+                    results.append((math.sqrt(dist_sq), entry))
+
+        results.sort(key=lambda item: item[0])
+        return results
+
+    def query_cone(self, center: Vector3, radius: float, facing: Vector3, angle: float,
+                   exclude: Optional[int] = None,
+                   types: Optional[Iterable[str]] = None) -> List[Tuple[float, IndexEntry]]:
+        """
+        Find objects within a radius and inside a cone.
+
+        Args:
+            center: (x, y, z) cone apex in SU
+            radius: Search radius in SU
+            facing: Cone axis direction (need not be normalized)
+            angle: Full cone angle in degrees
+            exclude: Object ID to leave out
+            types: Only return these object types
+
+        Returns:
+            (distance, entry) pairs ordered by distance
+        """
+        fx, fy, fz = facing
+        facing_len = math.sqrt(fx * fx + fy * fy + fz * fz)
+        if facing_len == 0:
+            raise ValueError("Facing direction must be non-zero")
+        cos_half = math.cos(math.radians(angle / 2.0))
+
+        results = []
+        for distance, entry in self.query_radius(center, radius, exclude, types):
+            if distance == 0:
+                results.append((distance, entry))
+                continue
+            dx = entry.position[0] - center[0]
+            dy = entry.position[1] - center[1]
+            dz = entry.position[2] - center[2]
+            if (dx * fx + dy * fy + dz * fz) / (distance * facing_len) >= cos_half:
+                results.append((distance, entry))
+        return results
+
+    def nearest(self, center: Vector3, k: int = 1, exclude: Optional[int] = None,
+                max_distance: Optional[float] = None,
+                types: Optional[Iterable[str]] = None) -> List[Tuple[float, IndexEntry]]:
+        """
+        Find the k nearest objects.
+
+        Searches outward shell by shell from the center cell and stops once no
+        unvisited cell can hold anything closer than the current k-th result.
+
+        Returns:
+            Up to k (distance, entry) pairs ordered by distance
+        """
+        if k <= 0:
+            return []
+        wanted: Optional[Set[str]] = set(types) if types is not None else None
+        cx, cy, cz = center
+        best: List[Tuple[float, int, IndexEntry]] = []  # max-heap on -distance
+
+        def consider(entry: IndexEntry) -> None:
+            if entry.object_id == exclude:
+                return
+            if wanted is not None and entry.object_type not in wanted:
+                return
+            x, y, z = entry.position
+            distance = math.sqrt((x - cx) ** 2 + (y - cy) ** 2 + (z - cz) ** 2)
+            if max_distance is not None and distance > max_distance:
+                return
+            item = (-distance, entry.object_id, entry)
+            if len(best) < k:
+                heapq.heappush(best, item)
+            elif distance < -best[0][0]:
+                heapq.heapreplace(best, item)
+
+        with self._lock:
+            home = self.cell_for(*center)
+            visited_cells = 0
+            shell = 0
+            while visited_cells < len(self._cells):
+                # Every unvisited cell is at least this far from the center
+                if len(best) == k and -best[0][0] <= (shell - 1) * self.cell_size:
+                    break
+                if max_distance is not None and (shell - 1) * self.cell_size > max_distance:
+                    break
+
+                shell_cells = (2 * shell + 1) ** 3 - max(0, 2 * shell - 1) ** 3
+                if shell_cells > len(self._cells) - visited_cells:
+                    # Sparse grid: cheaper to scan the remaining entries directly
+                    for entry in self._entries.values():
+                        if max(abs(entry.cell[0] - home[0]), abs(entry.cell[1] - home[1]),
+                               abs(entry.cell[2] - home[2])) >= shell:
+                            consider(entry)
+                    break
+
+                for cell in self._shell(home, shell):
+                    bucket = self._cells.get(cell)
+                    if bucket:
+                        visited_cells += 1
+                        for entry in bucket.values():
+                            consider(entry)
+                shell += 1
+
+        return [(-neg, entry) for neg, _, entry in sorted(best, reverse=True)]
+
+    @staticmethod
+    def _shell(home: CellKey, shell: int) -> Iterator[CellKey]:
+        """Yield cells at exactly Chebyshev distance ``shell`` from ``home``."""
+        hx, hy, hz = home
+        if shell == 0:
+            yield home
+            return
+        for dx in range(-shell, shell + 1):
+            for dy in range(-shell, shell + 1):
+                if abs(dx) == shell or abs(dy) == shell:
+                    for dz in range(-shell, shell + 1):
+                        yield (hx + dx, hy + dy, hz + dz)
+                else:
+                    yield (hx + dx, hy + dy, hz - shell)
+                    yield (hx + dx, hy + dy, hz + shell)
+
+    def load_from_database(self) -> int:
+        """
+        Mirror every positioned row of ``space_objects`` into the index.
+
+        Returns:
+            Number of objects indexed
+        """
+        flush_positions()
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT id, key, object_type,
+                        ST_X(position), ST_Y(position), ST_Z(position)
+                    FROM space_objects
+                    WHERE position IS NOT NULL
+                """)
+                rows = cur.fetchall()
+
+        with self._lock:
+            for obj_id, key, object_type, x, y, z in rows:
+                self.update(obj_id, (x, y, z or 0.0), object_type=object_type, key=key)
+            self.loaded = True
+        return len(rows)
+
+# Global spatial index instance
+_SPATIAL_INDEX: Optional[SpatialIndex] = None
+
+def get_spatial_index() -> SpatialIndex:
+    """Get or create the global spatial index."""
+    global _SPATIAL_INDEX
+    if _SPATIAL_INDEX is None:
+        _SPATIAL_INDEX = SpatialIndex()
+    return _SPATIAL_INDEX
@@ -0,0 +1,251 @@
+"""
+Hierarchical timing wheel for delayed callbacks.
+
+Scheduling and cancelling are O(1): a timer is dropped into the slot of the
+coarsest wheel level that can hold its deadline and cascades down to finer
+levels as time advances. The wheel is driven by one recurring callback on
+the server's event loop (or, outside any loop, by a single driver thread)
+instead of one task or thread per delay, and it stops driving itself when
+no timers are pending.
+"""
+from typing import Any, Callable, List, Optional
+from world.metrics import get_logger
+import asyncio
+import threading
+import math
+import time
+
+logger = get_logger("timers")
+
+class TimerHandle:
+    """A scheduled callback that can be cancelled."""
+    __slots__ = ("deadline", "expires", "callback", "args", "kwargs", "cancelled", "_wheel")
+
+    def __init__(self, wheel: "TimingWheel", deadline: float, expires: int,
+                 callback: Callable, args: tuple, kwargs: dict):
+        self.deadline = deadline  # Clock time the callback is due
+        self.expires = expires  # Wheel tick the callback is due
+        self.callback = callback
+        self.args = args
+        self.kwargs = kwargs
+        self.cancelled = False
+        self._wheel = wheel
+
+    def cancel(self) -> bool:
+        """Cancel the callback. Returns False if it already ran or was cancelled."""
+        if self.cancelled or self._wheel is None:
+            return False
+        self.cancelled = True
+        self._wheel._cancelled(self)
+        return True
+
+    @property
+    def done(self) -> bool:
+        """Whether the callback has run or been cancelled."""
+        return self.cancelled or self._wheel is None
+
+class TimingWheel:
+    """
+    Multi-level timing wheel.
+
+    Args:
+        tick: Resolution in seconds
+        slots: Slots per level (a power of two)
+        levels: Number of levels; the wheel spans tick * slots ** levels seconds
+            before long timers start re-cascading from the top level
+        clock: Monotonic time source
+        autostart: Start a driver when timers are scheduled; when False the
+            owner calls ``advance`` itself
+    """
+
+    def __init__(self, tick: float = 0.01, slots: int = 256, levels: int = 4,
+                 clock: Callable[[], float] = time.monotonic, autostart: bool = True):
+        if tick <= 0 or slots < 2 or slots & (slots - 1) or levels < 1:
+            raise ValueError("Tick must be positive and slots a power of two")
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self.clock = clock
+        self.autostart = autostart
+        self._bits = slots.bit_length() - 1
+        self._mask = slots - 1
+        self._wheels: List[List[List[TimerHandle]]] = [
+            [[] for _ in range(slots)] for _ in range(levels)
+        ]
+        self._start = clock()
+        self._current = 0  # Last tick processed
+        self._pending = 0
+        self._lock = threading.RLock()
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_timer: Optional[asyncio.TimerHandle] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return self._pending
+
+    def _tick_at(self, when: float) -> int:
+        return math.ceil((when - self._start) / self.tick)
+
+    def schedule(self, delay: float, callback: Callable, *args: Any, **kwargs: Any) -> TimerHandle:
+        """
+        Run a callback after a delay.
+
+        Returns:
+            Handle that can cancel the callback
+        """
+        deadline = self.clock() + max(0.0, delay)
+        with self._lock:
+            expires = max(self._current + 1, self._tick_at(deadline))
+            handle = TimerHandle(self, deadline, expires, callback, args, kwargs)
+            self._insert(handle)
+            self._pending += 1
+        if self.autostart:
+            self._ensure_running()
+        return handle
+
+    def _insert(self, handle: TimerHandle) -> None:
+        """Place a timer in the finest level whose span covers its deadline."""
+        delta = handle.expires - self._current
+        for level in range(self.levels):
+            if delta < 1 << (self._bits * (level + 1)):
+                slot = (handle.expires >> (self._bits * level)) & self._mask
+                self._wheels[level][slot].append(handle)
+                return
+        # Beyond the top level's span: park it in the furthest top-level slot
+        top = self.levels - 1
+        slot = ((self._current >> (self._bits * top)) - 1) & self._mask
+        self._wheels[top][slot].append(handle)
+
+    def _cancelled(self, handle: TimerHandle) -> None:
+        # Cancelled handles stay in their slot and are skipped when it expires
+        with self._lock:
+            self._pending -= 1
+
+    def advance(self, now: Optional[float] = None) -> int:
+        """
+        Run every callback that is due.
+
+        Args:
+            now: Clock time to advance to; defaults to the clock's current time
+
+        Returns:
+            Number of callbacks run
+        """
+        now = self.clock() if now is None else now
+        target = math.floor((now - self._start) / self.tick)  # Last tick fully elapsed
+        ran = 0
+        while True:
+            with self._lock:
+                if self._current >= target:
+                    return ran
+                if self._pending == 0:
+                    # Nothing to cascade or run: skip straight ahead
+                    self._current = target
+                    return ran
+                self._current += 1
+                self._cascade()
+                slot = self._current & self._mask
+                due, self._wheels[0][slot] = self._wheels[0][slot], []
+
+                ready = []
+                for handle in due:
+                    if handle.cancelled:
+                        continue
+                    if handle.expires > self._current:
+                        self._insert(handle)  # Parked beyond the wheel's span
+                        continue
+                    handle._wheel = None
+                    self._pending -= 1
+                    ready.append(handle)
+
+            for handle in ready:
+                try:
+                    handle.callback(*handle.args, **handle.kwargs)
+                except Exception:
+                    logger.exception("Timer callback error")
+                ran += 1
+
+    def _cascade(self) -> None:
+        """Move timers down from coarser levels as their slots come due."""
+        for level in range(1, self.levels):
+            if (self._current >> (self._bits * (level - 1))) & self._mask:
+                return
+            slot = (self._current >> (self._bits * level)) & self._mask
+            bucket, self._wheels[level][slot] = self._wheels[level][slot], []
+            for handle in bucket:
+                if not handle.cancelled:
+                    self._insert(handle)
+
+    def next_deadline(self) -> Optional[float]:
+        """Get the earliest pending deadline (O(pending); for drivers and diagnostics)."""
+        with self._lock:
+            deadlines = [h.deadline for level in self._wheels for bucket in level
+                         for h in bucket if not h.cancelled]
+        return min(deadlines, default=None)
+
+    def attach(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Drive the wheel from an event loop (normally the server's own)."""
+        self._loop = loop
+        self._ensure_running()
+
+    def _ensure_running(self) -> None:
+        """Start a driver if none is running."""
+        if self._loop is None:
+            try:
+                self._loop = asyncio.get_running_loop()
+            except RuntimeError:
+                pass
+
+        if self._loop is not None and not self._loop.is_closed():
+            if self._loop_timer is None:
+                self._loop.call_soon_threadsafe(self._start_loop_driver)
+            return
+
+        # No event loop: one shared driver thread, exiting when idle
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run_thread, name="timing-wheel",
+                                                daemon=True)
+                self._thread.start()
+
+    def _start_loop_driver(self) -> None:
+        if self._loop_timer is None:
+            self._loop_timer = self._loop.call_later(self.tick, self._on_loop_tick)
+
+    def _on_loop_tick(self) -> None:
+        self._loop_timer = None
+        self.advance()
+        if self._pending:
+            self._loop_timer = self._loop.call_later(self.tick, self._on_loop_tick)
+
+    def _run_thread(self) -> None:
+        while True:
+            self.advance()
+            with self._lock:
+                if not self._pending:
+                    self._thread = None
+                    return
+            time.sleep(self.tick)
+
+# Global timing wheel instance
+_TIMING_WHEEL: Optional[TimingWheel] = None
+
+def get_timing_wheel() -> TimingWheel:
+    """Get or create the global timing wheel."""
+    global _TIMING_WHEEL
+    if _TIMING_WHEEL is None:
+        _TIMING_WHEEL = TimingWheel()
+    return _TIMING_WHEEL
+
+def set_timing_wheel(wheel: Optional[TimingWheel]) -> Optional[TimingWheel]:
+    """
+    Install the global timing wheel; None creates a default one on next use.
+
+    Returns:
+        The previous wheel
+    """
+    global _TIMING_WHEEL
+    previous = _TIMING_WHEEL
+    _TIMING_WHEEL = wheel
+    return previous
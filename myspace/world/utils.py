@@ -1,25 +1,15 @@
 """Utility functions for space game."""
-import asyncio
-import threading
-import time
 from typing import Any, Callable
-from functools import partial
+from world.timing_wheel import TimerHandle, get_timing_wheel
 
-def delay(seconds: float, callback: Callable, *args: Any, **kwargs: Any) -> None:
-    """Schedule a delayed callback in either async or sync context."""
-    try:
-        # Try async context first
-        loop = asyncio.get_event_loop()
+def delay(seconds: float, callback: Callable, *args: Any, **kwargs: Any) -> TimerHandle:
+    """
+    Schedule a delayed callback on the shared timing wheel.
 
-        async def _delayed():
-            await asyncio.sleep(seconds)
-            callback(*args, **kwargs)
-
-        loop.create_task(_delayed())
-    except RuntimeError:
-        # Fallback to threading for sync context
-        timer = threading.Timer(seconds, callback, args=args, kwargs=kwargs)
-        timer.start()
+    Returns:
+        Handle whose ``cancel()`` stops the callback
+    """
+    return get_timing_wheel().schedule(seconds, callback, *args, **kwargs)
 
 import math
 from typing import Any, Callable, Tuple, Optional, List